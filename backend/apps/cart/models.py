@@ -2,8 +2,12 @@
 Cart models for Dolce Fiore.
 """
 import uuid
+from decimal import Decimal
 from django.db import models
-from django.db.models import Sum
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from apps.users.models import User
 from apps.products.models import Product
 
@@ -12,6 +16,9 @@ class Cart(models.Model):
     """Shopping cart model."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='cart')
+    # Kept in step with the items by refresh_cart_summary(), for reads that need no item rows
+    item_count = models.PositiveIntegerField(default=0)  # Total quantity of all items
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -48,3 +55,19 @@ class CartItem(models.Model):
     def __str__(self):
         return f"{self.quantity}x {self.product.name}"
 
+
+
+def refresh_cart_summary(cart_ids):
+    """Recompute item_count and total of carts from their items, in one UPDATE."""
+    items = CartItem.objects.filter(cart=OuterRef('pk')).order_by().values('cart')
+    Cart.objects.filter(pk__in=cart_ids).update(
+        item_count=Coalesce(Subquery(items.annotate(count=Sum('quantity')).values('count')), 0),
+        total=Coalesce(Subquery(items.annotate(total=Sum('line_total')).values('total')), Decimal('0')),
+    )
+
+
+@receiver(post_save, sender=CartItem)
+@receiver(post_delete, sender=CartItem)
+def update_cart_summary(sender, instance, **kwargs):
+    """Keep the cart summary in step with its items."""
+    refresh_cart_summary([instance.cart_id])
@@ -27,8 +27,8 @@ class CartSerializer(serializers.ModelSerializer):
     
     @extend_schema_field(serializers.FloatField())
     def get_total(self, obj) -> float:
-        """Calculate and return cart total."""
-        return float(obj.get_total())
+        """Return the cart total kept with the cart."""
+        return float(obj.total)
 
 
 class AddToCartSerializer(serializers.Serializer):
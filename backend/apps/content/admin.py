@@ -2,7 +2,9 @@
 Admin configuration for content app.
 """
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
+from apps.core.cache import bump_model_version
 from .models import (
     SustainableGiftingItem,
     TextTestimonial,
@@ -54,13 +56,15 @@ class SustainableGiftingItemAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} item(s) marked as active.')
     make_active.short_description = 'Mark selected items as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} item(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected items as inactive'
 
@@ -101,13 +105,15 @@ class TextTestimonialAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} testimonial(s) marked as active.')
     make_active.short_description = 'Mark selected testimonials as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} testimonial(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected testimonials as inactive'
 
@@ -148,13 +154,15 @@ class VideoTestimonialAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} testimonial(s) marked as active.')
     make_active.short_description = 'Mark selected testimonials as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} testimonial(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected testimonials as inactive'
 
@@ -185,13 +193,15 @@ class AboutUsSectionAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} section(s) marked as active.')
     make_active.short_description = 'Mark selected sections as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} section(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected sections as inactive'
 
@@ -222,13 +232,15 @@ class OurStorySectionAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} section(s) marked as active.')
     make_active.short_description = 'Mark selected sections as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} section(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected sections as inactive'
 
@@ -259,13 +271,15 @@ class OurCommitmentSectionAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} section(s) marked as active.')
     make_active.short_description = 'Mark selected sections as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} section(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected sections as inactive'
 
@@ -306,13 +320,15 @@ class PhotoGalleryItemAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} item(s) marked as active.')
     make_active.short_description = 'Mark selected items as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} item(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected items as inactive'
 
@@ -322,13 +338,17 @@ class BlogPostAdmin(admin.ModelAdmin):
     """Admin for Blog posts."""
     list_display = ['title', 'published_date', 'order', 'is_active', 'image_preview', 'created_at']
     list_filter = ['is_active', 'published_date', 'created_at']
-    search_fields = ['title', 'content']
+    search_fields = ['title', 'slug', 'content']
     ordering = ['-published_date', 'order', 'created_at']
-    readonly_fields = ['id', 'created_at', 'updated_at']
+    readonly_fields = ['id', 'excerpt', 'reading_time_minutes', 'created_at', 'updated_at']
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('id', 'title', 'content', 'image_url', 'published_date')
+            'fields': ('id', 'title', 'slug', 'content', 'image_url', 'published_date')
+        }),
+        ('Listing', {
+            'fields': ('excerpt', 'reading_time_minutes'),
+            'description': 'Generated from the content when the post is saved.'
         }),
         ('Display Settings', {
             'fields': ('order', 'is_active')
@@ -353,13 +373,15 @@ class BlogPostAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} post(s) marked as active.')
     make_active.short_description = 'Mark selected posts as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} post(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected posts as inactive'
 
@@ -432,13 +454,15 @@ class StoreCenterAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """Bulk action to mark items as active."""
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} store center(s) marked as active.')
     make_active.short_description = 'Mark selected store centers as active'
     
     def make_inactive(self, request, queryset):
         """Bulk action to mark items as inactive."""
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} store center(s) marked as inactive.')
     make_inactive.short_description = 'Mark selected store centers as inactive'
 
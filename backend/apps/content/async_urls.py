@@ -0,0 +1,31 @@
+"""
+URL configuration for the async content views, mounted at /api/async/content/.
+"""
+from django.urls import path
+from .async_views import (
+    sustainable_gifting_list_async_view,
+    text_testimonials_list_async_view,
+    video_testimonials_list_async_view,
+    about_us_async_view,
+    our_story_async_view,
+    our_commitment_async_view,
+    photo_gallery_async_view,
+    blog_detail_async_view,
+    contact_info_async_view,
+    store_centers_async_view,
+)
+
+app_name = 'content-async'
+
+urlpatterns = [
+    path('sustainable-gifting/', sustainable_gifting_list_async_view, name='sustainable-gifting-list'),
+    path('testimonials/text/', text_testimonials_list_async_view, name='text-testimonials-list'),
+    path('testimonials/video/', video_testimonials_list_async_view, name='video-testimonials-list'),
+    path('about-us/', about_us_async_view, name='about-us'),
+    path('our-story/', our_story_async_view, name='our-story'),
+    path('our-commitment/', our_commitment_async_view, name='our-commitment'),
+    path('photo-gallery/', photo_gallery_async_view, name='photo-gallery'),
+    path('blogs/<str:id_or_slug>/', blog_detail_async_view, name='blog-detail'),
+    path('contact-info/', contact_info_async_view, name='contact-info'),
+    path('store-centers/', store_centers_async_view, name='store-centers'),
+]
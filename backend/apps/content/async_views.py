@@ -0,0 +1,132 @@
+"""
+Async views for content app.
+
+Async counterparts of the content read views for deployments on an ASGI
+server (see config/asgi.py and apps/core/async_api.py). They return the same
+JSON as the DRF views, are cached with cached_view the same way, and query
+through Django's async ORM. They are not listed in the Swagger docs.
+
+The blog list and the page bundles have no async variants; under ASGI their
+DRF views run in Django's thread pool and are mostly served from the cache.
+"""
+import uuid
+from apps.core.async_api import alist, async_read_view, json_response
+from apps.core.cache import cached_view
+from apps.core.throttling import CatalogRateThrottle
+from .defaults import DEFAULT_ABOUT_US, DEFAULT_CONTACT_INFO, DEFAULT_OUR_STORY
+from .models import (
+    SustainableGiftingItem,
+    TextTestimonial,
+    VideoTestimonial,
+    AboutUsSection,
+    OurStorySection,
+    OurCommitmentSection,
+    PhotoGalleryItem,
+    BlogPost,
+    ContactInfo,
+    StoreCenter,
+)
+from .serializers import (
+    SustainableGiftingItemSerializer,
+    TextTestimonialSerializer,
+    VideoTestimonialSerializer,
+    AboutUsSectionSerializer,
+    OurStorySectionSerializer,
+    OurCommitmentSectionSerializer,
+    PhotoGalleryItemSerializer,
+    BlogPostSerializer,
+    ContactInfoSerializer,
+    StoreCenterSerializer,
+)
+
+
+async def _active_list(model, serializer_class):
+    """All active rows in display order, as the list endpoints return them."""
+    rows = await alist(model.objects.filter(is_active=True).order_by('order'))
+    return json_response(serializer_class(rows, many=True).data)
+
+
+async def _active_first(queryset, serializer_class, default):
+    """The first active row, or the default content if there is none."""
+    row = await queryset.filter(is_active=True).afirst()
+    return json_response(serializer_class(row).data if row else default)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(SustainableGiftingItem)
+async def sustainable_gifting_list_async_view(request):
+    """Get all active sustainable gifting items (async)."""
+    return await _active_list(SustainableGiftingItem, SustainableGiftingItemSerializer)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(TextTestimonial)
+async def text_testimonials_list_async_view(request):
+    """Get all active text testimonials (async)."""
+    return await _active_list(TextTestimonial, TextTestimonialSerializer)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(VideoTestimonial)
+async def video_testimonials_list_async_view(request):
+    """Get all active video testimonials (async)."""
+    return await _active_list(VideoTestimonial, VideoTestimonialSerializer)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(AboutUsSection)
+async def about_us_async_view(request):
+    """Get active About Us section with default fallback (async)."""
+    return await _active_first(AboutUsSection.objects.order_by('order'), AboutUsSectionSerializer, DEFAULT_ABOUT_US)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(OurStorySection)
+async def our_story_async_view(request):
+    """Get active Our Story section with default fallback (async)."""
+    return await _active_first(OurStorySection.objects.order_by('order'), OurStorySectionSerializer, DEFAULT_OUR_STORY)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(OurCommitmentSection)
+async def our_commitment_async_view(request):
+    """Get all active Our Commitment sections (async)."""
+    return await _active_list(OurCommitmentSection, OurCommitmentSectionSerializer)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(PhotoGalleryItem)
+async def photo_gallery_async_view(request):
+    """Get all active photo gallery items (async)."""
+    return await _active_list(PhotoGalleryItem, PhotoGalleryItemSerializer)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(BlogPost)
+async def blog_detail_async_view(request, id_or_slug):
+    """Get an active blog post by id or slug (async)."""
+    posts = BlogPost.objects.filter(is_active=True)
+    try:
+        # Try as UUID first
+        post = await posts.filter(id=uuid.UUID(id_or_slug)).afirst()
+    except ValueError:
+        post = None
+    if post is None:
+        post = await posts.filter(slug=id_or_slug).afirst()
+    if post is None:
+        return json_response({'detail': 'No BlogPost matches the given query.'}, status=404)
+    return json_response(BlogPostSerializer(post).data)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(ContactInfo)
+async def contact_info_async_view(request):
+    """Get active contact information with default fallback (async)."""
+    return await _active_first(ContactInfo.objects.all(), ContactInfoSerializer, DEFAULT_CONTACT_INFO)
+
+
+@async_read_view(CatalogRateThrottle)
+@cached_view(StoreCenter)
+async def store_centers_async_view(request):
+    """Get all active store centers (async)."""
+    return await _active_list(StoreCenter, StoreCenterSerializer)
@@ -0,0 +1,112 @@
+"""
+Page content bundles for content app.
+
+A bundle is every section a storefront page needs in a single JSON document.
+The bundle views cache it with cached_view, so it is rebuilt only when one of
+the models in HOME_MODELS or ABOUT_MODELS changes.
+"""
+from django.urls import reverse
+from apps.products.models import Category, Subcategory, Tag, Product, ProductImage
+from apps.products.serializers import CategoryWithSubcategoriesSerializer, ProductSerializer
+from .defaults import DEFAULT_ABOUT_US, DEFAULT_CONTACT_INFO, DEFAULT_OUR_STORY
+from .models import (
+    SustainableGiftingItem,
+    TextTestimonial,
+    VideoTestimonial,
+    AboutUsSection,
+    OurStorySection,
+    OurCommitmentSection,
+    PhotoGalleryItem,
+    BlogPost,
+    ContactInfo,
+)
+from .pagination import BlogPagination
+from .serializers import (
+    SustainableGiftingItemSerializer,
+    TextTestimonialSerializer,
+    VideoTestimonialSerializer,
+    AboutUsSectionSerializer,
+    OurStorySectionSerializer,
+    OurCommitmentSectionSerializer,
+    PhotoGalleryItemSerializer,
+    BlogPostSummarySerializer,
+    ContactInfoSerializer,
+)
+
+
+def _active_list(model, serializer_class, *ordering):
+    """Serialize all active rows, as the content list endpoints return them."""
+    return serializer_class(model.objects.filter(is_active=True).order_by(*ordering), many=True).data
+
+
+def _active_first(model, serializer_class, default, *ordering):
+    """Serialize the first active row, or the default content if there is none."""
+    instance = model.objects.filter(is_active=True).order_by(*ordering).first()
+    return serializer_class(instance).data if instance else default
+
+
+def _categories():
+    categories = Category.objects.filter(is_active=True).order_by('order', 'name').prefetch_related('subcategories')
+    return CategoryWithSubcategoriesSerializer(categories, many=True).data
+
+
+def _products():
+    products = (
+        Product.objects.filter(is_available=True)
+        .select_related('category', 'subcategory__category')
+        .prefetch_related('tags', 'images')
+        .order_by('-created_at')
+    )
+    return ProductSerializer(products, many=True).data
+
+
+def _blogs():
+    """First page of GET /blogs/?view=summary."""
+    paginator = BlogPagination()
+    posts = BlogPost.objects.filter(is_active=True).defer('content')
+    page = paginator.get_page(posts, None, f"{reverse('content:blogs')}?view=summary")
+    return {'next': paginator.get_next_link(), 'results': BlogPostSummarySerializer(page, many=True).data}
+
+
+def _text_testimonials():
+    return _active_list(TextTestimonial, TextTestimonialSerializer, 'order')
+
+
+def _video_testimonials():
+    return _active_list(VideoTestimonial, VideoTestimonialSerializer, 'order')
+
+
+# Section builders, in response order
+HOME_SECTIONS = {
+    'sustainable_gifting': lambda: _active_list(SustainableGiftingItem, SustainableGiftingItemSerializer, 'order'),
+    'text_testimonials': _text_testimonials,
+    'video_testimonials': _video_testimonials,
+    'contact_info': lambda: _active_first(ContactInfo, ContactInfoSerializer, DEFAULT_CONTACT_INFO),
+    'categories': _categories,
+    'products': _products,
+}
+
+ABOUT_SECTIONS = {
+    'about_us': lambda: _active_first(AboutUsSection, AboutUsSectionSerializer, DEFAULT_ABOUT_US, 'order'),
+    'our_story': lambda: _active_first(OurStorySection, OurStorySectionSerializer, DEFAULT_OUR_STORY, 'order'),
+    'our_commitment': lambda: _active_list(OurCommitmentSection, OurCommitmentSectionSerializer, 'order'),
+    'photo_gallery': lambda: _active_list(PhotoGalleryItem, PhotoGalleryItemSerializer, 'order'),
+    'blogs': _blogs,
+    'text_testimonials': _text_testimonials,
+    'video_testimonials': _video_testimonials,
+}
+
+# Models each bundle is built from
+HOME_MODELS = (
+    SustainableGiftingItem, TextTestimonial, VideoTestimonial, ContactInfo,
+    Category, Subcategory, Tag, Product, ProductImage,
+)
+ABOUT_MODELS = (
+    AboutUsSection, OurStorySection, OurCommitmentSection, PhotoGalleryItem, BlogPost,
+    TextTestimonial, VideoTestimonial,
+)
+
+
+def build_bundle(sections):
+    """Build a bundle's data from its section builders."""
+    return {name: build() for name, build in sections.items()}
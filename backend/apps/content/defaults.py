@@ -0,0 +1,48 @@
+"""
+Default content for content app.
+
+Returned in place of singleton sections that have no active record yet.
+"""
+
+DEFAULT_ABOUT_US = {
+    'id': None,
+    'title': 'About Us',
+    'content': (
+        'At Dolce Fiore, we are passionate about creating premium, sustainable gift experiences '
+        'that celebrate health, sustainability, and conscious living. Every product is designed '
+        'to delight while leaving a positive impact on people and the planet. We believe that '
+        'premium gifting can and should be kind to the planet, creating beautiful moments '
+        'without leaving a heavy footprint.'
+    ),
+    'order': 0,
+    'is_active': True,
+}
+
+DEFAULT_OUR_STORY = {
+    'id': None,
+    'title': 'Our Story',
+    'content': (
+        'Dolce Fiore began as a homegrown venture with a simple dream — to craft thoughtful, '
+        'sustainable gifting experiences. What started four years ago with a passion for healthy '
+        'indulgence has grown into a celebration of creativity and conscious living.\n\n'
+        'We proudly partner with local artisans across India, bringing tradition and sustainability '
+        'into every creation. Every hamper is handcrafted with care, featuring organic ingredients, '
+        'air-fried savories, and sugar-free chocolates — all wrapped in eco-friendly, reusable packaging.'
+    ),
+    'order': 0,
+    'is_active': True,
+}
+
+DEFAULT_CONTACT_INFO = {
+    'id': None,
+    'email': 'hello@dolcefiore.com',
+    'phone': '+91 1234567890',
+    'additional_info': '',
+    'opening_hours_monday': '6:00 AM - 8:00 PM',
+    'opening_hours_tuesday': '6:00 AM - 8:00 PM',
+    'opening_hours_wednesday': '6:00 AM - 8:00 PM',
+    'opening_hours_thursday': '6:00 AM - 8:00 PM',
+    'opening_hours_friday': '6:00 AM - 8:00 PM',
+    'opening_hours_saturday': '6:00 AM - 8:00 PM',
+    'opening_hours_sunday': '6:00 AM - 8:00 PM',
+}
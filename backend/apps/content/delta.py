@@ -0,0 +1,235 @@
+"""
+Incremental (delta) sync of catalog and content data for content app.
+
+A delta holds the rows changed after a watermark (updated_at greater than
+--since) and tombstones for rows deleted since then, as JSON lines:
+
+    {"type": "header", "format": "dolce-delta", "version": 1, "since": ..., "watermark": ...}
+    {"type": "upsert", "model": "products.product", "pk": ..., "fields": {...}}
+    {"type": "checksum", "section": "products", "op": "upsert", "count": 2, "sha256": ...}
+    {"type": "delete", "model": "products.tag", "pk": ...}
+    {"type": "checksum", "section": "tags", "op": "delete", "count": 1, "sha256": ...}
+    {"type": "footer", "blocks": 2, "count": 3}
+
+Each block of upsert or delete lines for one section ends with a checksum
+line holding the SHA-256 of the block's lines. Upserts come in dependency
+order, then deletes in reverse dependency order. Applying a delta upserts by
+primary key and ignores deletes of missing rows, so applying it again (or
+applying overlapping deltas) gives the same result. The next delta should
+start at this delta's watermark.
+
+updated_at and DeletedRecord.deleted_at are stamped when a row is saved, not
+when its transaction commits, so a row saved just before a watermark can
+become visible only after that delta was written. Each delta therefore reads
+from SAFETY_MARGIN before its since: rows changed in the overlap are exported
+again, which is harmless, and only transactions open for longer than the
+margin can still be missed.
+"""
+import hashlib
+import json
+import time
+from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from apps.core.cache import bump_model_version
+from apps.core.tombstones import deleted_since
+from .transfer import DEFAULT_BATCH_SIZE, BulkUpserter, iter_records
+
+FORMAT = 'dolce-delta'
+VERSION = 1
+
+# How far before since a delta starts reading (see the module docstring)
+SAFETY_MARGIN = timedelta(minutes=5)
+
+
+class DeltaError(Exception):
+    """The delta file is invalid, truncated or fails a checksum."""
+
+
+def _line(data):
+    return (json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class _Block:
+    """Lines of one section and operation, with their running checksum."""
+
+    def __init__(self, section, op):
+        self.section = section
+        self.op = op
+        self.count = 0
+        self.sha256 = hashlib.sha256()
+
+    def add(self, line):
+        self.count += 1
+        self.sha256.update(line)
+
+    def checksum_line(self):
+        return _line({
+            'type': 'checksum',
+            'section': self.section,
+            'op': self.op,
+            'count': self.count,
+            'sha256': self.sha256.hexdigest(),
+        })
+
+
+def write_delta(out, sections, since, watermark, chunk_size=DEFAULT_BATCH_SIZE, margin=SAFETY_MARGIN):
+    """
+    Write the changes to sections between since and watermark to out.
+
+    Args:
+        out: Binary file to write to
+        sections: Dict of section name -> model, in dependency order
+        since: Export rows changed or deleted after this datetime, less margin (None for all rows)
+        watermark: Export rows changed or deleted up to this datetime
+        margin: timedelta the delta overlaps the previous one by
+
+    Returns:
+        dict: (section, op) -> rows written, for non-empty blocks
+    """
+    counts = {}
+    out.write(_line({
+        'type': 'header',
+        'format': FORMAT,
+        'version': VERSION,
+        'since': since,
+        'watermark': watermark,
+        'margin': margin.total_seconds(),
+    }))
+    if since is not None:
+        since -= margin
+
+    def write_block(block, lines):
+        for line in lines:
+            block.add(line)
+            out.write(line)
+        if block.count:
+            out.write(block.checksum_line())
+            counts[block.section, block.op] = block.count
+
+    for section, model in sections.items():
+        queryset = model.objects.filter(updated_at__lte=watermark).order_by('updated_at', 'pk')
+        if since is not None:
+            queryset = queryset.filter(updated_at__gt=since)
+        write_block(_Block(section, 'upsert'), (
+            _line({'type': 'upsert', **record}) for record in iter_records(queryset, chunk_size)
+        ))
+
+    for section, model in reversed(sections.items()):
+        label = model._meta.label_lower
+        write_block(_Block(section, 'delete'), (
+            _line({'type': 'delete', 'model': label, 'pk': pk})
+            for pk in deleted_since(model, since, watermark)
+        ))
+
+    out.write(_line({'type': 'footer', 'blocks': len(counts), 'count': sum(counts.values())}))
+    return counts
+
+
+def is_delta(first_line):
+    """Whether first_line (bytes) is the header line of a delta."""
+    try:
+        header = json.loads(first_line)
+    except ValueError:
+        return False
+    return isinstance(header, dict) and header.get('type') == 'header' and header.get('format') == FORMAT
+
+
+class _DeleteBatcher:
+    """Delete rows of one model by pk in batches."""
+
+    def __init__(self, model, batch_size):
+        self.model = model
+        self.batch_size = batch_size
+        self.count = 0
+        self._pks = []
+        self._started = time.monotonic()
+
+    @property
+    def rate(self):
+        elapsed = time.monotonic() - self._started
+        return self.count / elapsed if elapsed else 0.0
+
+    def add(self, record):
+        self._pks.append(self.model._meta.pk.to_python(record['pk']))
+        if len(self._pks) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pks:
+            return
+        pks, self._pks = self._pks, []
+        self.count += self.model.objects.filter(pk__in=pks).delete()[1].get(self.model._meta.label, 0)
+        bump_model_version(self.model)
+
+
+def apply_delta(lines, sections, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Apply a delta, yielding a result for each block as it is applied.
+
+    Run inside a transaction: a block is checked against its checksum only
+    after it is applied, and a truncated file is only detected at its end.
+
+    Args:
+        lines: Iterable of the delta's lines as bytes (e.g. a file opened in binary mode)
+        sections: Dict of section name -> model to apply; other sections are skipped
+
+    Yields:
+        dict: The header first, then {'section', 'op', 'count', 'applied', 'rate'} per block;
+        count is the rows saved or deleted, or the lines skipped if the block was not applied
+
+    Raises:
+        DeltaError: If the delta is invalid, truncated or a checksum does not match
+    """
+    lines = iter(lines)
+    header = next(lines, b'')
+    if not is_delta(header):
+        raise DeltaError('Not a delta file (missing header line)')
+    header = json.loads(header)
+    if header.get('version') != VERSION:
+        raise DeltaError(f"Unsupported delta version {header.get('version')}")
+    yield header
+
+    models = {model._meta.label_lower: model for model in sections.values()}
+    block, writer, blocks = None, None, 0
+    for number, line in enumerate(lines, start=2):
+        try:
+            data = json.loads(line)
+            kind = data['type']
+        except (ValueError, KeyError, TypeError):
+            raise DeltaError(f'Invalid line {number}')
+
+        if kind in ('upsert', 'delete'):
+            if block is None:
+                block, label = _Block(None, kind), data.get('model')
+                model = models.get(label)
+                if model is not None:
+                    writer = BulkUpserter(model, batch_size) if kind == 'upsert' else _DeleteBatcher(model, batch_size)
+            elif (kind, data.get('model')) != (block.op, label):
+                raise DeltaError(f'Line {number} does not belong to the {label} {block.op} block')
+            block.add(line)
+            if writer is not None:
+                writer.add(data if kind == 'delete' else {key: data[key] for key in ('model', 'pk', 'fields')})
+        elif kind == 'checksum':
+            if block is None or block.op != data.get('op'):
+                raise DeltaError(f'Checksum without a block on line {number}')
+            if writer is not None:
+                writer.flush()
+            if (block.count, block.sha256.hexdigest()) != (data.get('count'), data.get('sha256')):
+                raise DeltaError(f"Checksum mismatch in {data.get('section')} {data.get('op')} block (line {number})")
+            blocks += 1
+            yield {
+                'section': data['section'],
+                'op': block.op,
+                'count': writer.count if writer is not None else block.count,
+                'applied': writer is not None,
+                'rate': writer.rate if writer is not None else 0.0,
+            }
+            block, writer = None, None
+        elif kind == 'footer':
+            if block is not None or data.get('blocks') != blocks:
+                raise DeltaError(f'Footer does not match the blocks read (line {number})')
+            return
+        else:
+            raise DeltaError(f'Unknown line type {kind!r} on line {number}')
+
+    raise DeltaError('Delta file is truncated (no footer line)')
@@ -2,24 +2,32 @@
 Management command to export content data (products, categories, blogs, testimonials) to JSON.
 
 This command exports all content-related data from the database to a JSON file
-that can be imported into another environment (dev/prod).
+that can be imported into another environment (dev/prod). Rows are read in chunks and
+written as they are read, so memory use stays flat however large the catalog is. Output
+paths ending in .gz are gzip-compressed on the fly.
+
+With --delta, only rows changed after --since and tombstones for rows deleted since then are
+exported, as JSON lines (see apps.content.delta); import_content_data applies either format.
+Each delta also re-exports the --safety-margin seconds before --since, so rows whose transaction
+committed after the previous delta was written are not missed.
 
 Usage:
     python manage.py export_content_data --output data/content_export.json
     python manage.py export_content_data --output data/content_export.json --exclude-products
+    python manage.py export_content_data --output data/content_export.json.gz
+    python manage.py export_content_data --output data/delta.jsonl --delta --since 2026-01-01T00:00:00Z
+    python manage.py export_content_data --output data/delta.jsonl --delta --watermark-file data/last_sync.txt
 """
-import json
+import io
 import os
-from django.core.management.base import BaseCommand
-from django.core import serializers
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from apps.products.models import (
-    Product, ProductImage, Category, Subcategory, Tag
-)
-from apps.content.models import (
-    BlogPost, TextTestimonial, VideoTestimonial,
-    SustainableGiftingItem, AboutUsSection, OurStorySection,
-    OurCommitmentSection, PhotoGalleryItem
+from django.utils.dateparse import parse_datetime
+from apps.core.jsonstream import JSONObjectWriter, open_output
+from apps.content.delta import SAFETY_MARGIN, write_delta
+from apps.content.transfer import (
+    CONTENT_SECTIONS, DEFAULT_BATCH_SIZE, PRODUCT_SECTIONS, iter_product_tags, iter_records
 )
 
 
@@ -53,6 +61,36 @@ class Command(BaseCommand):
             action='store_true',
             help='Export only content models (blogs, testimonials, etc.)'
         )
+        parser.add_argument(
+            '--delta',
+            action='store_true',
+            help='Export only changes and deletions after --since, as JSON lines'
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='With --delta: watermark of the previous delta (ISO 8601 timestamp); omit to export every row'
+        )
+        parser.add_argument(
+            '--watermark-file',
+            type=str,
+            help='With --delta: read --since from this file if it exists, and write the new watermark to it'
+        )
+        parser.add_argument(
+            '--safety-margin',
+            type=float,
+            default=SAFETY_MARGIN.total_seconds(),
+            help=(
+                'With --delta: also export the changes made this many seconds before --since, which may have '
+                f'been committed after the previous delta (default: {SAFETY_MARGIN.total_seconds():.0f})'
+            )
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows read from the database at a time (default: {DEFAULT_BATCH_SIZE})'
+        )
 
     def handle(self, *args, **options):
         output_path = options['output']
@@ -60,6 +98,7 @@ class Command(BaseCommand):
         exclude_content = options['exclude_content']
         only_products = options['only_products']
         only_content = options['only_content']
+        chunk_size = options['chunk_size']
 
         # Determine what to export
         export_products = not exclude_products and not only_content
@@ -71,130 +110,50 @@ class Command(BaseCommand):
             )
             return
 
-        data = {}
-        export_count = 0
+        # Create output directory if it doesn't exist
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+            self.stdout.write(f'📁 Created directory: {output_dir}')
 
-        # Export products and related data
+        sections = {}
         if export_products:
-            self.stdout.write('📦 Exporting products and related data...')
-            
-            # Export in dependency order: Categories -> Subcategories -> Tags -> Products -> ProductImages
-            categories = Category.objects.all()
-            subcategories = Subcategory.objects.all()
-            tags = Tag.objects.all()
-            products = Product.objects.all()
-            product_images = ProductImage.objects.all()
-
-            data['categories'] = json.loads(
-                serializers.serialize('json', categories, use_natural_foreign_keys=True)
-            )
-            data['subcategories'] = json.loads(
-                serializers.serialize('json', subcategories, use_natural_foreign_keys=True)
-            )
-            data['tags'] = json.loads(
-                serializers.serialize('json', tags, use_natural_foreign_keys=True)
-            )
-            data['products'] = json.loads(
-                serializers.serialize('json', products, use_natural_foreign_keys=True)
-            )
-            data['product_images'] = json.loads(
-                serializers.serialize('json', product_images, use_natural_foreign_keys=True)
-            )
-
-            # Export many-to-many relationships for products-tags
-            data['product_tags'] = []
-            for product in products:
-                tag_ids = list(product.tags.values_list('id', flat=True))
-                if tag_ids:
-                    data['product_tags'].append({
-                        'product_id': str(product.id),
-                        'tag_ids': [str(tid) for tid in tag_ids]
-                    })
-
-            export_count += (
-                categories.count() + subcategories.count() + tags.count() +
-                products.count() + product_images.count()
-            )
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'  ✅ Exported {categories.count()} categories, '
-                    f'{subcategories.count()} subcategories, {tags.count()} tags, '
-                    f'{products.count()} products, {product_images.count()} product images'
-                )
-            )
-
-        # Export content models
+            sections.update(PRODUCT_SECTIONS)
         if export_content:
-            self.stdout.write('📝 Exporting content data...')
-            
-            blogs = BlogPost.objects.all()
-            text_testimonials = TextTestimonial.objects.all()
-            video_testimonials = VideoTestimonial.objects.all()
-            sustainable_gifting = SustainableGiftingItem.objects.all()
-            about_us = AboutUsSection.objects.all()
-            our_story = OurStorySection.objects.all()
-            our_commitment = OurCommitmentSection.objects.all()
-            photo_gallery = PhotoGalleryItem.objects.all()
-
-            data['blogs'] = json.loads(
-                serializers.serialize('json', blogs, use_natural_foreign_keys=True)
-            )
-            data['text_testimonials'] = json.loads(
-                serializers.serialize('json', text_testimonials, use_natural_foreign_keys=True)
-            )
-            data['video_testimonials'] = json.loads(
-                serializers.serialize('json', video_testimonials, use_natural_foreign_keys=True)
-            )
-            data['sustainable_gifting'] = json.loads(
-                serializers.serialize('json', sustainable_gifting, use_natural_foreign_keys=True)
-            )
-            data['about_us'] = json.loads(
-                serializers.serialize('json', about_us, use_natural_foreign_keys=True)
-            )
-            data['our_story'] = json.loads(
-                serializers.serialize('json', our_story, use_natural_foreign_keys=True)
-            )
-            data['our_commitment'] = json.loads(
-                serializers.serialize('json', our_commitment, use_natural_foreign_keys=True)
-            )
-            data['photo_gallery'] = json.loads(
-                serializers.serialize('json', photo_gallery, use_natural_foreign_keys=True)
-            )
+            sections.update(CONTENT_SECTIONS)
 
-            export_count += (
-                blogs.count() + text_testimonials.count() + video_testimonials.count() +
-                sustainable_gifting.count() + about_us.count() + our_story.count() +
-                our_commitment.count() + photo_gallery.count()
-            )
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'  ✅ Exported {blogs.count()} blogs, '
-                    f'{text_testimonials.count()} text testimonials, '
-                    f'{video_testimonials.count()} video testimonials, '
-                    f'{sustainable_gifting.count()} sustainable gifting items, '
-                    f'{about_us.count()} about us sections, '
-                    f'{our_story.count()} our story sections, '
-                    f'{our_commitment.count()} our commitment sections, '
-                    f'{photo_gallery.count()} photo gallery items'
-                )
+        if options['delta']:
+            self._export_delta(
+                output_path, sections, options['since'], options['watermark_file'], chunk_size,
+                timedelta(seconds=options['safety_margin'])
             )
+            return
 
-        # Add metadata
-        data['_metadata'] = {
-            'exported_at': timezone.now().isoformat(),
-            'total_objects': export_count,
-            'version': '1.0'
-        }
-
-        # Create output directory if it doesn't exist
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            self.stdout.write(f'📁 Created directory: {output_dir}')
+        export_count = 0
 
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Sections are written as they are read, so memory use does not grow with the catalog
+        with open_output(output_path) as raw, io.TextIOWrapper(raw, encoding='utf-8') as f:
+            writer = JSONObjectWriter(f)
+            for key, model in sections.items():
+                if key == 'categories':
+                    self.stdout.write('📦 Exporting products and related data...')
+                elif key == 'blogs':
+                    self.stdout.write('📝 Exporting content data...')
+                count = writer.write_array(key, iter_records(model.objects.all(), chunk_size))
+                export_count += count
+                self.stdout.write(f'  ✅ Exported {count} {key.replace("_", " ")}')
+
+                if key == 'product_images':
+                    # Also in each product's "tags"; kept for files read by older importers
+                    count = writer.write_array('product_tags', iter_product_tags(chunk_size))
+                    self.stdout.write(f'  ✅ Exported {count} product-tag relationships')
+
+            writer.write_member('_metadata', {
+                'exported_at': timezone.now().isoformat(),
+                'total_objects': export_count,
+                'version': '1.0'
+            })
+            writer.close()
 
         file_size = os.path.getsize(output_path)
         file_size_mb = file_size / (1024 * 1024)
@@ -206,3 +165,41 @@ class Command(BaseCommand):
             )
         )
 
+    def _export_delta(self, output_path, sections, since, watermark_file, chunk_size, margin):
+        if margin < timedelta(0):
+            raise CommandError('--safety-margin must not be negative')
+        if watermark_file and not since and os.path.exists(watermark_file):
+            with open(watermark_file, 'r', encoding='utf-8') as f:
+                since = f.read().strip()
+        if since:
+            since_at = parse_datetime(since)
+            if since_at is None:
+                raise CommandError(f'Invalid --since timestamp: {since}')
+            if timezone.is_naive(since_at):
+                since_at = timezone.make_aware(since_at)
+        else:
+            since_at = None
+        watermark = timezone.now()
+
+        self.stdout.write(
+            f'🔄 Exporting changes since {since_at.isoformat() if since_at else "the beginning"}'
+            f'{f" (less a {margin.total_seconds():.0f}s safety margin)" if since_at else ""}...'
+        )
+        with open_output(output_path) as f:
+            counts = write_delta(f, sections, since_at, watermark, chunk_size, margin)
+
+        if watermark_file:
+            with open(watermark_file, 'w', encoding='utf-8') as f:
+                f.write(watermark.isoformat() + '\n')
+
+        for (section, op), count in counts.items():
+            action = 'changed' if op == 'upsert' else 'deleted'
+            self.stdout.write(f'  ✅ {count} {section.replace("_", " ")} {action}')
+
+        file_size_kb = os.path.getsize(output_path) / 1024
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Exported {sum(counts.values())} changes to {output_path} ({file_size_kb:.1f} KB)\n'
+                f'  Watermark: {watermark.isoformat()} (pass as --since for the next delta)'
+            )
+        )
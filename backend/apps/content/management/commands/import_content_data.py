@@ -2,16 +2,26 @@
 Management command to import content data (products, categories, blogs, testimonials) from JSON.
 
 This command imports content-related data from a JSON file exported by export_content_data
-into the current database.
+into the current database. The file is read one section at a time and rows are upserted in
+batches, so existing rows with the same ids are updated and large catalogs import quickly
+without loading the whole file into memory. Everything is imported in one transaction.
+
+Delta files (export_content_data --delta) are recognised automatically: their changed rows are
+upserted and their deleted rows deleted, so applying the same delta twice is harmless. Either
+kind of file may be gzip-compressed.
 
 Usage:
     python manage.py import_content_data --input data/content_export.json
     python manage.py import_content_data --input data/content_export.json --clear-existing
+    python manage.py import_content_data --input data/content_export.json --batch-size 5000
+    python manage.py import_content_data --input data/delta.jsonl
 """
-import json
+import io
+import time
 from django.core.management.base import BaseCommand
-from django.core import serializers
 from django.db import transaction
+from apps.core.cache import bump_model_version
+from apps.core.jsonstream import InvalidJSON, JSONArray, iter_json_sections, open_input
 from apps.products.models import (
     Product, ProductImage, Category, Subcategory, Tag
 )
@@ -20,6 +30,10 @@ from apps.content.models import (
     SustainableGiftingItem, AboutUsSection, OurStorySection,
     OurCommitmentSection, PhotoGalleryItem
 )
+from apps.content.delta import DeltaError, apply_delta, is_delta
+from apps.content.transfer import (
+    CONTENT_SECTIONS, DEFAULT_BATCH_SIZE, PRODUCT_SECTIONS, BulkUpserter, replace_m2m
+)
 
 
 class Command(BaseCommand):
@@ -57,6 +71,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Import only content models'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows saved per INSERT statement (default: {DEFAULT_BATCH_SIZE})'
+        )
 
     def handle(self, *args, **options):
         input_path = options['input']
@@ -65,6 +85,7 @@ class Command(BaseCommand):
         skip_content = options['skip_content']
         only_products = options['only_products']
         only_content = options['only_content']
+        batch_size = options['batch_size']
 
         if only_products and only_content:
             self.stdout.write(
@@ -76,163 +97,166 @@ class Command(BaseCommand):
         import_products = not skip_products and not only_content
         import_content = not skip_content and not only_products
 
-        # Read JSON file
+        sections = {}
+        if import_products:
+            sections.update(PRODUCT_SECTIONS)
+        if import_content:
+            sections.update(CONTENT_SECTIONS)
+
+        import_count = 0
+        metadata = None
+        tags_restored = False
+        started = time.monotonic()
+
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            f = open_input(input_path)
         except FileNotFoundError:
             self.stdout.write(
                 self.style.ERROR(f'File not found: {input_path}')
             )
             return
-        except json.JSONDecodeError as e:
+        delta = is_delta(f.readline(4096))
+        f.seek(0)
+        if delta and clear_existing:
+            f.close()
             self.stdout.write(
-                self.style.ERROR(f'Invalid JSON file: {e}')
+                self.style.ERROR('--clear-existing cannot be used with a delta file')
             )
             return
 
-        # Clear existing data if requested
-        if clear_existing:
-            self.stdout.write(
-                self.style.WARNING('🗑️  Clearing existing data...')
-            )
-            if import_products:
-                ProductImage.objects.all().delete()
-                Product.objects.all().delete()
-                Subcategory.objects.all().delete()
-                Tag.objects.all().delete()
-                Category.objects.all().delete()
-                self.stdout.write('  ✅ Cleared products, categories, tags')
-            
-            if import_content:
-                BlogPost.objects.all().delete()
-                TextTestimonial.objects.all().delete()
-                VideoTestimonial.objects.all().delete()
-                SustainableGiftingItem.objects.all().delete()
-                AboutUsSection.objects.all().delete()
-                OurStorySection.objects.all().delete()
-                OurCommitmentSection.objects.all().delete()
-                PhotoGalleryItem.objects.all().delete()
-                self.stdout.write('  ✅ Cleared content models')
+        try:
+            with f, transaction.atomic():
+                # Clear existing data if requested
+                if clear_existing:
+                    self.stdout.write(
+                        self.style.WARNING('🗑️  Clearing existing data...')
+                    )
+                    if import_products:
+                        ProductImage.objects.all().delete()
+                        Product.objects.all().delete()
+                        Subcategory.objects.all().delete()
+                        Tag.objects.all().delete()
+                        Category.objects.all().delete()
+                        self.stdout.write('  ✅ Cleared products, categories, tags')
 
-        import_count = 0
+                    if import_content:
+                        BlogPost.objects.all().delete()
+                        TextTestimonial.objects.all().delete()
+                        VideoTestimonial.objects.all().delete()
+                        SustainableGiftingItem.objects.all().delete()
+                        AboutUsSection.objects.all().delete()
+                        OurStorySection.objects.all().delete()
+                        OurCommitmentSection.objects.all().delete()
+                        PhotoGalleryItem.objects.all().delete()
+                        self.stdout.write('  ✅ Cleared content models')
 
-        # Import products and related data
-        if import_products and 'categories' in data:
-            self.stdout.write('📦 Importing products and related data...')
-            
-            try:
-                with transaction.atomic():
-                    # Import in dependency order
-                    if 'categories' in data and data['categories']:
-                        for obj in serializers.deserialize('json', json.dumps(data['categories'])):
-                            obj.save()
-                        import_count += len(data['categories'])
-                        self.stdout.write(
-                            self.style.SUCCESS(f'  ✅ Imported {len(data["categories"])} categories')
-                        )
-
-                    if 'subcategories' in data and data['subcategories']:
-                        for obj in serializers.deserialize('json', json.dumps(data['subcategories'])):
-                            obj.save()
-                        import_count += len(data['subcategories'])
-                        self.stdout.write(
-                            self.style.SUCCESS(f'  ✅ Imported {len(data["subcategories"])} subcategories')
-                        )
-
-                    if 'tags' in data and data['tags']:
-                        for obj in serializers.deserialize('json', json.dumps(data['tags'])):
-                            obj.save()
-                        import_count += len(data['tags'])
-                        self.stdout.write(
-                            self.style.SUCCESS(f'  ✅ Imported {len(data["tags"])} tags')
-                        )
-
-                    if 'products' in data and data['products']:
-                        for obj in serializers.deserialize('json', json.dumps(data['products'])):
-                            obj.save()
-                        import_count += len(data['products'])
-                        self.stdout.write(
-                            self.style.SUCCESS(f'  ✅ Imported {len(data["products"])} products')
-                        )
-
-                    if 'product_images' in data and data['product_images']:
-                        for obj in serializers.deserialize('json', json.dumps(data['product_images'])):
-                            obj.save()
-                        import_count += len(data['product_images'])
-                        self.stdout.write(
-                            self.style.SUCCESS(f'  ✅ Imported {len(data["product_images"])} product images')
-                        )
-
-                    # Import many-to-many relationships (product-tags)
-                    if 'product_tags' in data and data['product_tags']:
-                        for pt in data['product_tags']:
-                            try:
-                                product = Product.objects.get(id=pt['product_id'])
-                                tag_ids = pt['tag_ids']
-                                tags = Tag.objects.filter(id__in=tag_ids)
-                                product.tags.set(tags)
-                            except Product.DoesNotExist:
-                                self.stdout.write(
-                                    self.style.WARNING(
-                                        f'  ⚠️  Product {pt["product_id"]} not found, skipping tags'
-                                    )
+                if delta:
+                    import_count = self._apply_delta(f, sections, batch_size)
+                else:
+                    # Sections are read and saved one at a time, in file order
+                    for key, value in iter_json_sections(io.TextIOWrapper(f, encoding='utf-8')):
+                        if key == '_metadata':
+                            metadata = value
+                        elif key in sections and isinstance(value, JSONArray):
+                            upserter = BulkUpserter(sections[key], batch_size=batch_size)
+                            for record in value:
+                                upserter.add(record)
+                            upserter.flush()
+                            import_count += upserter.count
+                            tags_restored = tags_restored or (key == 'products' and upserter.count > 0)
+                            self.stdout.write(
+                                self.style.SUCCESS(
+                                    f'  ✅ Imported {upserter.count} {key.replace("_", " ")} '
+                                    f'({upserter.rate:,.0f} rows/s)'
                                 )
-                        self.stdout.write(
-                            self.style.SUCCESS(f'  ✅ Restored {len(data["product_tags"])} product-tag relationships')
-                        )
-
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'❌ Error importing products: {e}')
-                )
-                raise
-
-        # Import content models
-        if import_content:
-            self.stdout.write('📝 Importing content data...')
-            
-            try:
-                with transaction.atomic():
-                    content_models = {
-                        'blogs': BlogPost,
-                        'text_testimonials': TextTestimonial,
-                        'video_testimonials': VideoTestimonial,
-                        'sustainable_gifting': SustainableGiftingItem,
-                        'about_us': AboutUsSection,
-                        'our_story': OurStorySection,
-                        'our_commitment': OurCommitmentSection,
-                        'photo_gallery': PhotoGalleryItem,
-                    }
-
-                    for key, model_class in content_models.items():
-                        if key in data and data[key]:
-                            for obj in serializers.deserialize('json', json.dumps(data[key])):
-                                obj.save()
-                            import_count += len(data[key])
+                            )
+                        elif key == 'product_tags' and import_products and isinstance(value, JSONArray):
+                            # Products carry their tags, so this only matters for files without products
+                            if tags_restored:
+                                continue
+                            count = self._import_product_tags(value, batch_size)
                             self.stdout.write(
-                                self.style.SUCCESS(f'  ✅ Imported {len(data[key])} {key.replace("_", " ")}')
+                                self.style.SUCCESS(f'  ✅ Restored {count} product-tag relationships')
                             )
+        except InvalidJSON as e:
+            self.stdout.write(
+                self.style.ERROR(f'Invalid JSON file: {e}')
+            )
+            return
+        except DeltaError as e:
+            self.stdout.write(
+                self.style.ERROR(f'❌ Invalid delta file, nothing was imported: {e}')
+            )
+            return
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'❌ Error importing data: {e}')
+            )
+            raise
 
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f'❌ Error importing content: {e}')
-                )
-                raise
+        elapsed = time.monotonic() - started
+        rate = import_count / elapsed if elapsed else 0.0
 
         # Display metadata if available
-        if '_metadata' in data:
-            metadata = data['_metadata']
+        if metadata is not None:
             self.stdout.write(
                 self.style.SUCCESS(
                     f'\n📊 Import Summary:\n'
-                    f'  Total objects imported: {import_count}\n'
+                    f'  Total objects imported: {import_count} in {elapsed:.1f}s ({rate:,.0f} rows/s)\n'
                     f'  Original export date: {metadata.get("exported_at", "Unknown")}\n'
                     f'  Original object count: {metadata.get("total_objects", "Unknown")}'
                 )
             )
         else:
             self.stdout.write(
-                self.style.SUCCESS(f'\n✅ Successfully imported {import_count} objects')
+                self.style.SUCCESS(
+                    f'\n✅ Successfully imported {import_count} objects in {elapsed:.1f}s ({rate:,.0f} rows/s)'
+                )
+            )
+
+    def _apply_delta(self, f, sections, batch_size):
+        """Apply a delta file; returns the rows changed or deleted."""
+        count = 0
+        results = apply_delta(f, sections, batch_size=batch_size)
+        header = next(results)
+        self.stdout.write(
+            f'🔄 Applying changes from {header["since"] or "the beginning"} to {header["watermark"]}...'
+        )
+        for result in results:
+            section = result['section'].replace('_', ' ')
+            if not result['applied']:
+                self.stdout.write(f'  ⏭️  Skipped {result["count"]} {section} ({result["op"]})')
+                continue
+            count += result['count']
+            action = 'Upserted' if result['op'] == 'upsert' else 'Deleted'
+            self.stdout.write(
+                self.style.SUCCESS(f'  ✅ {action} {result["count"]} {section} ({result["rate"]:,.0f} rows/s)')
             )
+        return count
+
+    def _import_product_tags(self, entries, batch_size):
+        """Replace the tags of each product in a product_tags section; returns the relations restored."""
+        field = Product._meta.get_field('tags')
+        to_uuid = Tag._meta.pk.to_python
+        relations = {}
+        count = 0
+
+        def flush():
+            nonlocal count
+            found = set(Product.objects.filter(id__in=list(relations)).values_list('id', flat=True))
+            for product_id in relations.keys() - found:
+                self.stdout.write(
+                    self.style.WARNING(f'  ⚠️  Product {product_id} not found, skipping tags')
+                )
+            count += replace_m2m(field, {pk: relations[pk] for pk in found})
+            relations.clear()
+
+        for entry in entries:
+            relations[to_uuid(entry['product_id'])] = [to_uuid(tag_id) for tag_id in entry['tag_ids']]
+            if len(relations) >= batch_size:
+                flush()
+        if relations:
+            flush()
+        bump_model_version(Product)
+        return count
 
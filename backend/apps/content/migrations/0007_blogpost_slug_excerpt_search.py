@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:18
+
+import math
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.utils.text import slugify
+
+# Full-text search over title and content; must match the expression in blogs_view
+SEARCH_INDEX = GinIndex(SearchVector('title', 'content', config='english'), name='blog_posts_search_idx')
+
+
+def populate_blog_fields(apps, schema_editor):
+    """Set slug, excerpt and reading time on existing posts, as BlogPost.save() does."""
+    BlogPost = apps.get_model('content', 'BlogPost')
+    used = set()
+    for post in BlogPost.objects.order_by('created_at'):
+        base = slugify(post.title)[:200] or 'post'
+        slug, suffix = base, 2
+        while slug in used:
+            slug, suffix = f'{base}-{suffix}', suffix + 1
+        used.add(slug)
+
+        text = ' '.join(post.content.split())
+        if len(text) > 200:
+            text = text[:200].rsplit(' ', 1)[0].rstrip('.,;:!?-—') + '…'
+        post.slug = slug
+        post.excerpt = text
+        post.reading_time_minutes = max(1, math.ceil(len(post.content.split()) / 200))
+        post.save(update_fields=['slug', 'excerpt', 'reading_time_minutes'])
+
+
+def add_search_index(apps, schema_editor):
+    # Expression GIN indexes are PostgreSQL only; other databases search without an index
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('content', 'BlogPost'), SEARCH_INDEX)
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('content', 'BlogPost'), SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0006_remove_contactinfo_response_message_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Start of the content, set on save'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_time_minutes',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='slug',
+            # Not indexed until populated; the unique constraint below adds the index
+            field=models.SlugField(blank=True, db_index=False, help_text='Leave empty to generate from the title', max_length=220),
+        ),
+        migrations.RunPython(populate_blog_fields, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='blogpost',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Leave empty to generate from the title', max_length=220, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-published_date', 'order', 'id'], name='blog_posts_listing_idx'),
+        ),
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
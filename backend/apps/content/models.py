@@ -1,8 +1,37 @@
 """
 Content models for Dolce Fiore.
 """
+import math
 import uuid
 from django.db import models
+from django.utils.text import slugify
+from apps.core.cache import watch_model
+from apps.core.tombstones import track_deletions
+
+# Blog excerpt length (characters) and reading speed (words per minute)
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """First length characters of text as one paragraph, cut at a word boundary."""
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(' ', 1)[0].rstrip('.,;:!?-—') + '…'
+
+
+def reading_time_minutes(text):
+    return max(1, math.ceil(len(text.split()) / WORDS_PER_MINUTE))
+
+
+def unique_slug(model, value, exclude_pk=None, taken=()):
+    """Slug of value that no other row of model (or taken) uses, with a numeric suffix if needed."""
+    base = slugify(value)[:200] or 'post'
+    slug, suffix = base, 2
+    while slug in taken or model.objects.filter(slug=slug).exclude(pk=exclude_pk).exists():
+        slug, suffix = f'{base}-{suffix}', suffix + 1
+    return slug
 
 
 class SustainableGiftingItem(models.Model):
@@ -171,7 +200,10 @@ class BlogPost(models.Model):
     """Model for Blog posts on About Us page."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=220, unique=True, blank=True, help_text='Leave empty to generate from the title')
     content = models.TextField()
+    excerpt = models.TextField(blank=True, editable=False, help_text='Start of the content, set on save')
+    reading_time_minutes = models.PositiveIntegerField(default=1, editable=False)
     image_url = models.URLField(blank=True, help_text='Optional image for the blog post')
     published_date = models.DateField()
     order = models.IntegerField(default=0)
@@ -186,10 +218,27 @@ class BlogPost(models.Model):
             models.Index(fields=['is_active']),
             models.Index(fields=['published_date']),
             models.Index(fields=['order']),
+            # Listing order, used as the pagination cursor
+            models.Index(
+                fields=['-published_date', 'order', 'id'],
+                name='blog_posts_listing_idx',
+                condition=models.Q(is_active=True),
+            ),
         ]
     
     def __str__(self):
         return self.title
+    
+    def save(self, *args, **kwargs):
+        """Keep the slug, excerpt and reading time in step with the content."""
+        if not self.slug:
+            self.slug = unique_slug(BlogPost, self.title, exclude_pk=self.pk)
+        self.excerpt = make_excerpt(self.content)
+        self.reading_time_minutes = reading_time_minutes(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt', 'reading_time_minutes'}
+        super().save(*args, **kwargs)
 
 
 class ContactSubmission(models.Model):
@@ -317,4 +366,34 @@ class ContactInfo(models.Model):
         if self.is_active:
             # Deactivate all other contact info records
             ContactInfo.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+
+# Cached content endpoints are rebuilt when these change
+for model in (
+    SustainableGiftingItem,
+    TextTestimonial,
+    VideoTestimonial,
+    AboutUsSection,
+    OurStorySection,
+    OurCommitmentSection,
+    PhotoGalleryItem,
+    BlogPost,
+    StoreCenter,
+    ContactInfo,
+):
+    watch_model(model)
+
+# Delta exports find changed rows by updated_at and deleted rows by their tombstones
+for model in (
+    SustainableGiftingItem,
+    TextTestimonial,
+    VideoTestimonial,
+    AboutUsSection,
+    OurStorySection,
+    OurCommitmentSection,
+    PhotoGalleryItem,
+    BlogPost,
+):
+    track_deletions(model)
@@ -0,0 +1,11 @@
+"""
+Pagination for content app.
+"""
+from apps.core.pagination import KeysetPagination
+
+
+class BlogPagination(KeysetPagination):
+    """Blog posts, newest first; ties broken by display order, then id."""
+    ordering = ('-published_date', 'order', 'id')
+    page_size = 10
+    max_page_size = 50
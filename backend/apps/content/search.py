@@ -0,0 +1,27 @@
+"""
+Blog search for content app.
+
+On PostgreSQL, posts are matched with full-text search on title and content
+using the blog_posts_search_idx GIN index (migration 0007), with stemming, so
+"gifting" finds "gifts". Other databases fall back to substring matching.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.db.models import Q
+
+SEARCH_CONFIG = 'english'
+
+
+def search_blog_posts(queryset, terms):
+    """
+    Filter blog posts to those matching terms.
+
+    Args:
+        terms: Search words; on PostgreSQL, "quoted phrases", OR and -excluded words work as in web search
+    """
+    if connection.vendor == 'postgresql':
+        # Same expression as the index, so the index is used
+        return queryset.alias(
+            search=SearchVector('title', 'content', config=SEARCH_CONFIG),
+        ).filter(search=SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch'))
+    return queryset.filter(Q(title__icontains=terms) | Q(content__icontains=terms))
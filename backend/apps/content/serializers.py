@@ -128,8 +128,11 @@ class BlogPostSerializer(serializers.ModelSerializer):
         model = BlogPost
         fields = [
             'id',
+            'slug',
             'title',
             'content',
+            'excerpt',
+            'reading_time_minutes',
             'image_url',
             'published_date',
             'order',
@@ -137,6 +140,23 @@ class BlogPostSerializer(serializers.ModelSerializer):
         ]
 
 
+class BlogPostSummarySerializer(serializers.ModelSerializer):
+    """Serializer for Blog posts in listings (without the content body)."""
+    
+    class Meta:
+        model = BlogPost
+        fields = [
+            'id',
+            'slug',
+            'title',
+            'excerpt',
+            'reading_time_minutes',
+            'image_url',
+            'published_date',
+            'order',
+        ]
+
+
 class ContactSubmissionSerializer(serializers.ModelSerializer):
     """Serializer for contact form submissions."""
     
@@ -0,0 +1,49 @@
+"""
+Tests for the content app.
+"""
+import io
+import json
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from apps.content.delta import SAFETY_MARGIN, write_delta
+from apps.core.models import DeletedRecord
+from apps.products.models import Tag
+
+
+class WriteDeltaSafetyMarginTests(TestCase):
+    """A delta re-reads SAFETY_MARGIN before since, so changes committed after the previous delta are kept."""
+
+    sections = {'tags': Tag}
+
+    def setUp(self):
+        self.previous_watermark = timezone.now() - timedelta(hours=1)
+        Tag.objects.update(updated_at=self.previous_watermark - timedelta(days=1))  # Tags seeded by migrations
+        # Saved just before the previous delta's watermark, but committed after that delta was written
+        self.late = Tag.objects.create(name='Late Commit', slug='late-commit')
+        Tag.objects.filter(pk=self.late.pk).update(updated_at=self.previous_watermark - timedelta(seconds=5))
+        self.old = Tag.objects.create(name='Old', slug='old')
+        Tag.objects.filter(pk=self.old.pk).update(updated_at=self.previous_watermark - 2 * SAFETY_MARGIN)
+        DeletedRecord.objects.create(
+            model='products.tag',
+            object_id='1f0c7f5e-0000-4000-8000-000000000001',
+            deleted_at=self.previous_watermark - timedelta(seconds=5),
+        )
+
+    def export(self, **kwargs):
+        out = io.BytesIO()
+        write_delta(out, self.sections, self.previous_watermark, timezone.now(), **kwargs)
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_overlap_includes_late_commits(self):
+        lines = self.export()
+        upserted = {line['pk'] for line in lines if line['type'] == 'upsert'}
+        deleted = {line['pk'] for line in lines if line['type'] == 'delete'}
+
+        self.assertEqual(upserted, {str(self.late.pk)})
+        self.assertEqual(deleted, {'1f0c7f5e-0000-4000-8000-000000000001'})
+        self.assertEqual(lines[0]['margin'], SAFETY_MARGIN.total_seconds())
+
+    def test_without_margin(self):
+        lines = self.export(margin=timedelta(0))
+        self.assertEqual([line['type'] for line in lines], ['header', 'footer'])
@@ -0,0 +1,211 @@
+"""
+Bulk export and import of catalog and content data for content app.
+
+Records are in Django's serialization format ({"model", "pk", "fields"}).
+iter_records() serializes a queryset to records a chunk of rows at a time,
+for export_content_data. BulkUpserter inserts them in batches with one
+INSERT ... ON CONFLICT (id) DO UPDATE per batch, so importing into a database
+that already has some of the rows updates them in place, and replaces the
+many-to-many relations of each imported row with one bulk insert.
+
+Bulk inserts skip Model.save() and model signals: timestamps are taken from
+the records, and cached responses built from the model are invalidated once
+per batch.
+"""
+import time
+from contextlib import contextmanager
+from django.core import serializers
+from django.utils import timezone
+from apps.core.cache import bump_model_version
+from apps.products.models import Product, ProductImage, Category, Subcategory, Tag
+from .models import (
+    BlogPost, TextTestimonial, VideoTestimonial,
+    SustainableGiftingItem, AboutUsSection, OurStorySection,
+    OurCommitmentSection, PhotoGalleryItem,
+    make_excerpt, reading_time_minutes, unique_slug,
+)
+
+# Export sections, in dependency order
+PRODUCT_SECTIONS = {
+    'categories': Category,
+    'subcategories': Subcategory,
+    'tags': Tag,
+    'products': Product,
+    'product_images': ProductImage,
+}
+CONTENT_SECTIONS = {
+    'blogs': BlogPost,
+    'text_testimonials': TextTestimonial,
+    'video_testimonials': VideoTestimonial,
+    'sustainable_gifting': SustainableGiftingItem,
+    'about_us': AboutUsSection,
+    'our_story': OurStorySection,
+    'our_commitment': OurCommitmentSection,
+    'photo_gallery': PhotoGalleryItem,
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _prepare_blog_posts(posts):
+    """Fill the fields BlogPost.save() derives, for exports made before they existed."""
+    slugs = {post.slug for post in posts if post.slug}
+    for post in posts:
+        if not post.excerpt:
+            post.excerpt = make_excerpt(post.content)
+            post.reading_time_minutes = reading_time_minutes(post.content)
+        if not post.slug:
+            post.slug = unique_slug(BlogPost, post.title, exclude_pk=post.pk, taken=slugs)
+            slugs.add(post.slug)
+
+
+# Per-model fix-ups applied to each batch of deserialized instances before it is saved
+PREPARE = {
+    BlogPost: _prepare_blog_posts,
+}
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_records(queryset, chunk_size=DEFAULT_BATCH_SIZE):
+    """Serialize the rows of queryset to records, reading and serializing chunk_size rows at a time."""
+    m2m = [field.name for field in queryset.model._meta.local_many_to_many]
+    rows = queryset.prefetch_related(*m2m).iterator(chunk_size=chunk_size)
+    for chunk in _chunks(rows, chunk_size):
+        yield from serializers.serialize('python', chunk)
+
+
+def iter_product_tags(chunk_size=DEFAULT_BATCH_SIZE):
+    """Yield {'product_id', 'tag_ids'} for every product that has tags."""
+    through = Product.tags.through.objects.order_by('product_id', 'tag_id').values_list('product_id', 'tag_id')
+    product_id, tag_ids = None, []
+    for row_product_id, tag_id in through.iterator(chunk_size=chunk_size):
+        if row_product_id != product_id:
+            if tag_ids:
+                yield {'product_id': str(product_id), 'tag_ids': tag_ids}
+            product_id, tag_ids = row_product_id, []
+        tag_ids.append(str(tag_id))
+    if tag_ids:
+        yield {'product_id': str(product_id), 'tag_ids': tag_ids}
+
+
+@contextmanager
+def record_timestamps(model, objects):
+    """
+    Save auto_now/auto_now_add fields of objects as they are, rather than as the current time.
+
+    Objects without a value (records exported before the field existed) get the current time.
+    """
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    now = timezone.now()
+    for obj in objects:
+        for field, _auto_now, _auto_now_add in fields:
+            if getattr(obj, field.attname) is None:
+                setattr(obj, field.attname, now)
+    for field, _auto_now, _auto_now_add in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class BulkUpserter:
+    """
+    Insert or update serialized records of one model in batches.
+
+        upserter = BulkUpserter(Product)
+        for record in records:
+            upserter.add(record)
+        upserter.flush()
+        print(upserter.count, upserter.rate)
+    """
+
+    def __init__(self, model, batch_size=DEFAULT_BATCH_SIZE):
+        self.model = model
+        self.batch_size = batch_size
+        self.count = 0
+        self.m2m_fields = [field for field in model._meta.local_many_to_many if field.remote_field.through._meta.auto_created]
+        self.update_fields = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+        self._batch = []
+        self._started = time.monotonic()
+
+    @property
+    def rate(self):
+        """Rows saved per second so far."""
+        elapsed = time.monotonic() - self._started
+        return self.count / elapsed if elapsed else 0.0
+
+    def add(self, record):
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._batch:
+            return
+        records, self._batch = self._batch, []
+        prepare = PREPARE.get(self.model)
+        objects, relations = [], {field.name: {} for field in self.m2m_fields}
+        for deserialized in serializers.deserialize('python', records, ignorenonexistent=True):
+            objects.append(deserialized.object)
+            for name, pks in (deserialized.m2m_data or {}).items():
+                if name in relations:
+                    relations[name][deserialized.object.pk] = pks
+        if prepare:
+            prepare(objects)
+
+        with record_timestamps(self.model, objects):
+            self.model.objects.bulk_create(
+                objects,
+                update_conflicts=True,
+                unique_fields=[self.model._meta.pk.name],
+                update_fields=self.update_fields,
+            )
+        for field in self.m2m_fields:
+            if relations[field.name]:
+                replace_m2m(field, relations[field.name])
+        self.count += len(objects)
+        bump_model_version(self.model)
+
+
+def replace_m2m(field, relations):
+    """
+    Set the related rows of many-to-many field for many source rows at once.
+
+    Args:
+        field: ManyToManyField with an auto-created through model
+        relations: Dict of source pk -> list of related pks; related pks that
+            do not exist are skipped
+
+    Returns:
+        int: Through rows inserted
+    """
+    through = field.remote_field.through
+    source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+    wanted = {pk for pks in relations.values() for pk in pks}
+    existing = set(field.related_model.objects.filter(pk__in=wanted).values_list('pk', flat=True))
+
+    through.objects.filter(**{f'{source}__in': list(relations)}).delete()
+    rows = [
+        through(**{f'{source}_id': source_pk, f'{target}_id': target_pk})
+        for source_pk, pks in relations.items()
+        for target_pk in dict.fromkeys(pks)
+        if target_pk in existing
+    ]
+    through.objects.bulk_create(rows, batch_size=DEFAULT_BATCH_SIZE)
+    return len(rows)
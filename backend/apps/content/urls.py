@@ -11,9 +11,12 @@ from .views import (
     our_commitment_view,
     photo_gallery_view,
     blogs_view,
+    blog_detail_view,
     contact_form_submission_view,
     contact_info_view,
     store_centers_view,
+    home_bundle_view,
+    about_bundle_view,
 )
 
 app_name = 'content'
@@ -27,8 +30,11 @@ urlpatterns = [
     path('our-commitment/', our_commitment_view, name='our-commitment'),
     path('photo-gallery/', photo_gallery_view, name='photo-gallery'),
     path('blogs/', blogs_view, name='blogs'),
+    path('blogs/<str:id_or_slug>/', blog_detail_view, name='blog-detail'),
     path('contact/', contact_form_submission_view, name='contact-submission'),
     path('contact-info/', contact_info_view, name='contact-info'),
     path('store-centers/', store_centers_view, name='store-centers'),
+    path('bundle/home/', home_bundle_view, name='home-bundle'),
+    path('bundle/about/', about_bundle_view, name='about-bundle'),
 ]
 
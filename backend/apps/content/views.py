@@ -1,11 +1,17 @@
 """
 Views for content app.
 """
+import uuid
+from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from apps.core.cache import cached_view
+from apps.core.throttling import CatalogRateThrottle, ContactFormRateThrottle
+from .bundles import ABOUT_MODELS, ABOUT_SECTIONS, HOME_MODELS, HOME_SECTIONS, build_bundle
+from .defaults import DEFAULT_ABOUT_US, DEFAULT_CONTACT_INFO, DEFAULT_OUR_STORY
 from .models import (
     SustainableGiftingItem,
     TextTestimonial,
@@ -19,6 +25,8 @@ from .models import (
     ContactInfo,
     StoreCenter,
 )
+from .pagination import BlogPagination
+from .search import search_blog_posts
 from .serializers import (
     SustainableGiftingItemSerializer,
     TextTestimonialSerializer,
@@ -28,6 +36,7 @@ from .serializers import (
     OurCommitmentSectionSerializer,
     PhotoGalleryItemSerializer,
     BlogPostSerializer,
+    BlogPostSummarySerializer,
     ContactSubmissionSerializer,
     ContactInfoSerializer,
     StoreCenterSerializer,
@@ -42,6 +51,8 @@ from .serializers import (
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(SustainableGiftingItem)
 def sustainable_gifting_list_view(request):
     """Get all active sustainable gifting items."""
     queryset = SustainableGiftingItem.objects.filter(is_active=True).order_by('order')
@@ -57,6 +68,8 @@ def sustainable_gifting_list_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(TextTestimonial)
 def text_testimonials_list_view(request):
     """Get all active text testimonials."""
     queryset = TextTestimonial.objects.filter(is_active=True).order_by('order')
@@ -72,6 +85,8 @@ def text_testimonials_list_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(VideoTestimonial)
 def video_testimonials_list_view(request):
     """Get all active video testimonials."""
     queryset = VideoTestimonial.objects.filter(is_active=True).order_by('order')
@@ -87,6 +102,8 @@ def video_testimonials_list_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(AboutUsSection)
 def about_us_view(request):
     """Get active About Us section with default fallback."""
     queryset = AboutUsSection.objects.filter(is_active=True).order_by('order').first()
@@ -96,20 +113,7 @@ def about_us_view(request):
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     # Default fallback content
-    default_data = {
-        'id': None,
-        'title': 'About Us',
-        'content': (
-            'At Dolce Fiore, we are passionate about creating premium, sustainable gift experiences '
-            'that celebrate health, sustainability, and conscious living. Every product is designed '
-            'to delight while leaving a positive impact on people and the planet. We believe that '
-            'premium gifting can and should be kind to the planet, creating beautiful moments '
-            'without leaving a heavy footprint.'
-        ),
-        'order': 0,
-        'is_active': True,
-    }
-    return Response(default_data, status=status.HTTP_200_OK)
+    return Response(DEFAULT_ABOUT_US, status=status.HTTP_200_OK)
 
 
 @extend_schema(
@@ -120,6 +124,8 @@ def about_us_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(OurStorySection)
 def our_story_view(request):
     """Get active Our Story section with default fallback."""
     queryset = OurStorySection.objects.filter(is_active=True).order_by('order').first()
@@ -129,21 +135,7 @@ def our_story_view(request):
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     # Default fallback content
-    default_data = {
-        'id': None,
-        'title': 'Our Story',
-        'content': (
-            'Dolce Fiore began as a homegrown venture with a simple dream — to craft thoughtful, '
-            'sustainable gifting experiences. What started four years ago with a passion for healthy '
-            'indulgence has grown into a celebration of creativity and conscious living.\n\n'
-            'We proudly partner with local artisans across India, bringing tradition and sustainability '
-            'into every creation. Every hamper is handcrafted with care, featuring organic ingredients, '
-            'air-fried savories, and sugar-free chocolates — all wrapped in eco-friendly, reusable packaging.'
-        ),
-        'order': 0,
-        'is_active': True,
-    }
-    return Response(default_data, status=status.HTTP_200_OK)
+    return Response(DEFAULT_OUR_STORY, status=status.HTTP_200_OK)
 
 
 @extend_schema(
@@ -154,6 +146,8 @@ def our_story_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(OurCommitmentSection)
 def our_commitment_view(request):
     """Get all active Our Commitment sections."""
     queryset = OurCommitmentSection.objects.filter(is_active=True).order_by('order')
@@ -169,6 +163,8 @@ def our_commitment_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(PhotoGalleryItem)
 def photo_gallery_view(request):
     """Get all active photo gallery items."""
     queryset = PhotoGalleryItem.objects.filter(is_active=True).order_by('order')
@@ -179,16 +175,72 @@ def photo_gallery_view(request):
 @extend_schema(
     tags=['Content'],
     summary='List blog posts',
-    description='Get all active blog posts ordered by published date (newest first)',
-    responses={200: BlogPostSerializer(many=True)},
+    description=(
+        'Get active blog posts, newest first. With cursor or page_size, returns a page at a time as '
+        '{"next": <link or null>, "results": [...]}; follow the next link for the next page. Without '
+        'either, returns every post as a list. Use view=summary to leave out the content body, and search '
+        'for full-text search over title and content.'
+    ),
+    parameters=[
+        OpenApiParameter(name='view', type=str, enum=['full', 'summary'], required=False, description='full (default) or summary'),
+        OpenApiParameter(name='search', type=str, required=False, description='Words to search for in title and content'),
+        OpenApiParameter(name='cursor', type=str, required=False, description='Cursor from the previous page\'s next link'),
+        OpenApiParameter(name='page_size', type=int, required=False, description='Posts per page (default 10, at most 50)'),
+    ],
+    responses={200: OpenApiResponse(
+        response=BlogPostSerializer(many=True),
+        description='A list, or {"next": <link or null>, "results": [...]} when paginated; summary results omit content',
+    )},
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(BlogPost)
 def blogs_view(request):
-    """Get all active blog posts ordered by published date."""
-    queryset = BlogPost.objects.filter(is_active=True).order_by('-published_date', 'order')
-    serializer = BlogPostSerializer(queryset, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    """Get active blog posts ordered by published date, a page at a time if asked for."""
+    queryset = BlogPost.objects.filter(is_active=True)
+    search = request.query_params.get('search', '').strip()
+    if search:
+        queryset = search_blog_posts(queryset, search)
+
+    summary = request.query_params.get('view') == 'summary'
+    if summary:
+        # Never read the body from the database
+        queryset = queryset.defer('content')
+
+    serializer_class = BlogPostSummarySerializer if summary else BlogPostSerializer
+    paginator = BlogPagination()
+    params = request.query_params
+    if paginator.cursor_query_param not in params and paginator.page_size_query_param not in params:
+        # Unpaginated list, as this endpoint returned before pagination was added
+        posts = queryset.order_by(*paginator.ordering)
+        return Response(serializer_class(posts, many=True).data, status=status.HTTP_200_OK)
+
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(serializer_class(page, many=True).data)
+
+
+@extend_schema(
+    tags=['Content'],
+    summary='Get blog post',
+    description='Get an active blog post by id or slug',
+    responses={200: BlogPostSerializer, 404: {'description': 'Blog post not found'}},
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(BlogPost)
+def blog_detail_view(request, id_or_slug):
+    """Get an active blog post by id or slug."""
+    posts = BlogPost.objects.filter(is_active=True)
+    try:
+        # Try as UUID first
+        post = posts.filter(id=uuid.UUID(id_or_slug)).first()
+    except ValueError:
+        post = None
+    if post is None:
+        post = get_object_or_404(posts, slug=id_or_slug)
+    return Response(BlogPostSerializer(post).data, status=status.HTTP_200_OK)
 
 
 @extend_schema(
@@ -200,6 +252,7 @@ def blogs_view(request):
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([ContactFormRateThrottle])
 def contact_form_submission_view(request):
     """Handle contact form submissions."""
     serializer = ContactSubmissionSerializer(data=request.data)
@@ -222,6 +275,8 @@ def contact_form_submission_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(ContactInfo)
 def contact_info_view(request):
     """Get active contact information with default fallback."""
     queryset = ContactInfo.objects.filter(is_active=True).first()
@@ -231,20 +286,7 @@ def contact_info_view(request):
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     # Default fallback content
-    default_data = {
-        'id': None,
-        'email': 'hello@dolcefiore.com',
-        'phone': '+91 1234567890',
-        'additional_info': '',
-        'opening_hours_monday': '6:00 AM - 8:00 PM',
-        'opening_hours_tuesday': '6:00 AM - 8:00 PM',
-        'opening_hours_wednesday': '6:00 AM - 8:00 PM',
-        'opening_hours_thursday': '6:00 AM - 8:00 PM',
-        'opening_hours_friday': '6:00 AM - 8:00 PM',
-        'opening_hours_saturday': '6:00 AM - 8:00 PM',
-        'opening_hours_sunday': '6:00 AM - 8:00 PM',
-    }
-    return Response(default_data, status=status.HTTP_200_OK)
+    return Response(DEFAULT_CONTACT_INFO, status=status.HTTP_200_OK)
 
 
 @extend_schema(
@@ -255,9 +297,49 @@ def contact_info_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(StoreCenter)
 def store_centers_view(request):
     """Get all active store centers."""
     queryset = StoreCenter.objects.filter(is_active=True).order_by('order')
     serializer = StoreCenterSerializer(queryset, many=True)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
+
+
+@extend_schema(
+    tags=['Content'],
+    summary='Get home page content bundle',
+    description=(
+        'Get every home page section in one response: sustainable gifting, text and video testimonials, '
+        'contact info, categories with subcategories and available products. Sections have the same shape '
+        'as their own endpoints.'
+    ),
+    responses={200: {'type': 'object'}},
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(*HOME_MODELS)
+def home_bundle_view(request):
+    """Get all home page sections."""
+    return Response(build_bundle(HOME_SECTIONS), status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Content'],
+    summary='Get About Us page content bundle',
+    description=(
+        'Get every About Us page section in one response: about us, our story, our commitment, photo '
+        'gallery, blogs, text and video testimonials. Sections have the same shape as their own endpoints; '
+        'blogs is the first page of the blog list with view=summary.'
+    ),
+    responses={200: {'type': 'object'}},
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
+@cached_view(*ABOUT_MODELS)
+def about_bundle_view(request):
+    """Get all About Us page sections."""
+    return Response(build_bundle(ABOUT_SECTIONS), status=status.HTTP_200_OK)
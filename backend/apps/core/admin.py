@@ -0,0 +1,54 @@
+"""
+Admin configuration for core app.
+"""
+from django.contrib import admin
+from django.utils import timezone
+from .models import IdempotencyKey, OutboxMessage
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    """Read-only admin for stored idempotency keys."""
+    list_display = ['key', 'user', 'status', 'response_code', 'created_at', 'expires_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['key', 'user__email']
+    readonly_fields = [
+        'id',
+        'user',
+        'key',
+        'request_hash',
+        'status',
+        'response_code',
+        'response_body',
+        'created_at',
+        'updated_at',
+        'expires_at',
+    ]
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Admin for transactional outbox messages."""
+    list_display = ['topic', 'status', 'attempts', 'available_at', 'created_at', 'processed_at']
+    list_filter = ['status', 'topic', 'created_at']
+    search_fields = ['topic', 'last_error']
+    readonly_fields = ['id', 'topic', 'payload', 'attempts', 'locked_until', 'last_error', 'created_at', 'processed_at']
+    
+    actions = ['retry_now']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def retry_now(self, request, queryset):
+        """Bulk action to make failed or pending messages deliverable immediately."""
+        updated = queryset.exclude(status=OutboxMessage.Status.DONE).update(
+            status=OutboxMessage.Status.PENDING,
+            available_at=timezone.now(),
+            locked_until=None,
+            attempts=0,
+        )
+        self.message_user(request, f'{updated} message(s) queued for retry.')
+    retry_now.short_description = 'Retry selected messages now'
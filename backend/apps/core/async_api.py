@@ -0,0 +1,65 @@
+"""
+Helpers for async read-only API views.
+
+DRF views are sync-only, so async views are plain Django views that return
+the same JSON as their DRF counterparts. Under an ASGI server (config/asgi.py)
+they run on the event loop: database queries are awaited with the async ORM
+and a request waiting on the database or a slow client costs a coroutine
+rather than a thread.
+
+    @async_read_view(CatalogRateThrottle)
+    @cached_view(StoreCenter)
+    async def store_centers_async_view(request):
+        centers = await alist(StoreCenter.objects.filter(is_active=True).order_by('order'))
+        return json_response(StoreCenterSerializer(centers, many=True).data)
+
+Serializers run on the event loop too, so every related object they read must
+be loaded beforehand (select_related / prefetch_related).
+"""
+import math
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """Render data as DRF's JSONRenderer does, so responses match the DRF views byte for byte."""
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+async def alist(queryset):
+    """Evaluate queryset (with its prefetches) without blocking the event loop."""
+    return [obj async for obj in queryset]
+
+
+def _throttle_wait(throttles, request):
+    """Run the throttles; returns the seconds to wait if one rejects the request, else None."""
+    for throttle in throttles:
+        if not throttle.allow_request(request, None):
+            return throttle.wait()
+    return None
+
+
+def async_read_view(*throttle_classes):
+    """Accept GET and HEAD requests, applying throttle_classes as @throttle_classes does."""
+    def decorator(view_func):
+        @require_safe
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if throttle_classes:
+                # Throttles read the user and the cache with sync calls
+                wait = await sync_to_async(_throttle_wait)([cls() for cls in throttle_classes], request)
+                if wait is not None:
+                    wait = math.ceil(wait)
+                    response = json_response(
+                        {'detail': f'Request was throttled. Expected available in {wait} seconds.'},
+                        status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    )
+                    response['Retry-After'] = str(wait)
+                    return response
+            return await view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,246 @@
+"""
+Versioned caching of read-only API responses.
+
+Every watched model has a version token in the cache that is replaced when one
+of its rows is saved or deleted. A cached response records the versions of the
+models it was built from, and is only served as fresh while they still match.
+Tokens are random rather than counters, so a version key evicted from the
+cache can never be recreated with a value that matches an older response.
+
+    watch_model(BlogPost)  # In models.py, so every process bumps versions
+
+    @extend_schema(...)
+    @api_view(['GET'])
+    @permission_classes([AllowAny])
+    @cached_view(BlogPost, timeout=600, stale_timeout=60)
+    def blogs_view(request):
+        ...
+
+Only one request per response rebuilds it at a time. Others wait for that
+rebuild, or with stale_timeout, are served the previous response meanwhile.
+
+Async views (see apps/core/async_api.py) can be decorated the same way;
+they return a rendered JSON response rather than a DRF Response.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+# How often a request waiting for another request's rebuild checks the cache (seconds)
+POLL_INTERVAL = 0.05
+
+
+def _version_key(name):
+    return f'version:{name}'
+
+
+def model_version_name(model):
+    return f'model:{model._meta.label_lower}'
+
+
+def get_versions(names):
+    """Get the current version tokens for names, creating any that are missing."""
+    keys = [_version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, timeout=None):
+                # Another process created it first
+                version = cache.get(key, version)
+            versions[key] = version
+    return tuple(versions[key] for key in keys)
+
+
+def bump_version(name):
+    """
+    Replace the version token for name once the current transaction commits.
+
+    Bumping before commit would let a concurrent request rebuild a response
+    from the old rows and store it under the new version.
+    """
+    transaction.on_commit(lambda: cache.set(_version_key(name), uuid.uuid4().hex, timeout=None))
+
+
+def bump_model_version(model):
+    """Invalidate cached responses built from model; for bulk update() calls, which send no signals."""
+    bump_version(model_version_name(model))
+
+
+def watch_model(model):
+    """Bump model's version whenever one of its rows (or many-to-many relations) changes."""
+    def receiver(sender, **kwargs):
+        bump_model_version(model)
+
+    uid = f'cache_version_{model._meta.label_lower}'
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}_save')
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}_delete')
+    for field in model._meta.local_many_to_many:
+        m2m_changed.connect(receiver, sender=field.remote_field.through, weak=False, dispatch_uid=f'{uid}_{field.name}')
+
+
+def _not_modified(request, etag):
+    return etag in request.headers.get('If-None-Match', '')
+
+
+def _cached_response(request, entry):
+    if _not_modified(request, entry['etag']):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(entry['body'], content_type='application/json')
+    response['ETag'] = entry['etag']
+    # Browsers may keep the response but must revalidate it on every use
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def _wait_for_rebuild(key, lock_key, versions):
+    """
+    Wait for the request holding lock_key to store a response for versions.
+
+    Returns:
+        tuple: (entry, locked); entry is None if this request must build the
+        response itself, and locked tells whether it now holds the lock
+    """
+    deadline = time.monotonic() + settings.VIEW_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry['versions'] == versions:
+            return entry, False
+        if cache.add(lock_key, 1, settings.VIEW_CACHE_LOCK_TIMEOUT):
+            # The other request failed or gave up
+            return None, True
+    logger.warning(f"Timed out waiting for cached response {key}; building it")
+    return None, False
+
+
+async def _await_rebuild(key, lock_key, versions):
+    """_wait_for_rebuild() for async views, sleeping without holding a thread."""
+    deadline = time.monotonic() + settings.VIEW_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        entry = await cache.aget(key)
+        if entry is not None and entry['versions'] == versions:
+            return entry, False
+        if await cache.aadd(lock_key, 1, settings.VIEW_CACHE_LOCK_TIMEOUT):
+            return None, True
+    logger.warning(f"Timed out waiting for cached response {key}; building it")
+    return None, False
+
+
+def _lookup(key, version_names):
+    """Get the current versions and the cached entry for key, in one call for async views."""
+    return get_versions(version_names), cache.get(key)
+
+
+def _new_entry(body, versions, fresh_for):
+    return {
+        'versions': versions,
+        'body': body,
+        'etag': f'"{hashlib.md5(body).hexdigest()}"',
+        'fresh_until': time.time() + fresh_for,
+    }
+
+
+def cached_view(*models, timeout=None, stale_timeout=None):
+    """
+    Cache a public GET view's JSON response until one of models changes.
+
+    Apply below @api_view (or below @async_read_view for async views). The
+    view must return a Response whose data is the same for every user (async
+    views: a rendered JSON response); only 200 responses are cached. Responses are cached
+    per path and query string, and carry an ETag that answers If-None-Match
+    with 304.
+
+    Args:
+        models: Models the response is built from; each must be registered with watch_model()
+        timeout: Seconds a response stays fresh (default: VIEW_CACHE_TIMEOUT). With the
+            per-process cache this bounds how long other processes serve a response after a change.
+        stale_timeout: Seconds an expired or outdated response may still be served while one
+            request rebuilds it (default: VIEW_CACHE_STALE_TIMEOUT; 0 makes other requests wait)
+    """
+    version_names = [model_version_name(model) for model in models]
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            fresh_for = settings.VIEW_CACHE_TIMEOUT if timeout is None else timeout
+            stale_for = settings.VIEW_CACHE_STALE_TIMEOUT if stale_timeout is None else stale_timeout
+            path_hash = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+            key = f'view:{view_func.__module__}.{view_func.__name__}:{path_hash}'
+            lock_key = f'{key}:lock'
+
+            versions = get_versions(version_names)
+            entry = cache.get(key)
+            if entry is not None and entry['versions'] == versions and time.time() < entry['fresh_until']:
+                return _cached_response(request, entry)
+
+            # Stampede protection: only the request holding the lock runs the view
+            locked = cache.add(lock_key, 1, settings.VIEW_CACHE_LOCK_TIMEOUT)
+            if not locked:
+                if entry is not None and stale_for:
+                    return _cached_response(request, entry)
+                entry, locked = _wait_for_rebuild(key, lock_key, versions)
+                if entry is not None:
+                    return _cached_response(request, entry)
+
+            try:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                entry = _new_entry(JSONRenderer().render(response.data), versions, fresh_for)
+                # Kept past expiry only to be served stale
+                cache.set(key, entry, fresh_for + stale_for)
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+            return _cached_response(request, entry)
+
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            fresh_for = settings.VIEW_CACHE_TIMEOUT if timeout is None else timeout
+            stale_for = settings.VIEW_CACHE_STALE_TIMEOUT if stale_timeout is None else stale_timeout
+            path_hash = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+            key = f'view:{view_func.__module__}.{view_func.__name__}:{path_hash}'
+            lock_key = f'{key}:lock'
+
+            versions, entry = await sync_to_async(_lookup)(key, version_names)
+            if entry is not None and entry['versions'] == versions and time.time() < entry['fresh_until']:
+                return _cached_response(request, entry)
+
+            locked = await cache.aadd(lock_key, 1, settings.VIEW_CACHE_LOCK_TIMEOUT)
+            if not locked:
+                if entry is not None and stale_for:
+                    return _cached_response(request, entry)
+                entry, locked = await _await_rebuild(key, lock_key, versions)
+                if entry is not None:
+                    return _cached_response(request, entry)
+
+            try:
+                response = await view_func(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                entry = _new_entry(response.content, versions, fresh_for)
+                await cache.aset(key, entry, fresh_for + stale_for)
+            finally:
+                if locked:
+                    await cache.adelete(lock_key)
+            return _cached_response(request, entry)
+
+        return async_wrapper if iscoroutinefunction(view_func) else wrapper
+    return decorator
@@ -0,0 +1,167 @@
+"""
+Circuit breaker for calls to external services.
+
+A breaker is shared by all threads of a process. It records the outcome of
+recent calls and opens when too many of them fail, so callers fail fast
+instead of tying up workers on a service that is down. After reset_timeout
+it lets a limited number of probe calls through (half-open); a successful
+probe closes it again, a failed one re-opens it.
+
+    breaker = CircuitBreaker('razorpay', failure_exceptions=(TimeoutError,))
+
+    with breaker.guard():
+        response = call_service()
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the service while the breaker is open."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker.
+
+    Args:
+        name: Name used in logs and metrics
+        failure_exceptions: Exceptions that count as the service failing; any
+            other exception propagates without affecting the breaker
+        failure_rate: Fraction of failed calls in the window that opens the breaker
+        minimum_calls: Calls needed in the window before the rate is evaluated
+        window_size: Maximum number of recent outcomes considered
+        window_seconds: Outcomes older than this are forgotten
+        reset_timeout: Seconds to stay open before probing
+        half_open_calls: Concurrent probe calls allowed while half-open
+    """
+
+    def __init__(self, name, failure_exceptions=(Exception,), failure_rate=0.5, minimum_calls=5,
+                 window_size=20, window_seconds=60, reset_timeout=30, half_open_calls=1):
+        self.name = name
+        self.failure_exceptions = tuple(failure_exceptions)
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = None
+        self._probes_in_flight = 0
+        self._counters = {'calls': 0, 'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def _prune(self, now):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _transition(self, state, now):
+        logger.warning(f"Circuit '{self.name}' {self._state} -> {state}")
+        self._state = state
+        if state == OPEN:
+            self._opened_at = now
+            self._counters['opened'] += 1
+        elif state == CLOSED:
+            self._opened_at = None
+            self._outcomes.clear()
+
+    def _before_call(self):
+        """Admit or reject a call. Returns True if the call is a half-open probe."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN:
+                remaining = self.reset_timeout - (now - self._opened_at)
+                if remaining > 0:
+                    self._counters['rejected'] += 1
+                    raise CircuitOpenError(self.name, remaining)
+                self._transition(HALF_OPEN, now)
+
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_calls:
+                    self._counters['rejected'] += 1
+                    raise CircuitOpenError(self.name, 1)
+                self._probes_in_flight += 1
+                self._counters['calls'] += 1
+                return True
+
+            self._counters['calls'] += 1
+            return False
+
+    def _record(self, succeeded, probe):
+        now = time.monotonic()
+        with self._lock:
+            self._counters['successes' if succeeded else 'failures'] += 1
+            if probe:
+                self._probes_in_flight -= 1
+                if self._state == HALF_OPEN:
+                    self._transition(CLOSED if succeeded else OPEN, now)
+                return
+
+            self._outcomes.append((now, succeeded))
+            self._prune(now)
+            if self._state != CLOSED or len(self._outcomes) < self.minimum_calls:
+                return
+            failures = sum(1 for _at, ok in self._outcomes if not ok)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._transition(OPEN, now)
+
+    @contextmanager
+    def guard(self):
+        """
+        Run the enclosed call through the breaker.
+
+        Raises:
+            CircuitOpenError: If the breaker is open (the call is not made)
+        """
+        probe = self._before_call()
+        try:
+            yield
+        except self.failure_exceptions:
+            self._record(False, probe)
+            raise
+        except BaseException:
+            # Not a sign of an unhealthy service (e.g. a 4xx for bad input)
+            self._record(True, probe)
+            raise
+        self._record(True, probe)
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def metrics(self):
+        """Current state and counters since process start."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            window_failures = sum(1 for _at, ok in self._outcomes if not ok)
+            state = self._state
+            if state == OPEN and now - self._opened_at >= self.reset_timeout:
+                state = HALF_OPEN  # The next call will probe
+            return {
+                'name': self.name,
+                'state': state,
+                'open_for_seconds': round(now - self._opened_at, 1) if self._opened_at is not None else None,
+                'window_calls': len(self._outcomes),
+                'window_failure_rate': round(window_failures / len(self._outcomes), 3) if self._outcomes else 0.0,
+                **self._counters,
+            }
@@ -0,0 +1,186 @@
+"""
+Idempotency-Key support for non-idempotent API endpoints.
+
+A client that sends an ``Idempotency-Key`` header with a POST gets exactly one
+execution of the view per (user, key). Retries of a completed request replay
+the stored response, concurrent duplicates wait for the in-flight request to
+finish, and reusing a key for a different request body is rejected.
+"""
+import functools
+import hashlib
+import json
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    type=str,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description='Unique key per logical request. Retries with the same key replay the original response.',
+)
+
+# How often a duplicate request re-checks an in-flight key while waiting
+POLL_INTERVAL = 0.1
+
+# Client errors that can succeed on retry (e.g. an item back in stock), so they are not stored
+RETRYABLE_STATUS_CODES = frozenset({
+    status.HTTP_408_REQUEST_TIMEOUT,
+    status.HTTP_409_CONFLICT,
+    status.HTTP_423_LOCKED,
+    status.HTTP_425_TOO_EARLY,
+    status.HTTP_429_TOO_MANY_REQUESTS,
+})
+
+
+def _hash_request(request):
+    """Fingerprint method, path and body so a key cannot be reused for another request."""
+    body = json.dumps(request.data, sort_keys=True, separators=(',', ':'), default=str)
+    fingerprint = f'{request.method}:{request.path}:{body}'
+    return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+
+def _claim(user, key, request_hash):
+    """
+    Claim the key for this request.
+    
+    Returns:
+        tuple: (IdempotencyKey, created) where created is True if the caller owns the key
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user=user,
+                key=key,
+                request_hash=request_hash,
+                status=IdempotencyKey.Status.IN_PROGRESS,
+                expires_at=expires_at,
+            )
+        return record, True
+    except IntegrityError:
+        pass
+    
+    try:
+        record = IdempotencyKey.objects.get(user=user, key=key)
+    except IdempotencyKey.DoesNotExist:
+        # The owner failed and released the key between our insert and read
+        return None, False
+    
+    # Expired keys and keys abandoned by a crashed worker can be taken over.
+    # The conditional update makes sure only one request wins the takeover.
+    lock_cutoff = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+    is_stale = record.status == IdempotencyKey.Status.IN_PROGRESS and record.updated_at <= lock_cutoff
+    if record.expires_at <= now or is_stale:
+        claimed = IdempotencyKey.objects.filter(pk=record.pk, updated_at=record.updated_at).update(
+            request_hash=request_hash,
+            status=IdempotencyKey.Status.IN_PROGRESS,
+            response_code=None,
+            response_body=None,
+            updated_at=now,
+            expires_at=expires_at,
+        )
+        record.refresh_from_db()
+        return record, bool(claimed)
+    
+    return record, False
+
+
+def _wait_for_completion(record):
+    """Poll an in-flight key until it completes, is released, or the wait times out."""
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+    while record.status == IdempotencyKey.Status.IN_PROGRESS and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        try:
+            record.refresh_from_db()
+        except IdempotencyKey.DoesNotExist:
+            return None
+    return record
+
+
+def _conflict_response():
+    return Response(
+        {'error': 'A request with this Idempotency-Key is still being processed. Please retry.'},
+        status=status.HTTP_409_CONFLICT,
+        headers={'Retry-After': '1'},
+    )
+
+
+def _replay(record, request_hash):
+    """Build the response for a request whose key is already owned by another request."""
+    if record is None:
+        return _conflict_response()
+    
+    if record.request_hash != request_hash:
+        return Response(
+            {'error': 'Idempotency-Key has already been used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    
+    record = _wait_for_completion(record)
+    if record is None or record.status != IdempotencyKey.Status.COMPLETED:
+        return _conflict_response()
+    
+    return Response(
+        record.response_body,
+        status=record.response_code,
+        headers={'Idempotent-Replayed': 'true'},
+    )
+
+
+def idempotent(view_func):
+    """
+    Make a view idempotent for requests that carry an Idempotency-Key header.
+    
+    Requests without the header, or from anonymous users, run unchanged.
+    Successful responses and the view's own validation errors are stored and
+    replayed. Server errors, exceptions and retryable client errors
+    (RETRYABLE_STATUS_CODES) release the key so the client can retry.
+    """
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER, '').strip()
+        if not key or not request.user.is_authenticated:
+            return view_func(request, *args, **kwargs)
+        
+        if len(key) > 255:
+            return Response(
+                {'error': 'Idempotency-Key must be at most 255 characters'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        
+        request_hash = _hash_request(request)
+        record, created = _claim(request.user, key, request_hash)
+        if not created:
+            return _replay(record, request_hash)
+        
+        try:
+            response = view_func(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        
+        is_final = response.status_code < 500 and response.status_code not in RETRYABLE_STATUS_CODES
+        if not is_final or not hasattr(response, 'data'):
+            record.delete()
+            return response
+        
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            status=IdempotencyKey.Status.COMPLETED,
+            response_code=response.status_code,
+            response_body=response.data,
+            updated_at=timezone.now(),
+        )
+        return response
+    
+    return wrapper
@@ -0,0 +1,232 @@
+"""
+Streaming reading and writing of large JSON documents.
+
+Exports are one JSON object whose members are (mostly) long arrays of
+records. iter_json_sections() reads such a document a chunk at a time and
+yields its members in file order, decoding array members one element at a
+time, so memory use depends on the largest record rather than the file size.
+JSONObjectWriter writes one the same way, element by element.
+
+    with open(path, encoding='utf-8') as f:
+        for key, value in iter_json_sections(f):
+            if isinstance(value, JSONArray):
+                for record in value:
+                    ...
+
+open_output() and open_input() open files in binary mode, gzip-compressing
+paths ending in .gz and decompressing gzip files, so either kind can be
+streamed.
+"""
+import gzip
+import json
+import re
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Characters read from the file at a time
+CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class InvalidJSON(ValueError):
+    """The streamed document is not valid JSON or not a JSON object."""
+
+
+class JSONArray:
+    """
+    Lazily decoded array member of a streamed document.
+
+    Can be iterated once, before the next member is read; elements that were
+    not iterated are skipped.
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+        self._done = False
+
+    def __iter__(self):
+        reader = self._reader
+        if self._done:
+            return
+        if reader.peek() == ']':
+            reader.advance()
+            self._done = True
+            return
+        while True:
+            yield reader.decode_value()
+            separator = reader.peek()
+            if separator not in (',', ']'):
+                raise reader.error("Expected ',' or ']'")
+            reader.advance()
+            if separator == ']':
+                break
+        self._done = True
+
+    def skip(self):
+        for _ in self:
+            pass
+
+
+class _Reader:
+    """Buffered text reader that decodes JSON values from the current position."""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0  # Characters dropped from the start of buffer, for error messages
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """Read another chunk; returns False at the end of the file."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > self.chunk_size:
+            # Drop consumed text so the buffer does not grow with the file
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def error(self, message):
+        return InvalidJSON(f'{message} at character {self.offset + self.pos}')
+
+    def peek(self):
+        """Next non-whitespace character, or '' at the end of the file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def advance(self):
+        self.pos += 1
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expected '{char}'")
+        self.advance()
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise InvalidJSON(f'{e.msg} at character {self.offset + e.pos}') from None
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_sections(fp, chunk_size=CHUNK_SIZE):
+    """
+    Yield (key, value) for each member of the JSON object in text file fp.
+
+    Array values are yielded as a JSONArray to iterate; other values are
+    decoded in full.
+
+    Raises:
+        InvalidJSON: If the file is not a JSON object, when the invalid part is reached
+    """
+    reader = _Reader(fp, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.decode_value()
+        if not isinstance(key, str):
+            raise reader.error('Expected a member name')
+        reader.expect(':')
+        if reader.peek() == '[':
+            reader.advance()
+            value = JSONArray(reader)
+            yield key, value
+            value.skip()
+        else:
+            yield key, reader.decode_value()
+
+        separator = reader.peek()
+        if separator not in (',', '}'):
+            raise reader.error("Expected ',' or '}'")
+        reader.advance()
+        if separator == '}':
+            return
+
+
+class JSONObjectWriter:
+    """
+    Write a JSON object to text file fp one member at a time.
+
+    Output is formatted as json.dump(..., indent=2) would format the whole
+    object. Values are encoded with DjangoJSONEncoder.
+
+        writer = JSONObjectWriter(f)
+        writer.write_array('products', records)
+        writer.write_member('_metadata', {...})
+        writer.close()
+    """
+
+    def __init__(self, fp, indent=2):
+        self.fp = fp
+        self.indent = ' ' * indent
+        self._members = 0
+        fp.write('{')
+
+    def _encode(self, value, depth):
+        text = json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False, indent=len(self.indent))
+        # Strings are escaped, so every newline belongs to the formatting
+        return text.replace('\n', '\n' + self.indent * depth)
+
+    def _start_member(self, key):
+        self.fp.write(f"{',' if self._members else ''}\n{self.indent}{json.dumps(key, ensure_ascii=False)}: ")
+        self._members += 1
+
+    def write_member(self, key, value):
+        self._start_member(key)
+        self.fp.write(self._encode(value, 1))
+
+    def write_array(self, key, items):
+        """Write an array member from an iterable, one element at a time; returns the element count."""
+        self._start_member(key)
+        self.fp.write('[')
+        count = 0
+        for item in items:
+            self.fp.write(f"{',' if count else ''}\n{self.indent * 2}{self._encode(item, 2)}")
+            count += 1
+        self.fp.write(f'\n{self.indent}]' if count else ']')
+        return count
+
+    def close(self):
+        self.fp.write('\n}' if self._members else '}')
+
+
+def open_output(path):
+    """Open path for writing in binary mode, gzip-compressed if it ends in .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wb')
+    return open(path, 'wb')
+
+
+def open_input(path):
+    """Open path for reading in binary mode, decompressing it if it is gzip-compressed."""
+    f = open(path, 'rb')
+    if f.read(len(GZIP_MAGIC)) == GZIP_MAGIC:
+        f.close()
+        return gzip.open(path, 'rb')
+    f.seek(0)
+    return f
@@ -0,0 +1,66 @@
+"""
+Per-process LRU cache with expiry.
+
+For values read on nearly every request that are too hot to fetch from the
+shared cache each time. Entries are dropped after timeout seconds, which caps
+how long a process can serve a value that was changed or invalidated by
+another process; a process's own invalidations take effect immediately.
+
+    tokens = LRUCache(maxsize=1024, timeout=5)
+    tokens.set(key, value)
+    tokens.get(key)  # None once expired or evicted
+
+Thread-safe; each process (worker) has its own entries.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry when full.
+
+    Args:
+        maxsize: Maximum number of entries
+        timeout: Seconds an entry stays valid after it is set
+    """
+
+    def __init__(self, maxsize=1024, timeout=5):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,90 @@
+"""
+Management command to take old monthly partitions of orders, order_items and
+payments out of the live tables (PostgreSQL only).
+
+Partitions whose rows all predate the cutoff are detached, then moved to a
+separate schema (default: archive) where they stay queryable, or dropped.
+The same cutoff is applied to all three tables so orders are archived
+together with their items and payments.
+
+Usage:
+    python manage.py archive_partitions --keep-months 24 --dry-run
+    python manage.py archive_partitions --before 2024-01
+    python manage.py archive_partitions --before 2024-01 --drop
+"""
+import argparse
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.core import partitioning
+
+
+def _parse_month(value):
+    try:
+        year, month = value.split('-')
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid month "{value}", expected YYYY-MM')
+
+
+class Command(BaseCommand):
+    help = 'Detach partitions older than a cutoff and archive or drop them'
+
+    def add_arguments(self, parser):
+        cutoff = parser.add_mutually_exclusive_group(required=True)
+        cutoff.add_argument(
+            '--before',
+            type=_parse_month,
+            help='Archive partitions that end on or before the start of this month (YYYY-MM)'
+        )
+        cutoff.add_argument(
+            '--keep-months',
+            type=int,
+            help='Keep this many months (including the current one) in the live tables'
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Drop detached partitions instead of moving them to the archive schema'
+        )
+        parser.add_argument(
+            '--schema',
+            default='archive',
+            help='Schema detached partitions are moved to (default: archive)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Print the SQL without running it'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Table partitioning requires PostgreSQL')
+
+        before = options['before']
+        if before is None:
+            before = partitioning.add_months(partitioning.utc_today(), 1 - options['keep_months'])
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            statements = []
+            for table in partitioning.PARTITIONED_TABLES:
+                if not partitioning.is_partitioned(cursor, table):
+                    raise CommandError(f'{table} is not partitioned; run partition_tables --convert first')
+                statements += partitioning.archive_sql(
+                    cursor, table, before, drop=options['drop'], schema=options['schema'],
+                )
+
+            if options['dry_run']:
+                for statement in statements:
+                    self.stdout.write(f'{statement};')
+                return
+
+            for statement in statements:
+                cursor.execute(statement)
+
+        detached = sum(1 for statement in statements if ' DETACH PARTITION ' in statement)
+        action = 'Dropped' if options['drop'] else f'Moved to schema "{options["schema"]}"'
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {action}: {detached} partitions older than {before:%Y-%m}')
+        )
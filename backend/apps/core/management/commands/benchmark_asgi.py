@@ -0,0 +1,191 @@
+"""
+Management command to compare WSGI and ASGI serving under slow clients.
+
+Starts the app on local ports three ways and measures the same read-only
+endpoint while slow clients (which send each request over --slow-seconds, as
+clients on poor mobile connections do) are connected:
+
+- wsgi:       gunicorn with sync workers, the DRF view (the current deployment)
+- asgi-sync:  uvicorn workers, the DRF view (run in Django's thread pool)
+- asgi-async: uvicorn workers, the async view (apps/*/async_views.py)
+
+Fast clients request the endpoint back to back for --duration seconds;
+their throughput and latency percentiles are reported per variant. Uses the
+configured database, and lifts the catalog rate limit for the servers it
+starts. For numbers that match production, run it with DEBUG=False settings.
+
+Usage:
+    python manage.py benchmark_asgi
+    python manage.py benchmark_asgi --workers 3 --slow-clients 100 --fast-clients 20 --duration 20
+    python manage.py benchmark_asgi --path products/tags/
+"""
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.payments.management.commands.loadtest_checkout import percentile
+
+HOST = '127.0.0.1'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def _request(path, port):
+    return f'GET {path} HTTP/1.1\r\nHost: {HOST}:{port}\r\nConnection: close\r\n\r\n'.encode()
+
+
+async def _fetch(port, request, send_seconds=0.0, pieces=1):
+    """Send request (spread over send_seconds) and read the whole response; returns the status code."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        size = -(-len(request) // pieces)
+        for start in range(0, len(request), size):
+            writer.write(request[start:start + size])
+            await writer.drain()
+            if send_seconds and start + size < len(request):
+                await asyncio.sleep(send_seconds / pieces)
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b' ', 2)[1]) if response.startswith(b'HTTP/') else 0
+
+
+class Command(BaseCommand):
+    help = 'Compare gunicorn sync workers with uvicorn (sync and async views) under slow clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='products/',
+            help='Endpoint under /api/, with an async variant under /api/async/ (default: products/)'
+        )
+        parser.add_argument('--workers', type=int, default=3, help='Server processes per variant (default: 3)')
+        parser.add_argument('--slow-clients', type=int, default=50, help='Slow clients connected (default: 50)')
+        parser.add_argument(
+            '--slow-seconds',
+            type=float,
+            default=2.0,
+            help='Seconds a slow client takes to send each request (default: 2)'
+        )
+        parser.add_argument('--fast-clients', type=int, default=10, help='Clients measured (default: 10)')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per variant (default: 10)')
+
+    def handle(self, *args, **options):
+        path = options['path'].strip('/') + '/'
+        if options['workers'] < 1 or options['fast_clients'] < 1:
+            raise CommandError('--workers and --fast-clients must be at least 1')
+
+        sync_path, async_path = f'/api/{path}', f'/api/async/{path}'
+        variants = [
+            ('wsgi', ['gunicorn', 'config.wsgi:application', '--workers', '{workers}', '--bind', '{bind}'], sync_path),
+            ('asgi-sync', ['uvicorn', 'config.asgi:application', '--workers', '{workers}', '--host', HOST,
+                           '--port', '{port}', '--no-access-log'], sync_path),
+            ('asgi-async', ['uvicorn', 'config.asgi:application', '--workers', '{workers}', '--host', HOST,
+                            '--port', '{port}', '--no-access-log'], async_path),
+        ]
+
+        self.stdout.write(
+            f"⏱️  GET {sync_path} for {options['duration']:.0f}s per variant: {options['fast_clients']} fast clients, "
+            f"{options['slow_clients']} clients sending each request over {options['slow_seconds']:.1f}s, "
+            f"{options['workers']} worker processes"
+        )
+        results = {}
+        for name, command, request_path in variants:
+            results[name] = self._run_variant(name, command, request_path, options)
+
+        baseline = results['wsgi']
+        best = results['asgi-async']
+        if baseline and best:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ asgi-async: {best / baseline:.1f}x the wsgi throughput under slow clients"
+            ))
+
+    def _run_variant(self, name, command, request_path, options):
+        port = _free_port()
+        command = [
+            part.format(workers=options['workers'], bind=f'{HOST}:{port}', port=port) for part in command
+        ]
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'),
+            # Every client comes from one address
+            'THROTTLE_RATE_CATALOG': '1000000/min',
+        }
+        server = subprocess.Popen(
+            [sys.executable, '-m', *command],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        try:
+            if not self._wait_ready(port, request_path, server):
+                self.stdout.write(self.style.ERROR(f'  {name:<11} server did not start'))
+                return None
+            requests_per_second, latencies, errors = asyncio.run(self._load(port, request_path, options))
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait(timeout=30)
+
+        ms = sorted(value * 1000 for value in latencies)
+        self.stdout.write(
+            f'  {name:<11} {requests_per_second:8.1f} req/s   p50 {percentile(ms, 0.5):7.1f} ms   '
+            f'p99 {percentile(ms, 0.99):7.1f} ms   max {ms[-1] if ms else 0:7.1f} ms   errors {errors}'
+        )
+        return requests_per_second
+
+    def _wait_ready(self, port, request_path, server, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and server.poll() is None:
+            try:
+                if asyncio.run(_fetch(port, _request(request_path, port))) == 200:
+                    return True
+            except OSError:
+                pass
+            time.sleep(0.2)
+        return False
+
+    async def _load(self, port, request_path, options):
+        request = _request(request_path, port)
+        deadline = time.monotonic() + options['duration']
+        latencies, errors = [], 0
+
+        async def slow_client():
+            while time.monotonic() < deadline:
+                try:
+                    await _fetch(port, request, send_seconds=options['slow_seconds'], pieces=10)
+                except OSError:
+                    await asyncio.sleep(0.1)
+
+        async def fast_client():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    ok = await _fetch(port, request) == 200
+                except OSError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        slow = [asyncio.create_task(slow_client()) for _ in range(options['slow_clients'])]
+        await asyncio.sleep(min(options['slow_seconds'], options['duration']) / 2)  # Let slow clients connect
+        started = time.monotonic()
+        await asyncio.gather(*(fast_client() for _ in range(options['fast_clients'])))
+        elapsed = time.monotonic() - started
+        for task in slow:
+            task.cancel()
+        await asyncio.gather(*slow, return_exceptions=True)
+        return len(latencies) / elapsed, latencies, errors
@@ -0,0 +1,123 @@
+"""
+Management command to manage monthly partitions of orders, order_items and
+payments (PostgreSQL only).
+
+Partitioning is opt-in. --convert turns the tables into partitioned tables
+once, during a maintenance window (it takes an exclusive lock on each table).
+After that, run the command regularly (e.g. monthly from cron) to create
+partitions ahead of time. Rows for a month without a partition go to the
+default partition; the command warns about them, and --move-default moves
+them into monthly partitions.
+
+Conversion keeps each table's primary key and unique columns in an
+unpartitioned <table>_keys table, which enforces them globally. Foreign keys
+to orders, order_items and payments (from order_items, payments,
+stock_reservations and sales_rollup_orders) are dropped and recreated against
+the key tables. See apps/core/partitioning.py.
+
+Usage:
+    python manage.py partition_tables --convert --dry-run
+    python manage.py partition_tables --convert
+    python manage.py partition_tables --months-ahead 3
+    python manage.py partition_tables --move-default
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.core import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        'Convert orders/order_items/payments to monthly partitions and create future partitions. '
+        'Conversion moves foreign keys to these tables onto unpartitioned <table>_keys tables, '
+        'which also enforce their primary keys and unique columns; later migrations cannot add '
+        'foreign keys to them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert the tables to partitioned tables (one-off, locks the tables)'
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Create partitions up to this many months after the current one (default: 3)'
+        )
+        parser.add_argument(
+            '--move-default',
+            action='store_true',
+            help='Move rows from the default partitions into monthly partitions (locks the tables briefly)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Print the SQL without running it'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Table partitioning requires PostgreSQL')
+
+        tables = partitioning.PARTITIONED_TABLES
+        with transaction.atomic(), connection.cursor() as cursor:
+            partitioned = [table for table in tables if partitioning.is_partitioned(cursor, table)]
+            statements = []
+
+            if options['convert']:
+                if partitioned:
+                    raise CommandError(f'Already partitioned: {", ".join(partitioned)}')
+                try:
+                    statements += partitioning.conversion_sql(cursor, tables)
+                except ValueError as e:
+                    raise CommandError(str(e))
+            elif len(partitioned) != len(tables):
+                self.stdout.write(self.style.WARNING(
+                    '⚠️  Tables are not partitioned; run with --convert to opt in'
+                ))
+                return
+            elif options['move_default']:
+                for table in tables:
+                    statements += partitioning.move_default_sql(cursor, table)
+
+            if options['dry_run'] and options['convert']:
+                # Partitions of the converted tables cannot be introspected before conversion
+                self._print(statements)
+                self.stdout.write('-- plus default and monthly partitions for the months ahead')
+                return
+
+            for statement in statements:
+                cursor.execute(statement)
+
+            created = []
+            for table in tables:
+                created += partitioning.create_partitions_sql(cursor, table, options['months_ahead'])
+
+            if options['dry_run']:
+                self._print(statements + created)
+                transaction.set_rollback(True)
+                return
+
+            for statement in created:
+                cursor.execute(statement)
+
+            for table in tables:
+                months = partitioning.default_rows(cursor, table)
+                if months:
+                    self.stdout.write(self.style.WARNING(
+                        f'⚠️  {sum(months.values())} {table} rows are in {partitioning.default_partition(table)} '
+                        f'({", ".join(f"{month:%Y-%m}" for month in months)}); partitions were missing when they '
+                        f'were inserted. Run with --move-default to move them into monthly partitions'
+                    ))
+
+        if options['convert']:
+            self.stdout.write(self.style.SUCCESS(f'✅ Converted {", ".join(tables)} to monthly partitions'))
+        elif options['move_default'] and statements:
+            self.stdout.write(self.style.SUCCESS('✅ Moved rows from the default partitions'))
+        self.stdout.write(self.style.SUCCESS(f'✅ Created {len(created)} partitions'))
+
+    def _print(self, statements):
+        for statement in statements:
+            self.stdout.write(f'{statement};')
@@ -0,0 +1,55 @@
+"""
+Management command to delete expired idempotency keys in batches.
+
+Usage:
+    python manage.py purge_idempotency_keys
+    python manage.py purge_idempotency_keys --batch-size 5000
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete expired idempotency keys in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of keys deleted per batch (default: 1000)'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to pause between batches to limit database load (default: 0)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pause = options['sleep']
+        cutoff = timezone.now()
+        total_deleted = 0
+
+        while True:
+            # Delete by primary key so each batch is a short, index-only transaction
+            batch = list(
+                IdempotencyKey.objects.filter(expires_at__lte=cutoff)
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+
+            deleted, _ = IdempotencyKey.objects.filter(pk__in=batch).delete()
+            total_deleted += deleted
+            self.stdout.write(f'  Deleted {deleted} keys ({total_deleted} total)')
+
+            if pause:
+                time.sleep(pause)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Purged {total_deleted} expired idempotency keys')
+        )
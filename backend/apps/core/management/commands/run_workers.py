@@ -0,0 +1,156 @@
+"""
+Management command to deliver transactional outbox messages.
+
+Polls the outbox with SELECT ... FOR UPDATE SKIP LOCKED, so several worker
+processes can run side by side, and runs handlers in a thread pool.
+
+Usage:
+    python manage.py run_workers
+    python manage.py run_workers --threads 8 --batch-size 50
+    python manage.py run_workers --once
+    python manage.py run_workers --stats
+"""
+import logging
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+from apps.core import outbox
+from apps.core.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _deliver(message):
+    """Thread pool entry point: deliver one message on this thread's connection."""
+    close_old_connections()
+    try:
+        return outbox.deliver(message)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Deliver transactional outbox messages to their handlers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Number of handler threads (default: 4)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Messages claimed per poll (default: 20)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when the queue is empty (default: 1.0)'
+        )
+        parser.add_argument(
+            '--lease',
+            type=int,
+            default=300,
+            help='Seconds a claimed message stays locked before another worker may retry it (default: 300)'
+        )
+        parser.add_argument(
+            '--stats-interval',
+            type=int,
+            default=60,
+            help='Seconds between queue depth/lag log lines (default: 60)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the currently deliverable messages and exit'
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print queue depth and lag and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self._print_stats()
+            return
+
+        outbox.autodiscover()
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        threads = options['threads']
+        batch_size = options['batch_size']
+        poll_interval = options['poll_interval']
+        lease = options['lease']
+        stats_interval = options['stats_interval']
+        next_stats_at = 0
+        delivered = failed = 0
+
+        self.stdout.write(
+            f'🚀 Outbox worker started ({threads} threads, batch size {batch_size})'
+        )
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='outbox') as executor:
+            while not self._stopping:
+                if time.monotonic() >= next_stats_at:
+                    self._log_stats(delivered, failed)
+                    self._purge_delivered()
+                    next_stats_at = time.monotonic() + stats_interval
+
+                close_old_connections()
+                messages = outbox.claim_batch(batch_size, lease)
+                if not messages:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                for succeeded in executor.map(_deliver, messages):
+                    if succeeded:
+                        delivered += 1
+                    else:
+                        failed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Outbox worker stopped ({delivered} delivered, {failed} failed attempts)')
+        )
+
+    def _request_stop(self, signum, frame):
+        """Finish the current batch, then exit."""
+        self._stopping = True
+
+    def _log_stats(self, delivered, failed):
+        stats = outbox.queue_stats()
+        logger.info(
+            f"Outbox queue: {stats['pending']} pending, {stats['processing']} processing, "
+            f"{stats['failed']} failed, lag {stats['lag_seconds']:.1f}s "
+            f"(this worker: {delivered} delivered, {failed} failed attempts)"
+        )
+
+    def _purge_delivered(self, batch_size=1000):
+        """Delete one batch of delivered messages older than OUTBOX_RETENTION_DAYS."""
+        cutoff = timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+        batch = list(
+            OutboxMessage.objects.filter(status=OutboxMessage.Status.DONE, processed_at__lt=cutoff)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if batch:
+            OutboxMessage.objects.filter(pk__in=batch).delete()
+
+    def _print_stats(self):
+        stats = outbox.queue_stats()
+        self.stdout.write(f"Pending:    {stats['pending']}")
+        self.stdout.write(f"Processing: {stats['processing']}")
+        self.stdout.write(f"Failed:     {stats['failed']}")
+        self.stdout.write(f"Lag:        {stats['lag_seconds']:.1f}s")
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:48
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model', models.CharField(help_text='Model label, e.g. products.product', max_length=100)),
+                ('object_id', models.CharField(max_length=64)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'deleted_records',
+                'ordering': ['deleted_at'],
+                'indexes': [models.Index(fields=['model', 'deleted_at'], name='deleted_rec_model_d0dcdd_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model', 'object_id'), name='unique_deleted_record')],
+            },
+        ),
+    ]
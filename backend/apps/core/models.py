@@ -0,0 +1,102 @@
+"""
+Shared infrastructure models for Dolce Fiore.
+"""
+import uuid
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from apps.users.models import User
+
+
+class IdempotencyKey(models.Model):
+    """Stored outcome of a request made with an Idempotency-Key header."""
+    
+    class Status(models.TextChoices):
+        IN_PROGRESS = 'IN_PROGRESS', 'In progress'
+        COMPLETED = 'COMPLETED', 'Completed'
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.IN_PROGRESS)
+    response_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'idempotency_keys'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.key} - {self.status}"
+
+
+class OutboxMessage(models.Model):
+    """
+    Side effect recorded in the same transaction as the state change that caused it.
+    
+    Messages are delivered by the run_workers management command.
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        PROCESSING = 'PROCESSING', 'Processing'
+        DONE = 'DONE', 'Done'
+        FAILED = 'FAILED', 'Failed'
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text='Earliest time the message may be delivered')
+    locked_until = models.DateTimeField(null=True, blank=True, help_text='Lease held by the worker processing the message')
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'outbox_messages'
+        ordering = ['available_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['topic']),
+        ]
+    
+    def __str__(self):
+        return f"{self.topic} - {self.status}"
+
+
+class DeletedRecord(models.Model):
+    """
+    Tombstone for a deleted row of a model registered with track_deletions().
+    
+    Delta exports (export_content_data --delta) read these to delete the
+    same rows in the target environment.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.CharField(max_length=100, help_text='Model label, e.g. products.product')
+    object_id = models.CharField(max_length=64)
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'deleted_records'
+        ordering = ['deleted_at']
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'object_id'], name='unique_deleted_record'),
+        ]
+        indexes = [
+            models.Index(fields=['model', 'deleted_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
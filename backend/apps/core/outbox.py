@@ -0,0 +1,183 @@
+"""
+Transactional outbox.
+
+State changes record their side effects (emails, notifications, ...) with
+enqueue() inside the same transaction.atomic() block, so a message exists if
+and only if the change was committed. The run_workers management command
+delivers messages to the handler registered for their topic, retrying with
+exponential backoff.
+
+Handlers live in a ``tasks.py`` module of an installed app:
+
+    from apps.core.outbox import handler
+
+    @handler('orders.send_order_confirmation')
+    def send_order_confirmation(payload):
+        ...
+"""
+import logging
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Min, Q, Count
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def handler(topic):
+    """Register the decorated function as the handler for a topic."""
+    def decorator(func):
+        if topic in _handlers and _handlers[topic] is not func:
+            raise ValueError(f"Outbox handler already registered for topic '{topic}'")
+        _handlers[topic] = func
+        return func
+    return decorator
+
+
+def get_handler(topic):
+    """Return the handler registered for a topic, or None."""
+    return _handlers.get(topic)
+
+
+def autodiscover():
+    """Import the tasks module of every installed app so handlers get registered."""
+    autodiscover_modules('tasks')
+
+
+def enqueue(topic, payload=None, delay=0):
+    """
+    Record a side effect for asynchronous delivery.
+    
+    Call this inside the transaction.atomic() block that performs the state
+    change, so the message is committed or rolled back together with it.
+    
+    Args:
+        topic (str): Handler topic, e.g. 'orders.send_order_confirmation'
+        payload (dict): JSON-serializable handler arguments
+        delay (int): Seconds to wait before the message becomes deliverable
+    
+    Returns:
+        OutboxMessage: The stored message
+    """
+    return OutboxMessage.objects.create(
+        topic=topic,
+        payload=payload or {},
+        available_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim_batch(batch_size, lease_seconds):
+    """
+    Lock and lease up to batch_size deliverable messages.
+    
+    Rows are selected with FOR UPDATE SKIP LOCKED, so several workers can poll
+    the table concurrently without blocking on or double-claiming a message.
+    Messages whose lease expired (worker crashed mid-delivery) are reclaimed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=OutboxMessage.Status.PENDING, available_at__lte=now) |
+                Q(status=OutboxMessage.Status.PROCESSING, locked_until__lte=now)
+            )
+            .order_by('available_at')[:batch_size]
+        )
+        if not messages:
+            return []
+        
+        locked_until = now + timedelta(seconds=lease_seconds)
+        OutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(
+            status=OutboxMessage.Status.PROCESSING,
+            locked_until=locked_until,
+            attempts=F('attempts') + 1,
+        )
+    
+    for message in messages:
+        message.status = OutboxMessage.Status.PROCESSING
+        message.locked_until = locked_until
+        message.attempts += 1
+    return messages
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter, capped at OUTBOX_RETRY_MAX_DELAY seconds."""
+    delay = min(settings.OUTBOX_RETRY_BASE_DELAY * (2 ** (attempts - 1)), settings.OUTBOX_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def deliver(message):
+    """
+    Run the handler for a claimed message and record the outcome.
+    
+    Returns:
+        bool: True if the handler succeeded
+    """
+    func = get_handler(message.topic)
+    try:
+        if func is None:
+            raise LookupError(f"No outbox handler registered for topic '{message.topic}'")
+        func(message.payload)
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            logger.error(f"Outbox message {message.pk} ({message.topic}) failed permanently: {error}")
+            fields = {'status': OutboxMessage.Status.FAILED}
+        else:
+            delay = retry_delay(message.attempts)
+            logger.warning(
+                f"Outbox message {message.pk} ({message.topic}) failed on attempt {message.attempts}, "
+                f"retrying in {delay:.0f}s: {error}"
+            )
+            fields = {
+                'status': OutboxMessage.Status.PENDING,
+                'available_at': timezone.now() + timedelta(seconds=delay),
+            }
+        OutboxMessage.objects.filter(pk=message.pk, status=OutboxMessage.Status.PROCESSING).update(
+            locked_until=None,
+            last_error=error[:2000],
+            **fields,
+        )
+        return False
+    
+    OutboxMessage.objects.filter(pk=message.pk, status=OutboxMessage.Status.PROCESSING).update(
+        status=OutboxMessage.Status.DONE,
+        locked_until=None,
+        processed_at=timezone.now(),
+    )
+    return True
+
+
+def queue_stats():
+    """
+    Return queue depth and lag.
+    
+    Returns:
+        dict: pending/processing/failed counts and lag_seconds, the age of the
+        oldest deliverable message (0 when the queue is drained)
+    """
+    now = timezone.now()
+    counts = dict(
+        OutboxMessage.objects.exclude(status=OutboxMessage.Status.DONE)
+        .values_list('status')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+    oldest = OutboxMessage.objects.filter(
+        status=OutboxMessage.Status.PENDING,
+        available_at__lte=now,
+    ).aggregate(oldest=Min('available_at'))['oldest']
+    
+    return {
+        'pending': counts.get(OutboxMessage.Status.PENDING, 0),
+        'processing': counts.get(OutboxMessage.Status.PROCESSING, 0),
+        'failed': counts.get(OutboxMessage.Status.FAILED, 0),
+        'lag_seconds': (now - oldest).total_seconds() if oldest else 0.0,
+    }
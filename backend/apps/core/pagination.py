@@ -0,0 +1,142 @@
+"""
+Keyset (cursor) pagination for API list views.
+
+Pages are fetched with "WHERE (ordering columns) come after the last row of
+the previous page", so every page costs the same index range scan however
+deep it is, and rows inserted meanwhile never shift later pages. The
+ordering must be unique (end with the primary key) and its fields non-null.
+"""
+import base64
+import binascii
+import json
+import operator
+from functools import reduce
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only cursor pagination over a unique, multi-column ordering.
+
+    Responses look like {"next": <link or null>, "results": [...]}. Links are
+    relative (path and query), so they are the same for every host and can be
+    cached.
+
+        paginator = BlogPagination()
+        page = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(BlogPostSerializer(page, many=True).data)
+    """
+    ordering = ('-id',)
+    page_size = 10
+    max_page_size = 50
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Get the page requested by the cursor and page_size query parameters as a list."""
+        self.page_size = self.get_page_size(request)
+        return self.get_page(queryset, self.decode_cursor(request), request.get_full_path())
+
+    def get_page(self, queryset, position, path):
+        """
+        Get the page of queryset after position as a list.
+
+        Args:
+            position: Cursor position from decode_cursor(), or None for the first page
+            path: Path and query string the next link is built from
+        """
+        self.base_url = path
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(position))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        rows = list(queryset[:self.page_size + 1])
+        page = rows[:self.page_size]
+        self.next_position = self._position(page[-1]) if len(rows) > self.page_size else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['next', 'results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'description': 'Link to the next page'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor from the previous page\'s next link',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Results per page (default {self.page_size}, at most {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def _fields(self):
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def _position(self, instance):
+        return [str(getattr(instance, name)) for name, _descending in self._fields()]
+
+    def _after(self, position):
+        """Q matching rows after position: a >= x AND ((a > x) OR (a = x AND b > y) OR ...)."""
+        fields = self._fields()
+        conditions = []
+        for index, (name, descending) in enumerate(fields):
+            equal = {field: value for (field, _descending), value in zip(fields[:index], position)}
+            lookup = f"{name}__{'lt' if descending else 'gt'}"
+            conditions.append(Q(**equal, **{lookup: position[index]}))
+        # Redundant bound on the first column, so the database can range-scan the ordering index
+        first, descending = fields[0]
+        return Q(**{f"{first}__{'lte' if descending else 'gte'}": position[0]}) & reduce(operator.or_, conditions)
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        """Get the position from the cursor query parameter (None for the first page)."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
@@ -0,0 +1,399 @@
+"""
+Monthly range partitioning for large, append-mostly tables (PostgreSQL only).
+
+Partitioning is opt-in: tables are ordinary Django tables until
+``partition_tables --convert`` is run. Conversion does not copy the rows. The
+existing table is renamed and attached as a single ``<table>_before_YYYYMM``
+partition holding all rows created up to the end of the current month; later
+rows go to monthly ``<table>_pYYYYMM`` partitions, which are created ahead of
+time. A ``<table>_default`` partition catches rows for months without one, so
+inserts never fail when partitions were not created in time.
+Queries that filter on ``created_at`` (admin date filters, exports, reports)
+only scan the partitions for the requested months.
+
+PostgreSQL requires every primary key and unique constraint on a partitioned
+table to include the partition key, and foreign keys can only point at such
+constraints. To keep the schema's guarantees, each converted table gets an
+unpartitioned ``<table>_keys`` table with its primary key and unique columns
+(e.g. ``orders_keys (id, order_number)``), kept in sync by triggers:
+
+- the primary key and unique constraints (``orders.order_number``,
+  ``payments.payment_order_id``) are enforced globally on the key table; on
+  the partitioned table they only exist together with ``created_at``;
+- foreign keys that pointed at a converted table (``order_items``,
+  ``payments``, ``stock_reservations`` and ``sales_rollup_orders`` →
+  ``orders``) point at its key table instead.
+
+Unique indexes that cannot be mirrored this way (partial or expression
+indexes) make the conversion fail. After conversion, Django cannot create a
+foreign key to ``orders``, ``order_items`` or ``payments``: a migration that
+adds one must create the constraint against the key table with ``RunSQL``.
+Key rows of archived partitions are kept, so their ids and numbers are never
+reused.
+
+Partition bounds are month starts in UTC.
+"""
+import re
+from datetime import date, datetime, timezone as dt_timezone
+from django.db import connection
+
+PARTITION_KEY = 'created_at'
+
+# Converted together, in this order, because they reference each other
+PARTITIONED_TABLES = ['orders', 'order_items', 'payments']
+
+MONTH_RE = re.compile(r'^(?P<table>\w+)_(?P<kind>p|before_)(?P<month>\d{6})$')
+
+# Column list of a pg_get_indexdef() result: "... USING btree (a, b) WHERE ..."
+INDEX_COLUMNS_RE = re.compile(r'(?P<using>USING \w+ )\((?P<columns>[^()]*)\)')
+
+
+def month_start(value):
+    """First day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    """First day of the month `months` after value's month."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def utc_today():
+    return datetime.now(dt_timezone.utc).date()
+
+
+def _bound(value):
+    return f"'{datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc).isoformat()}'"
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _column_names(columns):
+    return [column.strip().split(' ')[0].strip('"') for column in columns.split(',')]
+
+
+def _with_partition_key(columns):
+    if PARTITION_KEY in _column_names(columns):
+        return columns
+    return f'{columns}, {_quote(PARTITION_KEY)}'
+
+
+def keys_table(table):
+    return f'{table}_keys'
+
+
+def default_partition(table):
+    return f'{table}_default'
+
+
+def _keys_name(name, table):
+    """Name for the key table's copy of constraint name, e.g. orders_pkey -> orders_keys_pkey."""
+    if name.startswith(table):
+        name = name[len(table):]
+    return f'{keys_table(table)}{name}'[:63]
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+    row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def list_partitions(cursor, table):
+    """
+    Partitions of table that follow the naming scheme.
+
+    Returns:
+        list: (name, lower, upper) tuples with month-start dates; lower is None
+        for the ``before_`` partition
+    """
+    cursor.execute(
+        """
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        ORDER BY c.relname
+        """,
+        [table],
+    )
+    partitions = []
+    for (name,) in cursor.fetchall():
+        match = MONTH_RE.match(name)
+        if not match or match['table'] != table:
+            continue
+        month = date(int(match['month'][:4]), int(match['month'][4:]), 1)
+        if match['kind'] == 'p':
+            partitions.append((name, month, add_months(month, 1)))
+        else:
+            partitions.append((name, None, month))
+    return partitions
+
+
+def conversion_sql(cursor, tables=PARTITIONED_TABLES, today=None):
+    """
+    Statements that turn ordinary tables into partitioned ones.
+
+    Everything created up to the end of the current month stays in the
+    renamed original table, attached as the ``before_`` partition.
+
+    Raises:
+        ValueError: if a table has a unique index the key table cannot enforce
+    """
+    boundary = add_months(today or utc_today(), 1)
+    legacy_suffix = f'_before_{boundary:%Y%m}'
+    statements = []
+
+    # Foreign keys into a partitioned table would need the partition key too,
+    # so they are recreated against the key tables once those exist
+    cursor.execute(
+        """
+        SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid), confrelid::regclass::text
+        FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = ANY(ARRAY[%s]::regclass[])
+        ORDER BY 1, 2
+        """ % ', '.join('%s' for _ in tables),
+        tables,
+    )
+    incoming = cursor.fetchall()
+    for referencing, name, _definition, _referenced in incoming:
+        statements.append(f'ALTER TABLE {_quote(referencing)} DROP CONSTRAINT {_quote(name)}')
+
+    for table in tables:
+        legacy = f'{table}{legacy_suffix}'
+
+        cursor.execute(
+            """
+            SELECT i.relname, pg_get_indexdef(i.oid), c.contype
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            LEFT JOIN pg_constraint c ON c.conindid = i.oid AND c.conrelid = x.indrelid
+            WHERE x.indrelid = to_regclass(%s)
+            ORDER BY i.relname
+            """,
+            [table],
+        )
+        indexes = cursor.fetchall()
+
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid), confrelid::regclass::text FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = to_regclass(%s)
+            ORDER BY conname
+            """,
+            [table],
+        )
+        outgoing = [row for row in cursor.fetchall() if row[2] not in tables]
+
+        # Columns of the primary key and of each unique constraint, for the key table
+        unique = []
+        for index_name, definition, contype in indexes:
+            if contype not in ('p', 'u') and ' UNIQUE INDEX ' not in definition:
+                continue
+            match = INDEX_COLUMNS_RE.search(definition)
+            if not match or ' WHERE ' in definition:
+                raise ValueError(
+                    f'{table} has a unique index that cannot be enforced across partitions: {definition}'
+                )
+            unique.append((index_name, contype, _column_names(match['columns'])))
+        unique.sort(key=lambda row: row[1] != 'p')  # Primary key columns first
+        key_columns = list(dict.fromkeys(column for _name, _contype, columns in unique for column in columns))
+
+        statements.append(f'ALTER TABLE {_quote(table)} RENAME TO {_quote(legacy)}')
+        for index_name, _definition, contype in indexes:
+            # Keep the original names for the partitioned parent's indexes
+            legacy_name = index_name[:63 - len(legacy_suffix)] + legacy_suffix
+            statements.append(f'ALTER INDEX {_quote(index_name)} RENAME TO {_quote(legacy_name)}')
+            if contype == 'p':
+                # A partition cannot have its own primary key; the parent's is built on it
+                statements.append(f'ALTER TABLE {_quote(legacy)} DROP CONSTRAINT {_quote(legacy_name)}')
+
+        statements.append(
+            f'CREATE TABLE {_quote(table)} (LIKE {_quote(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+            f'INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ({_quote(PARTITION_KEY)})'
+        )
+        for index_name, definition, contype in indexes:
+            if contype in ('p', 'u'):
+                columns = _with_partition_key(INDEX_COLUMNS_RE.search(definition)['columns'])
+                kind = 'PRIMARY KEY' if contype == 'p' else 'UNIQUE'
+                statements.append(
+                    f'ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(index_name)} {kind} ({columns})'
+                )
+            elif ' UNIQUE INDEX ' in definition:
+                # Unique indexes that are not constraints; enforced globally by the key table
+                statements.append(INDEX_COLUMNS_RE.sub(
+                    lambda match: f"{match['using']}({_with_partition_key(match['columns'])})",
+                    definition,
+                    count=1,
+                ))
+            else:
+                statements.append(definition)
+        for name, definition, _referenced in outgoing:
+            statements.append(f'ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} {definition}')
+
+        # Indexes identical to the parent's are reused rather than rebuilt
+        statements.append(
+            f'ALTER TABLE {_quote(table)} ATTACH PARTITION {_quote(legacy)} '
+            f'FOR VALUES FROM (MINVALUE) TO ({_bound(boundary)})'
+        )
+        statements += _keys_table_sql(table, unique, key_columns)
+
+    for referencing, name, definition, referenced in incoming:
+        target = _quote(keys_table(referenced))
+        definition = re.sub(r'REFERENCES (\S+)\(', lambda match: f'REFERENCES {target}(', definition, count=1)
+        statements.append(f'ALTER TABLE {_quote(referencing)} ADD CONSTRAINT {_quote(name)} {definition}')
+    return statements
+
+
+def _keys_table_sql(table, unique, key_columns):
+    """Statements creating and filling table's key table, and the triggers keeping it in sync."""
+    keys = _quote(keys_table(table))
+    sync = _quote(f'{keys_table(table)}_sync')
+    columns = ', '.join(_quote(column) for column in key_columns)
+    primary_key = next(columns for _name, contype, columns in unique if contype == 'p')
+    match_old = ' AND '.join(f'{_quote(column)} = OLD.{_quote(column)}' for column in primary_key)
+    new_values = ', '.join(f'NEW.{_quote(column)}' for column in key_columns)
+    changed = ' OR '.join(f'OLD.{_quote(column)} IS DISTINCT FROM NEW.{_quote(column)}' for column in key_columns)
+
+    statements = [f'CREATE TABLE {keys} AS SELECT {columns} FROM {_quote(table)}']
+    for name, contype, index_columns in unique:
+        kind = 'PRIMARY KEY' if contype == 'p' else 'UNIQUE'
+        statements.append(
+            f'ALTER TABLE {keys} ADD CONSTRAINT {_quote(_keys_name(name, table))} '
+            f'{kind} ({", ".join(_quote(column) for column in index_columns)})'
+        )
+    statements.append(
+        f'CREATE FUNCTION {sync}() RETURNS trigger LANGUAGE plpgsql AS $$\n'
+        f'BEGIN\n'
+        f"    IF TG_OP <> 'INSERT' THEN\n"
+        f'        DELETE FROM {keys} WHERE {match_old};\n'
+        f'    END IF;\n'
+        f"    IF TG_OP <> 'DELETE' THEN\n"
+        f'        INSERT INTO {keys} ({columns}) VALUES ({new_values});\n'
+        f'    END IF;\n'
+        f'    RETURN NULL;\n'
+        f'END\n'
+        f'$$'
+    )
+    statements.append(
+        f'CREATE TRIGGER {sync} AFTER INSERT OR DELETE ON {_quote(table)} '
+        f'FOR EACH ROW EXECUTE FUNCTION {sync}()'
+    )
+    statements.append(
+        f'CREATE TRIGGER {_quote(f"{keys_table(table)}_sync_update")} AFTER UPDATE OF {columns} ON {_quote(table)} '
+        f'FOR EACH ROW WHEN ({changed}) EXECUTE FUNCTION {sync}()'
+    )
+    return statements
+
+
+def _exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    return cursor.fetchone()[0]
+
+
+def _primary_key(cursor, table):
+    cursor.execute(
+        """
+        SELECT a.attname FROM pg_constraint c
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+        WHERE c.contype = 'p' AND c.conrelid = to_regclass(%s)
+        ORDER BY array_position(c.conkey, a.attnum)
+        """,
+        [table],
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def _create_partition_sql(table, month):
+    return (
+        f'CREATE TABLE {_quote(f"{table}_p{month:%Y%m}")} PARTITION OF {_quote(table)} '
+        f'FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})'
+    )
+
+
+def default_rows(cursor, table):
+    """Rows in table's default partition, as {month start: count}."""
+    if not _exists(cursor, default_partition(table)):
+        return {}
+    cursor.execute(
+        f"SELECT date_trunc('month', {_quote(PARTITION_KEY)} AT TIME ZONE 'UTC')::date, count(*) "
+        f"FROM {_quote(default_partition(table))} GROUP BY 1 ORDER BY 1"
+    )
+    return dict(cursor.fetchall())
+
+
+def create_partitions_sql(cursor, table, months_ahead=3, today=None):
+    """
+    Statements creating the default partition, if missing, and monthly
+    partitions from the current month to months_ahead.
+
+    Months that have rows in the default partition are skipped: PostgreSQL
+    cannot create their partition until the rows are moved out of it
+    (move_default_sql).
+    """
+    current = month_start(today or utc_today())
+    existing = list_partitions(cursor, table)
+    in_default = default_rows(cursor, table)
+    statements = []
+    if not _exists(cursor, default_partition(table)):
+        statements.append(
+            f'CREATE TABLE {_quote(default_partition(table))} PARTITION OF {_quote(table)} DEFAULT'
+        )
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in in_default:
+            continue
+        if any((lower is None or lower <= month) and month < upper for _name, lower, upper in existing):
+            continue
+        statements.append(_create_partition_sql(table, month))
+    return statements
+
+
+def move_default_sql(cursor, table):
+    """
+    Statements moving the rows of table's default partition into monthly
+    partitions, creating those partitions.
+
+    The default partition is detached while rows are moved (which locks the
+    table) and attached again afterwards.
+    """
+    months = default_rows(cursor, table)
+    if not months:
+        return []
+    default = _quote(default_partition(table))
+    statements = [f'ALTER TABLE {_quote(table)} DETACH PARTITION {default}']
+    statements += [_create_partition_sql(table, month) for month in months]
+    if _exists(cursor, keys_table(table)):
+        # The rows are inserted again below, which adds their keys back
+        primary_key = ', '.join(_quote(column) for column in _primary_key(cursor, keys_table(table)))
+        statements.append(
+            f'DELETE FROM {_quote(keys_table(table))} WHERE ({primary_key}) IN (SELECT {primary_key} FROM {default})'
+        )
+    statements.append(
+        f'WITH moved AS (DELETE FROM {default} RETURNING *) INSERT INTO {_quote(table)} SELECT * FROM moved'
+    )
+    statements.append(f'ALTER TABLE {_quote(table)} ATTACH PARTITION {default} DEFAULT')
+    return statements
+
+
+def archive_sql(cursor, table, before, drop=False, schema='archive'):
+    """
+    Statements detaching every partition whose rows all predate `before`.
+
+    Detached partitions are moved to `schema` (kept queryable, outside the hot
+    table) or dropped.
+    """
+    statements = []
+    for name, _lower, upper in list_partitions(cursor, table):
+        if upper > before:
+            continue
+        statements.append(f'ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(name)}')
+        if drop:
+            statements.append(f'DROP TABLE {_quote(name)}')
+        else:
+            statements.append(f'ALTER TABLE {_quote(name)} SET SCHEMA {_quote(schema)}')
+    if statements and not drop:
+        statements.insert(0, f'CREATE SCHEMA IF NOT EXISTS {_quote(schema)}')
+    return statements
@@ -0,0 +1,153 @@
+"""
+Session engine with a per-process read cache and coalesced writes.
+
+    SESSION_ENGINE = 'apps.core.sessions'
+
+Sessions are stored in the database (django_session) as with the default
+engine. Reads are served from a small per-process LRU
+(SESSION_LOCAL_TIMEOUT seconds), then the shared cache (up to
+SESSION_CACHE_TIMEOUT seconds), then the database. Writes skip the database
+when the session data did not change, and a new key from cycle_key() (on
+login) is inserted once with the final data at the end of the request instead
+of being inserted and then updated.
+
+Deleting a session (logout) drops it from this process and the shared cache;
+other processes may still accept it for up to SESSION_LOCAL_TIMEOUT seconds
+(up to SESSION_CACHE_TIMEOUT without REDIS_URL).
+
+clear_expired() deletes expired rows in batches of SESSION_CLEAR_BATCH_SIZE,
+so `manage.py clearsessions` never holds a long-running delete.
+"""
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+from django.contrib.sessions.backends.base import VALID_KEY_CHARS, CreateError
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from apps.core.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_local = LRUCache(maxsize=settings.SESSION_LOCAL_MAXSIZE, timeout=settings.SESSION_LOCAL_TIMEOUT)
+
+
+class SessionStore(cached_db.SessionStore):
+    """Database-backed sessions cached per process and in the shared cache."""
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._stored = None  # Serialized data as last loaded or saved, to skip unchanged writes
+        self._pending_create = False
+
+    def _serialize(self, data):
+        return self.serializer().dumps(data)
+
+    def _cache_timeout(self, expiry=None):
+        return min(self.get_expiry_age(expiry=expiry), settings.SESSION_CACHE_TIMEOUT)
+
+    def _get_new_session_key(self):
+        # Keys are only ever inserted with must_create, which detects the
+        # (practically impossible) collision, so skip the exists() query
+        return get_random_string(32, VALID_KEY_CHARS)
+
+    def load(self):
+        cache_key = self.cache_key
+        stored = _local.get(cache_key)
+        if stored is not None:
+            self._stored = stored
+            return self.serializer().loads(stored)
+
+        try:
+            data = self._cache.get(cache_key)
+        except Exception:
+            # Some backends raise on invalid keys; read the database instead
+            data = None
+        if data is None:
+            session = self._get_session_from_db()
+            if session is None:
+                return {}
+            data = self.decode(session.session_data)
+            self._cache.set(cache_key, data, self._cache_timeout(expiry=session.expire_date))
+
+        # Stored serialized so every request gets its own copy of the data
+        self._stored = self._serialize(data)
+        _local.set(cache_key, self._stored)
+        return data
+
+    def save(self, must_create=False):
+        if self._pending_create:
+            must_create = True
+        elif self.session_key is None:
+            return self.create()
+
+        data = self._get_session(no_load=must_create)
+        stored = self._serialize(data)
+        if not must_create and stored == self._stored and not settings.SESSION_SAVE_EVERY_REQUEST:
+            return
+
+        if self._pending_create:
+            while True:
+                try:
+                    DBStore.save(self, must_create=True)
+                    break
+                except CreateError:
+                    self._session_key = self._get_new_session_key()
+            self._pending_create = False
+        else:
+            DBStore.save(self, must_create)
+
+        self._stored = stored
+        _local.set(self.cache_key, stored)
+        try:
+            self._cache.set(self.cache_key, data, self._cache_timeout())
+        except Exception:
+            logger.exception('Error saving session to cache (%s)', self._cache)
+
+    def cycle_key(self):
+        """Switch to a new session key; the new session is inserted when the request saves it."""
+        data = self._session
+        key = self.session_key
+        self._session_key = self._get_new_session_key()
+        self._session_cache = data
+        self._pending_create = True
+        self._stored = None
+        self.modified = True
+        if key:
+            self.delete(key)
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            session_key = self.session_key
+        if session_key is None:
+            return
+        # One DELETE, rather than the default engine's SELECT and DELETE
+        self.model.objects.filter(session_key=session_key).delete()
+        self._cache.delete(self.cache_key_prefix + session_key)
+        _local.delete(self.cache_key_prefix + session_key)
+        if session_key == self.session_key:
+            self._stored = None
+            self._pending_create = False
+
+    # Async callers (request.auser() in async views) share the same caches
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    async def asave(self, must_create=False):
+        return await sync_to_async(self.save)(must_create)
+
+    async def adelete(self, session_key=None):
+        return await sync_to_async(self.delete)(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        """Delete expired sessions in batches, each a short transaction."""
+        model = cls.get_model_class()
+        batch_size = settings.SESSION_CLEAR_BATCH_SIZE
+        cutoff = timezone.now()
+        while True:
+            keys = list(model.objects.filter(expire_date__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+            if not keys:
+                return
+            model.objects.filter(pk__in=keys).delete()
@@ -0,0 +1,51 @@
+"""
+Deletion tracking for incremental (delta) syncs.
+
+Changed rows can be found by their updated_at timestamp, but deleted rows are
+gone. Models registered with track_deletions() leave a DeletedRecord behind
+for every deleted row, so a delta export can tell the target environment to
+delete it too.
+
+    track_deletions(Product)  # In models.py, so deletions in every process are recorded
+"""
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from .models import DeletedRecord
+
+
+def record_deletion(model, pk):
+    """Record that the row of model with pk was deleted (now)."""
+    DeletedRecord.objects.bulk_create(
+        [DeletedRecord(model=model._meta.label_lower, object_id=str(pk), deleted_at=timezone.now())],
+        update_conflicts=True,
+        unique_fields=['model', 'object_id'],
+        update_fields=['deleted_at'],
+    )
+
+
+def track_deletions(model):
+    """Record a DeletedRecord whenever a row of model is deleted."""
+    def receiver(sender, instance, **kwargs):
+        record_deletion(model, instance.pk)
+
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'tombstone_{model._meta.label_lower}')
+
+
+def deleted_since(model, since=None, until=None):
+    """
+    Get the pks of rows of model deleted after since (and up to until) that do not exist now.
+
+    Rows deleted and then imported again with the same pk are not reported.
+    """
+    records = DeletedRecord.objects.filter(model=model._meta.label_lower)
+    if since is not None:
+        records = records.filter(deleted_at__gt=since)
+    if until is not None:
+        records = records.filter(deleted_at__lte=until)
+    object_ids = list(records.values_list('object_id', flat=True))
+    to_python = model._meta.pk.to_python
+    pks = [to_python(object_id) for object_id in object_ids]
+    existing = set()
+    for start in range(0, len(pks), 1000):
+        existing.update(model.objects.filter(pk__in=pks[start:start + 1000]).values_list('pk', flat=True))
+    return [pk for pk in pks if pk not in existing]
@@ -2,8 +2,12 @@
 Admin configuration for orders app.
 """
 from django.contrib import admin
+from django.db.models import OuterRef, Subquery, Sum
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import Order, OrderItem
+from .export import EXPORT_FORMATS
+from .models import Order, OrderItem, StockReservation
 
 
 class OrderItemInline(admin.TabularInline):
@@ -14,10 +18,22 @@ class OrderItemInline(admin.TabularInline):
     fields = ['product', 'quantity', 'price_at_purchase', 'line_total']
 
 
+class StockReservationInline(admin.TabularInline):
+    """Inline admin for stock reservations."""
+    model = StockReservation
+    extra = 0
+    can_delete = False
+    readonly_fields = ['product', 'quantity', 'status', 'expires_at']
+    fields = ['product', 'quantity', 'status', 'expires_at']
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     """User-friendly order admin."""
-    inlines = [OrderItemInline]
+    inlines = [OrderItemInline, StockReservationInline]
     list_display = [
         'order_number',
         'customer_name',
@@ -28,6 +44,7 @@ class OrderAdmin(admin.ModelAdmin):
         'shipping_info',
     ]
     list_filter = ['status', 'created_at', 'shipping_state', 'shipping_city']
+    date_hierarchy = 'created_at'
     search_fields = ['order_number', 'customer_name', 'customer_email', 'customer_phone']
     readonly_fields = [
         'id',
@@ -64,7 +81,19 @@ class OrderAdmin(admin.ModelAdmin):
         }),
     )
     
-    actions = ['mark_as_shipped', 'mark_as_delivered', 'mark_as_processing']
+    actions = ['mark_as_shipped', 'mark_as_delivered', 'mark_as_processing', 'export_as_csv', 'export_as_jsonl']
+    
+    def get_queryset(self, request):
+        """Compute order totals in the changelist query instead of once per row."""
+        # A correlated subquery rather than a JOIN + GROUP BY, which PostgreSQL
+        # rejects once orders is partitioned and id alone is no longer the primary key
+        totals = (
+            OrderItem.objects.filter(order=OuterRef('pk'))
+            .values('order')
+            .annotate(total=Sum('line_total'))
+            .values('total')
+        )
+        return super().get_queryset(request).annotate(_total=Subquery(totals))
     
     def status_badge(self, obj):
         """Display status with color coding."""
@@ -85,8 +114,10 @@ class OrderAdmin(admin.ModelAdmin):
     
     def total_display(self, obj):
         """Display order total."""
-        return f"₹{obj.get_total():.2f}"
+        total = obj._total if hasattr(obj, '_total') else obj.get_total()
+        return f"₹{(total or 0):.2f}"
     total_display.short_description = 'Total'
+    total_display.admin_order_field = '_total'
     
     def shipping_info(self, obj):
         """Display concise shipping info."""
@@ -116,6 +147,28 @@ class OrderAdmin(admin.ModelAdmin):
         queryset.update(status=Order.Status.PROCESSING)
         self.message_user(request, f'{queryset.count()} order(s) marked as processing.')
     mark_as_processing.short_description = 'Mark selected orders as processing'
+    
+    def _export(self, queryset, export_format):
+        """Stream the selected orders (and their items) as a file download."""
+        stream, content_type = EXPORT_FORMATS[export_format]
+        # Drop the changelist's total annotation; exports compute totals from prefetched items
+        orders = Order.objects.filter(pk__in=queryset.values('pk'))
+        response = StreamingHttpResponse(stream(orders), content_type=content_type)
+        filename = f"orders-{timezone.localdate():%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    def export_as_csv(self, request, queryset):
+        """Bulk action to download orders as CSV, one row per item."""
+        return self._export(queryset, 'csv')
+    export_as_csv.short_description = 'Export selected orders as CSV'
+    export_as_csv.allowed_permissions = ['view']
+    
+    def export_as_jsonl(self, request, queryset):
+        """Bulk action to download orders as JSON Lines, one order per line."""
+        return self._export(queryset, 'jsonl')
+    export_as_jsonl.short_description = 'Export selected orders as JSON Lines'
+    export_as_jsonl.allowed_permissions = ['view']
 
 
 @admin.register(OrderItem)
@@ -126,3 +179,15 @@ class OrderItemAdmin(admin.ModelAdmin):
     search_fields = ['order__order_number', 'product__name']
     readonly_fields = ['line_total']
 
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    """Admin for stock reservations."""
+    list_display = ['order', 'product', 'quantity', 'status', 'expires_at', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['order__order_number', 'product__name']
+    readonly_fields = ['id', 'order', 'product', 'quantity', 'status', 'expires_at', 'created_at', 'updated_at']
+    
+    def has_add_permission(self, request):
+        return False
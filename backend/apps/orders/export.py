@@ -0,0 +1,161 @@
+"""
+Streaming order exports for orders app.
+
+Orders are read with QuerySet.iterator(chunk_size=...) and each chunk's items
+and products are prefetched in one query, so memory use stays flat no matter
+how many orders are exported. Every generator yields text as soon as a row is
+ready, which lets StreamingHttpResponse start the download immediately.
+"""
+import csv
+import json
+from datetime import datetime, time
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils import timezone
+from .models import Order, OrderItem
+
+DEFAULT_CHUNK_SIZE = 500
+
+CSV_COLUMNS = [
+    'order_number',
+    'status',
+    'created_at',
+    'paid_at',
+    'customer_name',
+    'customer_email',
+    'customer_phone',
+    'shipping_street',
+    'shipping_city',
+    'shipping_state',
+    'shipping_zip_code',
+    'shipping_country',
+    'delivery_date',
+    'gift_note',
+    'order_total',
+    'product_name',
+    'product_slug',
+    'quantity',
+    'price_at_purchase',
+    'line_total',
+]
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+    
+    def write(self, value):
+        return value
+
+
+def filter_orders(queryset=None, start=None, end=None, statuses=None):
+    """
+    Restrict orders to a creation date range and set of statuses.
+    
+    Args:
+        start: First day to include (date)
+        end: Last day to include (date)
+        statuses: Iterable of Order.Status values
+    """
+    if queryset is None:
+        queryset = Order.objects.all()
+    if start:
+        queryset = queryset.filter(created_at__gte=timezone.make_aware(datetime.combine(start, time.min)))
+    if end:
+        queryset = queryset.filter(created_at__lte=timezone.make_aware(datetime.combine(end, time.max)))
+    if statuses:
+        queryset = queryset.filter(status__in=list(statuses))
+    return queryset
+
+
+def iter_orders(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Iterate orders oldest first with items and products prefetched per chunk."""
+    items = OrderItem.objects.select_related('product').order_by('created_at', 'pk')
+    return (
+        queryset.order_by('created_at', 'pk')
+        .prefetch_related(Prefetch('items', queryset=items))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _order_total(order):
+    return sum((item.line_total for item in order.items.all()), 0)
+
+
+def stream_csv(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield CSV lines, one per order item (orders without items get one row)."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for order in iter_orders(queryset, chunk_size):
+        order_fields = [
+            order.order_number,
+            order.status,
+            order.created_at.isoformat(),
+            order.paid_at.isoformat() if order.paid_at else '',
+            order.customer_name,
+            order.customer_email,
+            order.customer_phone,
+            order.shipping_street,
+            order.shipping_city,
+            order.shipping_state,
+            order.shipping_zip_code,
+            order.shipping_country,
+            order.delivery_date.isoformat() if order.delivery_date else '',
+            order.gift_note or '',
+            _order_total(order),
+        ]
+        items = order.items.all()
+        if not items:
+            yield writer.writerow(order_fields + ['', '', '', '', ''])
+        for item in items:
+            yield writer.writerow(order_fields + [
+                item.product.name,
+                item.product.slug,
+                item.quantity,
+                item.price_at_purchase,
+                item.line_total,
+            ])
+
+
+def stream_jsonl(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield one JSON document per order, with its items nested, per line."""
+    for order in iter_orders(queryset, chunk_size):
+        record = {
+            'id': order.id,
+            'order_number': order.order_number,
+            'status': order.status,
+            'created_at': order.created_at,
+            'paid_at': order.paid_at,
+            'customer': {
+                'name': order.customer_name,
+                'email': order.customer_email,
+                'phone': order.customer_phone,
+            },
+            'shipping_address': {
+                'street': order.shipping_street,
+                'city': order.shipping_city,
+                'state': order.shipping_state,
+                'zip_code': order.shipping_zip_code,
+                'country': order.shipping_country,
+            },
+            'delivery_date': order.delivery_date,
+            'gift_note': order.gift_note,
+            'total': _order_total(order),
+            'items': [
+                {
+                    'product_id': item.product_id,
+                    'product_name': item.product.name,
+                    'product_slug': item.product.slug,
+                    'quantity': item.quantity,
+                    'price_at_purchase': item.price_at_purchase,
+                    'line_total': item.line_total,
+                }
+                for item in order.items.all()
+            ],
+        }
+        yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'jsonl': (stream_jsonl, 'application/x-ndjson'),
+}
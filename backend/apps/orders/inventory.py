@@ -0,0 +1,120 @@
+"""
+Stock reservations for orders.
+
+Stock is reserved when an order is placed, committed when it is paid and
+released when the payment fails or the reservation expires. Every stock change
+goes through the conditional updates in apps.products.inventory, and every
+reservation state change is a conditional update on the reservation row, so
+concurrent webhooks, verifications and expiry jobs never release twice.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from apps.products.inventory import InsufficientStock, reserve_stock, release_stock
+from .models import StockReservation
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = [StockReservation.Status.HELD, StockReservation.Status.COMMITTED]
+
+
+def reserve_order_stock(order):
+    """
+    Reserve stock for every order item that does not already hold a reservation.
+    
+    Must be called inside transaction.atomic() so a partial reservation is
+    rolled back when one product runs out. Safe to call again for an order
+    whose reservations were released (e.g. when the customer retries payment).
+    
+    Raises:
+        InsufficientStock: If a product does not have enough stock left
+    """
+    reserved = set(
+        order.reservations.filter(status__in=ACTIVE_STATUSES).values_list('product_id', flat=True)
+    )
+    quantities = defaultdict(int)
+    for product_id, quantity in order.items.values_list('product_id', 'quantity'):
+        if product_id not in reserved:
+            quantities[product_id] += quantity
+    
+    if not quantities:
+        return []
+    
+    # Always decrement in the same product order so concurrent multi-item
+    # checkouts cannot deadlock on each other's row locks
+    for product_id in sorted(quantities):
+        if not reserve_stock(product_id, quantities[product_id]):
+            raise InsufficientStock(product_id, quantities[product_id])
+    
+    expires_at = timezone.now() + timedelta(seconds=settings.STOCK_RESERVATION_TTL)
+    return StockReservation.objects.bulk_create([
+        StockReservation(order=order, product_id=product_id, quantity=quantity, expires_at=expires_at)
+        for product_id, quantity in quantities.items()
+    ])
+
+
+def _release(reservation):
+    """Release one held reservation; returns True if this call released it."""
+    released = StockReservation.objects.filter(
+        pk=reservation.pk,
+        status=StockReservation.Status.HELD,
+    ).update(status=StockReservation.Status.RELEASED, updated_at=timezone.now())
+    if released:
+        release_stock(reservation.product_id, reservation.quantity)
+    return bool(released)
+
+
+def release_order_stock(order):
+    """Return held stock to the shelf, e.g. after a failed payment."""
+    with transaction.atomic():
+        held = list(order.reservations.filter(status=StockReservation.Status.HELD))
+        return sum(_release(reservation) for reservation in held)
+
+
+def commit_order_stock(order):
+    """
+    Make an order's reservations permanent once it is paid.
+    
+    If a reservation expired before the payment arrived, its stock is taken
+    again when still available; otherwise the oversell is logged for follow-up,
+    since the customer has already paid.
+    """
+    with transaction.atomic():
+        order.reservations.filter(status=StockReservation.Status.HELD).update(
+            status=StockReservation.Status.COMMITTED,
+            updated_at=timezone.now(),
+        )
+        try:
+            with transaction.atomic():
+                reserve_order_stock(order)
+        except InsufficientStock as e:
+            logger.error(f"Order {order.order_number} was paid after its reservation expired and is oversold: {e}")
+            return
+        order.reservations.filter(status=StockReservation.Status.HELD).update(
+            status=StockReservation.Status.COMMITTED,
+            updated_at=timezone.now(),
+        )
+
+
+def release_expired_reservations(batch_size=500):
+    """
+    Release held reservations whose expiry has passed.
+    
+    Returns:
+        int: Number of reservations released
+    """
+    released = 0
+    while True:
+        batch = list(
+            StockReservation.objects.filter(
+                status=StockReservation.Status.HELD,
+                expires_at__lte=timezone.now(),
+            )[:batch_size]
+        )
+        if not batch:
+            return released
+        with transaction.atomic():
+            released += sum(_release(reservation) for reservation in batch)
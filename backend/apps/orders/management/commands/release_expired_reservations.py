@@ -0,0 +1,29 @@
+"""
+Management command to return stock held by unpaid orders whose reservation expired.
+
+Run it periodically (e.g. every few minutes from cron).
+
+Usage:
+    python manage.py release_expired_reservations
+    python manage.py release_expired_reservations --batch-size 1000
+"""
+from django.core.management.base import BaseCommand
+from apps.orders.inventory import release_expired_reservations
+
+
+class Command(BaseCommand):
+    help = 'Release stock reservations of unpaid orders that have expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Reservations released per transaction (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        released = release_expired_reservations(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Released {released} expired stock reservations')
+        )
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:46
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_paid_at(apps, schema_editor):
+    """Best estimate for orders paid before paid_at existed: their last update."""
+    Order = apps.get_model('orders', 'Order')
+    Order.objects.filter(
+        paid_at__isnull=True,
+        status__in=['PAID', 'PROCESSING', 'SHIPPED', 'DELIVERED'],
+    ).update(paid_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_stockreservation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='paid_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['paid_at'], name='orders_paid_at_882cb3_idx'),
+        ),
+        migrations.RunPython(backfill_paid_at, migrations.RunPython.noop),
+    ]
@@ -7,6 +7,8 @@ from django.db.models import Sum
 from django.utils import timezone
 from apps.users.models import User
 from apps.products.models import Product
+from apps.core.outbox import enqueue
+from .signals import order_paid
 
 
 class Order(models.Model):
@@ -40,6 +42,7 @@ class Order(models.Model):
     gift_note = models.TextField(blank=True, null=True)
     delivery_date = models.DateField(blank=True, null=True)
     
+    paid_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -50,12 +53,45 @@ class Order(models.Model):
             models.Index(fields=['order_number']),
             models.Index(fields=['status']),
             models.Index(fields=['customer_email']),
+            models.Index(fields=['paid_at']),
+            models.Index(fields=['created_at']),
         ]
     
     def get_total(self):
         """Calculate order total."""
         return self.items.aggregate(total=Sum('line_total'))['total'] or 0
     
+    def mark_paid(self):
+        """
+        Mark a placed order as paid, commit its stock reservations and queue
+        the payment receipt email.
+        
+        Must be called inside transaction.atomic(). The conditional update makes
+        sure concurrent callers (verify endpoint and webhook) transition the
+        order only once.
+        
+        Returns:
+            bool: True if this call moved the order to PAID
+        """
+        now = timezone.now()
+        updated = Order.objects.filter(pk=self.pk, status=self.Status.PLACED).update(
+            status=self.Status.PAID,
+            paid_at=now,
+            updated_at=now,
+        )
+        if not updated:
+            return False
+        
+        self.status = self.Status.PAID
+        self.paid_at = now
+        
+        from .inventory import commit_order_stock
+        commit_order_stock(self)
+        
+        enqueue('orders.send_payment_receipt', {'order_id': str(self.pk)})
+        order_paid.send(sender=Order, order=self)
+        return True
+    
     def generate_order_number(self):
         """Generate unique order number."""
         if not self.order_number:
@@ -96,3 +132,31 @@ class OrderItem(models.Model):
     def __str__(self):
         return f"{self.quantity}x {self.product.name}"
 
+
+
+class StockReservation(models.Model):
+    """Stock held for an order until it is paid, fails or expires."""
+    
+    class Status(models.TextChoices):
+        HELD = 'HELD', 'Held'
+        COMMITTED = 'COMMITTED', 'Committed'
+        RELEASED = 'RELEASED', 'Released'
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, related_name='reservations', on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, related_name='reservations', on_delete=models.PROTECT)
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.HELD)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'stock_reservations'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.quantity}x {self.product_id} for {self.order_id} - {self.status}"
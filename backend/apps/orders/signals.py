@@ -1,8 +1,9 @@
 """
 Signals for orders app.
 """
-# Placeholder for future email notifications on order status changes
-# from django.db.models.signals import post_save
-# from django.dispatch import receiver
-# from .models import Order
+from django.dispatch import Signal
 
+# Sent by Order.mark_paid() inside the payment transaction, once per order.
+# Receivers get the paid ``order`` and should only record work (e.g. enqueue
+# an outbox message), since they run on the request path.
+order_paid = Signal()
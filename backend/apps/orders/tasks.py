@@ -0,0 +1,57 @@
+"""
+Outbox handlers for orders app.
+
+These run in the run_workers process, off the request path.
+"""
+from django.conf import settings
+from django.core.mail import send_mail
+from apps.core.outbox import handler
+from .models import Order
+
+
+def _order_lines(order):
+    """Format order items as plain-text lines."""
+    lines = []
+    for item in order.items.select_related('product'):
+        lines.append(f"  {item.quantity} x {item.product.name} - ₹{item.line_total:.2f}")
+    return '\n'.join(lines)
+
+
+@handler('orders.send_order_confirmation')
+def send_order_confirmation(payload):
+    """Email the customer a confirmation of their placed order."""
+    order = Order.objects.get(pk=payload['order_id'])
+    message = (
+        f"Hi {order.customer_name},\n\n"
+        f"Thank you for your order {order.order_number}.\n\n"
+        f"{_order_lines(order)}\n\n"
+        f"Total: ₹{order.get_total():.2f}\n\n"
+        f"We will let you know as soon as your payment is confirmed.\n\n"
+        f"Dolce Fiore"
+    )
+    send_mail(
+        subject=f'Order {order.order_number} received',
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[order.customer_email],
+    )
+
+
+@handler('orders.send_payment_receipt')
+def send_payment_receipt(payload):
+    """Email the customer a receipt once their payment is confirmed."""
+    order = Order.objects.get(pk=payload['order_id'])
+    message = (
+        f"Hi {order.customer_name},\n\n"
+        f"We have received your payment for order {order.order_number}.\n\n"
+        f"{_order_lines(order)}\n\n"
+        f"Total paid: ₹{order.get_total():.2f}\n\n"
+        f"Your hamper is now being prepared.\n\n"
+        f"Dolce Fiore"
+    )
+    send_mail(
+        subject=f'Payment received for order {order.order_number}',
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[order.customer_email],
+    )
@@ -1,6 +1,8 @@
 """
 Views for orders app.
 """
+import logging
+from django.conf import settings
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -9,16 +11,23 @@ from drf_spectacular.utils import extend_schema
 from django.db import transaction
 from django.utils.dateparse import parse_date
 from apps.products.models import Product
+from apps.products.inventory import InsufficientStock
 from apps.cart.models import Cart, CartItem
+from apps.core.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
+from apps.core.outbox import enqueue
+from .inventory import reserve_order_stock
 from .models import Order, OrderItem
 from .serializers import OrderSerializer, CreateOrderSerializer
 
+logger = logging.getLogger(__name__)
+
 
 @extend_schema(
     tags=['Orders'],
     summary='List user orders or create order',
     request=CreateOrderSerializer,
     responses={200: OrderSerializer(many=True), 201: OrderSerializer},
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
 )
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -37,6 +46,7 @@ def order_list_view(request):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@idempotent
 def create_order_view(request):
     """Create order from cart or items."""
     serializer = CreateOrderSerializer(data=request.data)
@@ -105,6 +115,9 @@ def create_order_view(request):
                     price_at_purchase=product.price,
                 )
             
+            # Hold stock for limited items until the order is paid or the hold expires
+            reserve_order_stock(order)
+            
             # Clear user's cart
             try:
                 cart = Cart.objects.get(user=request.user)
@@ -112,17 +125,31 @@ def create_order_view(request):
             except Cart.DoesNotExist:
                 pass
             
+            # Confirmation email is sent by the outbox worker after commit
+            enqueue('orders.send_order_confirmation', {'order_id': str(order.id)})
+            
             response_serializer = OrderSerializer(order)
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
     
+    except InsufficientStock as e:
+        product_name = Product.objects.filter(pk=e.product_id).values_list('name', flat=True).first()
+        return Response(
+            {'error': f'{product_name or "A product"} is out of stock', 'productId': str(e.product_id)},
+            status=status.HTTP_409_CONFLICT
+        )
     except ValueError as e:
         return Response(
             {'error': str(e)},
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
+        # Not the client's fault: a 5xx also releases the Idempotency-Key so a retry runs again
+        logger.error(f"Error creating order ({type(e).__name__}): {e}", exc_info=True)
         return Response(
-            {'error': f'Failed to create order: {str(e)}'},
-            status=status.HTTP_400_BAD_REQUEST
+            {
+                'error': 'Failed to create order',
+                'details': str(e) if settings.DEBUG else 'Please try again or contact support'
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
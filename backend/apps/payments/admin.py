@@ -2,8 +2,9 @@
 Admin configuration for payments app.
 """
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import Payment
+from .models import Payment, WebhookEvent
 
 
 @admin.register(Payment)
@@ -19,6 +20,7 @@ class PaymentAdmin(admin.ModelAdmin):
         'created_at',
     ]
     list_filter = ['provider', 'status', 'created_at']
+    date_hierarchy = 'created_at'
     search_fields = ['payment_order_id', 'order__order_number']
     readonly_fields = ['id', 'created_at', 'updated_at']
     
@@ -55,3 +57,29 @@ class PaymentAdmin(admin.ModelAdmin):
         return f"{obj.currency} {obj.amount:.2f}"
     amount_display.short_description = 'Amount'
 
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    """Admin for stored Razorpay webhook events."""
+    list_display = ['event_type', 'payment_order_id', 'status', 'attempts', 'event_created_at', 'received_at', 'processed_at']
+    list_filter = ['status', 'event_type', 'received_at']
+    search_fields = ['event_id', 'payment_order_id', 'last_error']
+    readonly_fields = [
+        'id', 'event_id', 'event_type', 'payment_order_id', 'body', 'event_created_at', 'received_at',
+        'status', 'attempts', 'available_at', 'last_error', 'processed_at',
+    ]
+    
+    actions = ['retry_now']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def retry_now(self, request, queryset):
+        """Bulk action to make failed or pending events processable immediately."""
+        updated = queryset.exclude(status=WebhookEvent.Status.PROCESSED).update(
+            status=WebhookEvent.Status.PENDING,
+            available_at=timezone.now(),
+            attempts=0,
+        )
+        self.message_user(request, f'{updated} event(s) queued for retry.')
+    retry_now.short_description = 'Retry selected events now'
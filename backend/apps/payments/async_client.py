@@ -0,0 +1,116 @@
+"""
+Async Razorpay client for views served by an ASGI server.
+
+Covers the gateway calls made while handling a request (order create and
+order payment lookup) with aiohttp, so a request waiting on Razorpay holds a
+coroutine instead of a worker thread. Errors are raised as the same
+razorpay.errors exceptions the sync client uses, and calls go through the
+same per-process circuit breaker as call_gateway().
+"""
+import weakref
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+import aiohttp
+from razorpay.errors import BadRequestError, GatewayError, ServerError
+from .utils import gateway_breaker, get_razorpay_config
+
+# One client (and connection pool) per event loop; aiohttp sessions cannot be shared between loops
+_clients = weakref.WeakKeyDictionary()
+
+
+class AsyncRazorpayClient:
+    """Minimal async counterpart of razorpay.Client backed by a pooled aiohttp session."""
+
+    def __init__(self, config):
+        self._base_url = config.base_url.rstrip('/')
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.RAZORPAY_ASYNC_MAX_CONNECTIONS,
+                keepalive_timeout=30,
+            ),
+            headers={'Authorization': aiohttp.BasicAuth(config.key_id, config.key_secret).encode()},
+            timeout=aiohttp.ClientTimeout(sock_connect=config.connect_timeout, sock_read=config.read_timeout),
+            raise_for_status=False,
+        )
+
+    async def request(self, method, path, timeout=None, **kwargs):
+        """
+        Make an API request and return the decoded JSON body.
+
+        Raises:
+            BadRequestError, GatewayError, ServerError: On an error response, as razorpay.Client does
+            aiohttp.ClientError, asyncio.TimeoutError: If the gateway could not be reached in time
+        """
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        async with self._session.request(method, f'{self._base_url}{path}', **kwargs) as response:
+            if response.status < 300:
+                return await response.json(content_type=None)
+            try:
+                error = (await response.json(content_type=None)).get('error', {})
+            except ValueError:
+                error = {}
+
+        description = error.get('description', '')
+        code = str(error.get('code', '')).upper()
+        if code == 'BAD_REQUEST_ERROR':
+            raise BadRequestError(description)
+        if code == 'GATEWAY_ERROR':
+            raise GatewayError(description)
+        raise ServerError(description)
+
+    async def create_order(self, data, timeout=None):
+        return await self.request('POST', '/v1/orders', json=data, timeout=timeout)
+
+    async def order_payments(self, order_id, timeout=None):
+        return await self.request('GET', f'/v1/orders/{order_id}/payments', timeout=timeout)
+
+    async def close(self):
+        await self._session.close()
+
+
+def get_async_razorpay_client(loop):
+    """
+    Get the Razorpay client for an event loop, creating it on first use.
+
+    Must be called from a coroutine running on loop.
+
+    Raises:
+        ValueError: If credentials are not configured
+    """
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncRazorpayClient(get_razorpay_config())
+    return client
+
+
+async def call_gateway_async(operation, *args, deadline=None, **kwargs):
+    """
+    Await an AsyncRazorpayClient method through the circuit breaker with a deadline.
+
+    Args:
+        operation: Bound client method, e.g. client.create_order
+        deadline: Seconds the whole call may take (default: PAYMENT_GATEWAY_DEADLINE),
+            including waiting for a free pooled connection
+
+    Raises:
+        CircuitOpenError: If the gateway is failing and the call was not made
+        asyncio.TimeoutError: If the deadline passed
+    """
+    config = get_razorpay_config()
+    deadline = deadline or settings.PAYMENT_GATEWAY_DEADLINE
+    timeout = aiohttp.ClientTimeout(
+        total=deadline,
+        sock_connect=min(config.connect_timeout, deadline),
+        sock_read=min(config.read_timeout, deadline),
+    )
+    with gateway_breaker.guard():
+        return await operation(*args, timeout=timeout, **kwargs)
+
+
+@receiver(setting_changed)
+def _reset_async_clients(setting, **kwargs):
+    """Drop cached clients when Razorpay settings change (e.g. in tests)."""
+    if setting.startswith('RAZORPAY_'):
+        _clients.clear()
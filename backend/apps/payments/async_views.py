@@ -0,0 +1,280 @@
+"""
+Async views for payments app.
+
+Async counterparts of create_payment_order_view and verify_payment_view for
+deployments on an ASGI server (see config/asgi.py). Gateway calls are awaited
+with the aiohttp client from async_client, so requests waiting on Razorpay cost
+a coroutine rather than a worker. Database work runs in short sync_to_async
+calls and no transaction is held open while the gateway is awaited.
+
+DRF views are sync-only, so these are plain Django views: they accept the same
+JSON bodies, authenticate with a session (with CSRF) or an API token, and
+return the same response shapes as the DRF views. Idempotency-Key is not
+handled here; repeated calls for an order return its pending payment anyway.
+"""
+import asyncio
+import json
+import logging
+import math
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from razorpay.errors import BadRequestError
+from rest_framework.authentication import CSRFCheck
+from apps.core.circuitbreaker import CircuitOpenError
+from apps.orders.inventory import reserve_order_stock, release_order_stock
+from apps.orders.models import Order
+from apps.products.inventory import InsufficientStock
+from apps.users.authentication import get_token
+from .async_client import call_gateway_async, get_async_razorpay_client
+from .models import Payment
+from .serializers import (
+    PaymentOrderRequestSerializer,
+    PaymentOrderResponseSerializer,
+    PaymentVerificationRequestSerializer,
+)
+from .utils import verify_payment_signature
+
+logger = logging.getLogger(__name__)
+
+# Gateway order creations in flight in this process, keyed by (event loop, order pk).
+# Concurrent requests for the same order await the first one's result.
+_inflight = {}
+
+
+def _csrf_failure(request):
+    """Return the CSRF failure reason for a session-authenticated request, as DRF enforces it."""
+    check = CSRFCheck(lambda request: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
+
+
+async def _authenticate(request):
+    """
+    Authenticate with an API token or the session.
+
+    Returns:
+        tuple: (user, error JsonResponse); user is None when not authenticated
+    """
+    auth = request.headers.get('Authorization', '').split()
+    if len(auth) == 2 and auth[0].lower() == 'token':
+        token = await sync_to_async(get_token)(auth[1])
+        if token is None or not token.user.is_active:
+            return None, JsonResponse({'detail': 'Invalid token.'}, status=401)
+        return token.user, None
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return None, JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=403)
+    reason = _csrf_failure(request)
+    if reason:
+        return None, JsonResponse({'detail': f'CSRF Failed: {reason}'}, status=403)
+    return user, None
+
+
+def async_api_view(view_func):
+    """Accept POSTed JSON from an authenticated user; the view receives (request, user, data)."""
+    @csrf_exempt  # Enforced in _authenticate for session authentication only, like DRF
+    @require_POST
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        user, error = await _authenticate(request)
+        if error is not None:
+            return error
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'detail': 'JSON parse error'}, status=400)
+        return await view_func(request, user, data, *args, **kwargs)
+    return wrapper
+
+
+def _lock_order_for_payment(user, order_id):
+    """
+    Get the user's order with its pending payment, reserving stock if there is none.
+
+    Raises:
+        Order.DoesNotExist: If the order does not belong to the user
+        InsufficientStock: If the order's items are no longer in stock
+    """
+    with transaction.atomic():
+        order = Order.objects.select_for_update().get(id=order_id, user=user)
+        pending = Payment.objects.filter(order=order, status=Payment.Status.PENDING).first()
+        if pending is None:
+            # Re-take stock released by an earlier failed or expired payment attempt
+            reserve_order_stock(order)
+        return order, pending
+
+
+def _record_payment(order, razorpay_order_id, amount, currency):
+    """
+    Store the pending payment for a new gateway order.
+
+    Another worker process may have created one for the order while the
+    gateway was awaited; its payment is kept and this gateway order is unused.
+
+    Returns:
+        tuple: (Payment, created)
+    """
+    with transaction.atomic():
+        order = Order.objects.select_for_update().get(pk=order.pk)
+        pending = Payment.objects.filter(order=order, status=Payment.Status.PENDING).first()
+        if pending is not None:
+            logger.info(f"Order {order.order_number} already has pending payment; {razorpay_order_id} unused")
+            return pending, False
+        payment = Payment.objects.create(
+            order=order,
+            payment_order_id=razorpay_order_id,
+            provider=Payment.Provider.RAZORPAY,
+            amount=amount,
+            currency=currency,
+            status=Payment.Status.PENDING,
+        )
+        return payment, True
+
+
+async def _create_gateway_payment(order, amount, currency):
+    client = get_async_razorpay_client(asyncio.get_running_loop())
+    razorpay_order = await call_gateway_async(client.create_order, {
+        'amount': int(amount * 100),  # Paise
+        'currency': currency,
+        'receipt': f'order_{order.order_number}',
+        'notes': {
+            'order_id': str(order.id),
+            'order_number': order.order_number,
+        },
+    })
+    logger.info(f"Razorpay order created successfully: {razorpay_order['id']}")
+    return await sync_to_async(_record_payment)(order, razorpay_order['id'], amount, currency)
+
+
+def _gateway_error_response(error):
+    if isinstance(error, CircuitOpenError):
+        logger.warning(f"Razorpay order not created: {error}")
+        return JsonResponse(
+            {'error': 'Payment gateway temporarily unavailable', 'details': 'Please try again shortly'},
+            status=503,
+            headers={'Retry-After': str(max(1, math.ceil(error.retry_after)))},
+        )
+    if isinstance(error, asyncio.TimeoutError):
+        logger.error("Razorpay order create exceeded its deadline")
+        return JsonResponse(
+            {'error': 'Payment gateway timed out', 'details': 'Please try again shortly'},
+            status=504,
+        )
+    if isinstance(error, ValueError):
+        logger.error(f"Razorpay configuration error: {error}")
+        return JsonResponse(
+            {
+                'error': 'Payment gateway not configured',
+                'details': 'Please check RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET environment variables',
+            },
+            status=500,
+        )
+    if isinstance(error, BadRequestError):
+        description = str(error)
+        logger.error(f"Razorpay BadRequestError: {description}")
+        if 'authentication' in description.lower():
+            return JsonResponse({'error': 'Razorpay authentication failed'}, status=401)
+        return JsonResponse(
+            {'error': 'Invalid Razorpay request', 'details': 'Please check your payment details'},
+            status=400,
+        )
+    logger.error(f"Razorpay API error ({type(error).__name__}): {error}")
+    return JsonResponse(
+        {'error': 'Failed to create Razorpay order', 'details': 'Please try again or contact support'},
+        status=500,
+    )
+
+
+@async_api_view
+async def create_payment_order_async_view(request, user, data):
+    """Create Razorpay payment order (async)."""
+    serializer = PaymentOrderRequestSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    amount = serializer.validated_data['amount']
+    currency = serializer.validated_data.get('currency', 'INR')
+    order_id = serializer.validated_data['orderId']
+    if amount <= 0:
+        return JsonResponse({'error': 'Valid amount is required'}, status=400)
+
+    try:
+        order, pending = await sync_to_async(_lock_order_for_payment)(user, order_id)
+    except Order.DoesNotExist:
+        logger.warning(f"Order not found: {order_id} for user {user.id}")
+        return JsonResponse({'error': 'Order not found', 'orderId': str(order_id)}, status=404)
+    except InsufficientStock:
+        return JsonResponse({'error': 'Some items in this order are no longer in stock'}, status=409)
+
+    if pending is not None:
+        return JsonResponse(PaymentOrderResponseSerializer(pending).data, status=200)
+
+    # Single flight: join a creation already in flight for this order in this process
+    key = (asyncio.get_running_loop(), order.pk)
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(_create_gateway_payment(order, amount, currency))
+        task.add_done_callback(lambda _task: _inflight.pop(key, None))
+        joined = False
+    else:
+        joined = True
+
+    try:
+        # Shielded so a client disconnecting does not cancel the call for the others waiting on it
+        payment, created = await asyncio.shield(task)
+    except Exception as e:
+        return _gateway_error_response(e)
+
+    return JsonResponse(
+        PaymentOrderResponseSerializer(payment).data,
+        status=201 if created and not joined else 200,
+    )
+
+
+def _fail_payment(payment, order):
+    payment.status = Payment.Status.FAILED
+    payment.save()
+    release_order_stock(order)
+
+
+def _settle_payment(payment, order, payment_id, signature):
+    with transaction.atomic():
+        payment.razorpay_payment_id = payment_id
+        payment.razorpay_signature = signature
+        payment.status = Payment.Status.SUCCESS
+        payment.save()
+
+        # Update order status to PAID (queues the payment receipt email)
+        order.mark_paid()
+
+
+@async_api_view
+async def verify_payment_async_view(request, user, data):
+    """Verify payment signature and update payment status (async)."""
+    serializer = PaymentVerificationRequestSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    payment_id = serializer.validated_data['paymentId']
+    order_id = serializer.validated_data['orderId']
+    signature = serializer.validated_data['signature']
+
+    order = await Order.objects.filter(id=order_id, user=user).afirst()
+    if order is None:
+        return JsonResponse({'error': 'Order not found'}, status=404)
+
+    payment = await Payment.objects.filter(order=order).order_by('-created_at').afirst()
+    if payment is None:
+        return JsonResponse({'error': 'Payment not found'}, status=404)
+
+    if not verify_payment_signature(payment_id=payment_id, order_id=payment.payment_order_id, signature=signature):
+        await sync_to_async(_fail_payment)(payment, order)
+        return JsonResponse({'error': 'Payment verification failed'}, status=400)
+
+    await sync_to_async(_settle_payment)(payment, order, payment_id, signature)
+    return JsonResponse({'message': 'Payment verified successfully', 'paymentId': payment_id}, status=200)
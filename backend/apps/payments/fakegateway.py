@@ -0,0 +1,382 @@
+"""
+Local stand-in for the Razorpay API, for development and load testing.
+
+Implements the subset of the API the payments app uses:
+
+- ``POST /v1/orders`` creates a gateway order
+- ``GET /v1/orders/<id>`` and ``GET /v1/orders/<id>/payments`` fetch it and its payments
+- ``GET /v1/payments/<id>`` fetches a payment
+
+plus ``POST /_fake/orders/<id>/pay``, which plays the customer completing
+checkout: it records a payment, returns the ``razorpay_payment_id`` /
+``razorpay_order_id`` / ``razorpay_signature`` triple that Razorpay Checkout
+hands to the frontend, and (when a webhook URL is set) delivers a signed
+``payment.captured`` or ``payment.failed`` webhook to the app.
+
+Signatures use the same secrets as the app, so point the app at the server
+with ``RAZORPAY_BASE_URL=http://127.0.0.1:9000`` and run both with the same
+RAZORPAY_KEY_SECRET and RAZORPAY_WEBHOOK_SECRET. Latency, errors and
+timeouts can be injected on the ``/v1`` endpoints. State is kept in memory.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import random
+import re
+import secrets
+import string
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+
+logger = logging.getLogger(__name__)
+
+ORDER_PATH_RE = re.compile(r'^/v1/orders/(?P<order_id>order_\w+)(?P<payments>/payments)?$')
+PAYMENT_PATH_RE = re.compile(r'^/v1/payments/(?P<payment_id>pay_\w+)$')
+PAY_PATH_RE = re.compile(r'^/_fake/orders/(?P<order_id>order_\w+)/pay$')
+
+_ID_ALPHABET = string.ascii_letters + string.digits
+
+
+def _new_id(prefix):
+    return f"{prefix}_{''.join(secrets.choice(_ID_ALPHABET) for _ in range(14))}"
+
+
+def sign(secret, message):
+    """Hex HMAC-SHA256 signature, as Razorpay computes it."""
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    return hmac.new(secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+
+def webhook_body(event, payment):
+    """Serialized webhook body for a payment entity."""
+    return json.dumps({
+        'entity': 'event',
+        'event': event,
+        'contains': ['payment'],
+        'payload': {'payment': {'entity': payment}},
+        'created_at': int(time.time()),
+    }).encode('utf-8')
+
+
+def webhook_headers(body, webhook_secret):
+    """Headers Razorpay sends with a webhook delivery."""
+    return {
+        'Content-Type': 'application/json',
+        'X-Razorpay-Signature': sign(webhook_secret, body),
+        'X-Razorpay-Event-Id': _new_id('evt'),
+    }
+
+
+@dataclass
+class FaultConfig:
+    """
+    Faults injected on /v1 requests.
+
+    Attributes:
+        latency: Base delay in seconds added to every request
+        jitter: Extra delay, uniformly distributed in [0, jitter] seconds
+        error_rate: Fraction of requests answered with a 502 gateway error
+        timeout_rate: Fraction of requests that hang for `hang` seconds
+        hang: How long a "timed out" request hangs before it is answered
+        trickle: Delay in seconds between the bytes of each response body, for a
+            gateway that keeps the connection alive but answers very slowly
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang: float = 30.0
+    trickle: float = 0.0
+
+
+class FakeGateway:
+    """In-memory gateway state and webhook delivery."""
+
+    def __init__(self, key_secret, webhook_secret='', webhook_url=None, webhook_delay=0.0,
+                 duplicate_rate=0.0, faults=None):
+        self.key_secret = key_secret
+        self.webhook_secret = webhook_secret
+        self.webhook_url = webhook_url
+        self.webhook_delay = webhook_delay
+        self.duplicate_rate = duplicate_rate
+        self.faults = faults or FaultConfig()
+
+        self._lock = threading.Lock()
+        self.orders = {}
+        self.payments = {}
+        self.stats = {'requests': 0, 'errors_injected': 0, 'timeouts_injected': 0,
+                      'webhooks_sent': 0, 'webhooks_failed': 0}
+
+        self._webhooks = deque()
+        self._webhook_ready = threading.Condition(self._lock)
+        self._session = requests.Session()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def inject_faults(self):
+        """
+        Apply the configured latency and pick an injected failure, if any.
+
+        Returns:
+            str: 'error', 'timeout' or None
+        """
+        faults = self.faults
+        delay = faults.latency + random.uniform(0, faults.jitter)
+        if delay:
+            time.sleep(delay)
+        roll = random.random()
+        if roll < faults.timeout_rate:
+            self._count('timeouts_injected')
+            time.sleep(faults.hang)
+            return 'timeout'
+        if roll < faults.timeout_rate + faults.error_rate:
+            self._count('errors_injected')
+            return 'error'
+        return None
+
+    def create_order(self, data):
+        amount = data.get('amount')
+        if not isinstance(amount, int) or amount < 100:
+            raise ValueError('The amount must be atleast INR 1.00')
+        order = {
+            'id': _new_id('order'),
+            'entity': 'order',
+            'amount': amount,
+            'amount_paid': 0,
+            'amount_due': amount,
+            'currency': data.get('currency', 'INR'),
+            'receipt': data.get('receipt'),
+            'status': 'created',
+            'attempts': 0,
+            'notes': data.get('notes') or {},
+            'created_at': int(time.time()),
+        }
+        with self._lock:
+            self.orders[order['id']] = order
+        return order
+
+    def order_payments(self, order_id):
+        with self._lock:
+            return [payment for payment in self.payments.values() if payment['order_id'] == order_id]
+
+    def pay(self, order_id, succeed=True, deliver_webhook=True):
+        """
+        Complete checkout for a gateway order.
+
+        Returns:
+            dict: The payment and the fields Razorpay Checkout returns to the frontend
+
+        Raises:
+            KeyError: If the order does not exist
+        """
+        with self._lock:
+            order = self.orders[order_id]
+            payment = {
+                'id': _new_id('pay'),
+                'entity': 'payment',
+                'amount': order['amount'],
+                'currency': order['currency'],
+                'status': 'captured' if succeed else 'failed',
+                'order_id': order_id,
+                'method': 'card',
+                'captured': succeed,
+                'created_at': int(time.time()),
+            }
+            self.payments[payment['id']] = payment
+            order['attempts'] += 1
+            if succeed:
+                order.update(status='paid', amount_paid=order['amount'], amount_due=0)
+            else:
+                order['status'] = 'attempted'
+
+        if deliver_webhook:
+            self.queue_webhook('payment.captured' if succeed else 'payment.failed', payment)
+
+        checkout = {'razorpay_payment_id': payment['id'], 'razorpay_order_id': order_id}
+        if succeed:
+            checkout['razorpay_signature'] = sign(self.key_secret, f"{order_id}|{payment['id']}")
+        return {'payment': payment, 'checkout': checkout}
+
+    def queue_webhook(self, event, payment):
+        if not self.webhook_url:
+            return
+        body = webhook_body(event, payment)
+        headers = webhook_headers(body, self.webhook_secret)
+        copies = 2 if random.random() < self.duplicate_rate else 1
+        with self._webhook_ready:
+            for _ in range(copies):
+                self._webhooks.append((time.monotonic() + self.webhook_delay, body, headers))
+            self._webhook_ready.notify()
+
+    def deliver_webhooks(self, stop):
+        """Send queued webhooks until `stop` is set. Failed deliveries are retried once after 5 seconds."""
+        while not stop.is_set():
+            with self._webhook_ready:
+                if not self._webhooks:
+                    self._webhook_ready.wait(timeout=0.5)
+                    continue
+                due, body, headers = self._webhooks[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._webhook_ready.wait(timeout=wait)
+                    continue
+                self._webhooks.popleft()
+            try:
+                response = self._session.post(self.webhook_url, data=body, headers=headers, timeout=10)
+                response.raise_for_status()
+                self._count('webhooks_sent')
+            except requests.RequestException as e:
+                self._count('webhooks_failed')
+                logger.warning(f'Webhook delivery to {self.webhook_url} failed: {e}')
+                if not headers.get('X-Fake-Retry'):
+                    with self._webhook_ready:
+                        self._webhooks.append((time.monotonic() + 5, body, {**headers, 'X-Fake-Retry': '1'}))
+
+
+class FakeGatewayHandler(BaseHTTPRequestHandler):
+    """Request handler; the FakeGateway is available as self.server.gateway."""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+    trickle = 0.0  # Set per /v1 request by _api_call()
+
+    def log_message(self, format, *args):
+        logger.debug(f'{self.address_string()} {format % args}')
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if not self.trickle:
+            self.wfile.write(payload)
+            return
+        try:
+            for i in range(len(payload)):
+                self.wfile.write(payload[i:i + 1])
+                self.wfile.flush()
+                time.sleep(self.trickle)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # The client gave up waiting
+
+    def _error(self, status, code, description):
+        self._send(status, {'error': {'code': code, 'description': description}})
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _authorized(self):
+        # Basic auth with key_id:key_secret; only the secret is checked
+        gateway = self.server.gateway
+        header = self.headers.get('Authorization', '')
+        if not header.startswith('Basic '):
+            return False
+        try:
+            _key_id, _sep, secret = base64.b64decode(header[6:]).decode('utf-8').partition(':')
+        except ValueError:
+            return False
+        return hmac.compare_digest(secret, gateway.key_secret)
+
+    def _api_call(self):
+        """Common checks for /v1 endpoints. Returns False if a response was already sent."""
+        gateway = self.server.gateway
+        gateway._count('requests')
+        if not self._authorized():
+            self._error(401, 'BAD_REQUEST_ERROR', 'Authentication failed')
+            return False
+        fault = gateway.inject_faults()
+        self.trickle = gateway.faults.trickle
+        if fault == 'error':
+            self._error(502, 'GATEWAY_ERROR', 'Injected gateway error')
+            return False
+        return True
+
+    def do_GET(self):
+        gateway = self.server.gateway
+        self.trickle = 0.0
+        path = self.path.split('?', 1)[0]
+
+        if path == '/_fake/stats':
+            with gateway._lock:
+                stats = {**gateway.stats, 'orders': len(gateway.orders), 'payments': len(gateway.payments),
+                         'webhooks_queued': len(gateway._webhooks)}
+            return self._send(200, stats)
+
+        if not path.startswith('/v1/'):
+            return self._error(404, 'BAD_REQUEST_ERROR', 'The requested URL was not found on the server.')
+        if not self._api_call():
+            return
+
+        match = ORDER_PATH_RE.match(path)
+        if match:
+            order = gateway.orders.get(match['order_id'])
+            if order is None:
+                return self._error(400, 'BAD_REQUEST_ERROR', 'The id provided does not exist')
+            if match['payments']:
+                items = gateway.order_payments(order['id'])
+                return self._send(200, {'entity': 'collection', 'count': len(items), 'items': items})
+            return self._send(200, order)
+
+        match = PAYMENT_PATH_RE.match(path)
+        if match:
+            payment = gateway.payments.get(match['payment_id'])
+            if payment is None:
+                return self._error(400, 'BAD_REQUEST_ERROR', 'The id provided does not exist')
+            return self._send(200, payment)
+
+        return self._error(404, 'BAD_REQUEST_ERROR', 'The requested URL was not found on the server.')
+
+    def do_POST(self):
+        gateway = self.server.gateway
+        self.trickle = 0.0
+        path = self.path.split('?', 1)[0]
+        try:
+            data = self._read_json()
+        except ValueError:
+            return self._error(400, 'BAD_REQUEST_ERROR', 'Invalid JSON body')
+
+        match = PAY_PATH_RE.match(path)
+        if match:
+            try:
+                result = gateway.pay(
+                    match['order_id'],
+                    succeed=data.get('status', 'captured') == 'captured',
+                    deliver_webhook=data.get('webhook', True),
+                )
+            except KeyError:
+                return self._error(400, 'BAD_REQUEST_ERROR', 'The id provided does not exist')
+            return self._send(200, result)
+
+        if path == '/v1/orders':
+            if not self._api_call():
+                return
+            try:
+                return self._send(200, gateway.create_order(data))
+            except ValueError as e:
+                return self._error(400, 'BAD_REQUEST_ERROR', str(e))
+
+        return self._error(404, 'BAD_REQUEST_ERROR', 'The requested URL was not found on the server.')
+
+
+class FakeGatewayServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Accept bursts of concurrent connections from load tests
+
+
+def make_server(gateway, host='127.0.0.1', port=9000):
+    """Create a threaded HTTP server for gateway; call serve_forever() to run it."""
+    server = FakeGatewayServer((host, port), FakeGatewayHandler)
+    server.gateway = gateway
+    return server
@@ -0,0 +1,122 @@
+"""
+Management command to compare the sync and async Razorpay call paths.
+
+Starts the fake gateway in-process with the given latency and makes the same
+number of order-create calls through call_gateway() from a thread pool (how
+sync workers wait on Razorpay) and through call_gateway_async() from one
+event loop. Uses throwaway keys, so no Razorpay credentials are needed.
+
+Usage:
+    python manage.py benchmark_gateway_io
+    python manage.py benchmark_gateway_io --calls 2000 --concurrency 500 --latency-ms 300
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from apps.payments.async_client import call_gateway_async, get_async_razorpay_client
+from apps.payments.fakegateway import FakeGateway, FaultConfig, make_server
+from apps.payments.management.commands.loadtest_checkout import percentile
+from apps.payments.utils import call_gateway, gateway_breaker, get_razorpay_client
+
+KEY_ID = 'rzp_test_benchmark'
+KEY_SECRET = 'benchmark_key_secret'
+
+ORDER_DATA = {'amount': 50000, 'currency': 'INR', 'receipt': 'benchmark'}
+
+
+class Command(BaseCommand):
+    help = 'Compare thread-pool and async gateway calls against a local fake gateway'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calls', type=int, default=1000, help='Gateway calls per variant (default: 1000)')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=200,
+            help='Calls in flight at once: threads for sync, coroutines for async (default: 200)'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=200,
+            help='Gateway latency per call (default: 200)'
+        )
+
+    def handle(self, *args, **options):
+        calls, concurrency = options['calls'], options['concurrency']
+        if calls < 1 or concurrency < 1:
+            raise CommandError('--calls and --concurrency must be at least 1')
+
+        gateway = FakeGateway(key_secret=KEY_SECRET, faults=FaultConfig(latency=options['latency_ms'] / 1000))
+        server = make_server(gateway, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        # No connection limit below the tested concurrency, so only the I/O model differs
+        with override_settings(
+            RAZORPAY_KEY_ID=KEY_ID,
+            RAZORPAY_KEY_SECRET=KEY_SECRET,
+            RAZORPAY_BASE_URL=base_url,
+            RAZORPAY_POOL_SIZE=concurrency,
+            RAZORPAY_ASYNC_MAX_CONNECTIONS=concurrency,
+        ):
+            self.stdout.write(
+                f"⏱️  {calls} order creates per variant, {concurrency} in flight, "
+                f"{options['latency_ms']:.0f} ms gateway latency..."
+            )
+            sync_elapsed = self._report('Sync (thread pool)', *self._run_sync(calls, concurrency))
+            async_elapsed = self._report('Async (event loop)', *self._run_async(calls, concurrency))
+
+        server.shutdown()
+        server.server_close()
+        if gateway_breaker.metrics()['failures']:
+            self.stdout.write(self.style.WARNING('⚠️  Some calls failed; the fake gateway may be overloaded'))
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Async path: {sync_elapsed / async_elapsed:.1f}x the sync throughput, '
+            f'1 thread instead of {concurrency}'
+        ))
+
+    def _run_sync(self, calls, concurrency):
+        client = get_razorpay_client()
+        call_gateway(client.order.create, data=ORDER_DATA)  # Warm up
+
+        def one_call(_index):
+            started = time.perf_counter()
+            call_gateway(client.order.create, data=ORDER_DATA)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(one_call, range(calls)))
+        return time.perf_counter() - started, latencies
+
+    def _run_async(self, calls, concurrency):
+        async def run():
+            client = get_async_razorpay_client(asyncio.get_running_loop())
+            await call_gateway_async(client.create_order, ORDER_DATA)  # Warm up
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one_call():
+                async with semaphore:
+                    started = time.perf_counter()
+                    await call_gateway_async(client.create_order, ORDER_DATA)
+                    return time.perf_counter() - started
+
+            started = time.perf_counter()
+            latencies = await asyncio.gather(*(one_call() for _ in range(calls)))
+            elapsed = time.perf_counter() - started
+            await client.close()
+            return elapsed, latencies
+
+        return asyncio.run(run())
+
+    def _report(self, label, elapsed, latencies):
+        ms = sorted(value * 1000 for value in latencies)
+        self.stdout.write(
+            f'  {label:<20} {len(latencies) / elapsed:8.1f} calls/s   p50 {percentile(ms, 0.5):7.1f} ms   '
+            f'p99 {percentile(ms, 0.99):7.1f} ms   total {elapsed:5.1f}s'
+        )
+        return elapsed
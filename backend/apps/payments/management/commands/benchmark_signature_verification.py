@@ -0,0 +1,80 @@
+"""
+Management command to measure the cost of Razorpay signature verification.
+
+Compares building a razorpay.Client per check (the previous approach) with the
+local HMAC check in apps.payments.utils. Uses throwaway keys, so no Razorpay
+credentials are needed.
+
+Usage:
+    python manage.py benchmark_signature_verification
+    python manage.py benchmark_signature_verification --iterations 50000
+"""
+import hashlib
+import hmac
+import time
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+import razorpay
+from apps.payments import utils
+
+KEY_ID = 'rzp_test_benchmark'
+KEY_SECRET = 'benchmark_key_secret'
+WEBHOOK_SECRET = 'benchmark_webhook_secret'
+
+
+class Command(BaseCommand):
+    help = 'Compare per-call Razorpay client signature checks with local HMAC checks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=10000,
+            help='Verifications per variant (default: 10000)'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        order_id, payment_id = 'order_BENCH0000000001', 'pay_BENCH0000000001'
+        signature = hmac.new(
+            KEY_SECRET.encode(), f'{order_id}|{payment_id}'.encode(), hashlib.sha256
+        ).hexdigest()
+        webhook_body = b'{"event": "payment.captured", "payload": {"payment": {"entity": {"id": "pay_x"}}}}'
+        webhook_signature = hmac.new(WEBHOOK_SECRET.encode(), webhook_body, hashlib.sha256).hexdigest()
+
+        def client_per_call():
+            client = razorpay.Client(auth=(KEY_ID, KEY_SECRET))
+            client.utility.verify_payment_signature({
+                'razorpay_order_id': order_id,
+                'razorpay_payment_id': payment_id,
+                'razorpay_signature': signature,
+            })
+
+        def local_payment():
+            assert utils.verify_payment_signature(payment_id, order_id, signature)
+
+        def local_webhook():
+            assert utils.verify_webhook_signature(webhook_body, webhook_signature)
+
+        with override_settings(
+            RAZORPAY_KEY_ID=KEY_ID,
+            RAZORPAY_KEY_SECRET=KEY_SECRET,
+            RAZORPAY_WEBHOOK_SECRET=WEBHOOK_SECRET,
+        ):
+            self.stdout.write(f'🔐 Verifying {iterations} signatures per variant...')
+            baseline = self._measure('Client per call (payment)', client_per_call, iterations)
+            local = self._measure('Local HMAC (payment)', local_payment, iterations)
+            self._measure('Local HMAC (webhook)', local_webhook, iterations)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Local payment verification is {baseline / local:.0f}x faster')
+        )
+
+    def _measure(self, label, func, iterations):
+        func()  # Warm up caches
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        per_call = (time.perf_counter() - started) / iterations * 1_000_000
+        self.stdout.write(f'  {label:<28} {per_call:8.1f} µs/verification')
+        return per_call
@@ -0,0 +1,251 @@
+"""
+Management command to load-test the checkout flow over HTTP.
+
+Each virtual user signs up, adds a product to the cart, places an order,
+creates a payment order, pays at the fake gateway (see run_fake_gateway),
+verifies the payment and posts the signed payment.captured webhook. Users run
+at the requested concurrency; throughput and latency percentiles are
+reported per step.
+
+The app must run with RAZORPAY_BASE_URL pointing at the fake gateway, and
+this command needs the same RAZORPAY_KEY_SECRET and RAZORPAY_WEBHOOK_SECRET.
+Every run creates real users, orders and payments in the app's database.
+
+Usage:
+    python manage.py loadtest_checkout --users 200 --concurrency 20
+    python manage.py loadtest_checkout --base-url http://127.0.0.1:8000 --gateway-url http://127.0.0.1:9000
+    python manage.py loadtest_checkout --product <uuid> --product <uuid>
+    python manage.py loadtest_checkout --async-payments   # App served by uvicorn
+"""
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import requests
+from apps.payments.fakegateway import webhook_body, webhook_headers
+
+STEPS = ['signup', 'add_to_cart', 'create_order', 'create_payment', 'verify_payment', 'webhook']
+
+CUSTOMER_DETAILS = {'name': 'Load Test', 'email': 'loadtest@example.com', 'phone': '9999999999'}
+SHIPPING_ADDRESS = {
+    'street': '1 Test Street',
+    'city': 'Mumbai',
+    'state': 'Maharashtra',
+    'zipCode': '400001',
+    'country': 'India',
+}
+
+
+class StepFailed(Exception):
+    def __init__(self, step, reason):
+        super().__init__(f'{step}: {reason}')
+        self.step = step
+        self.reason = reason
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Results:
+    """Thread-safe latencies and failures per step."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.failures = defaultdict(Counter)
+        self.completed = 0
+
+    def record(self, step, seconds, failure=None):
+        with self._lock:
+            if failure is None:
+                self.latencies[step].append(seconds)
+            else:
+                self.failures[step][failure] += 1
+
+    def flow_completed(self):
+        with self._lock:
+            self.completed += 1
+
+
+class Command(BaseCommand):
+    help = 'Drive signup → cart → order → payment → webhook against a running app and report latencies'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://127.0.0.1:8000',
+            help='App URL (default: http://127.0.0.1:8000)'
+        )
+        parser.add_argument(
+            '--gateway-url',
+            default='http://127.0.0.1:9000',
+            help='Fake gateway URL (default: http://127.0.0.1:9000)'
+        )
+        parser.add_argument('--users', type=int, default=100, help='Checkout flows to run (default: 100)')
+        parser.add_argument('--concurrency', type=int, default=10, help='Flows run at once (default: 10)')
+        parser.add_argument(
+            '--product',
+            action='append',
+            dest='products',
+            help='Product ID to buy; repeat for several (default: first 5 available products)'
+        )
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds (default: 30)')
+        parser.add_argument(
+            '--async-payments',
+            action='store_true',
+            help='Use the async payment endpoints (/api/payments/async/...) served under ASGI'
+        )
+
+    def handle(self, *args, **options):
+        key_secret = (settings.RAZORPAY_KEY_SECRET or '').strip()
+        webhook_secret = (settings.RAZORPAY_WEBHOOK_SECRET or '').strip()
+        if not key_secret or not webhook_secret:
+            raise CommandError('Set RAZORPAY_KEY_SECRET and RAZORPAY_WEBHOOK_SECRET to the values the app uses')
+        if options['users'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--users and --concurrency must be at least 1')
+
+        self.base_url = options['base_url'].rstrip('/')
+        self.gateway_url = options['gateway_url'].rstrip('/')
+        self.timeout = options['timeout']
+        self.webhook_secret = webhook_secret
+        self.payments_path = '/api/payments/async' if options['async_payments'] else '/api/payments'
+        self.products = options['products'] or self._available_products()
+        self.run_id = uuid.uuid4().hex[:8]
+
+        results = Results()
+        self.stdout.write(
+            f"🚀 Running {options['users']} checkouts at concurrency {options['concurrency']} "
+            f"against {self.base_url} (run {self.run_id})..."
+        )
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(lambda index: self._checkout(index, results), range(options['users'])))
+        elapsed = time.perf_counter() - started
+
+        self._report(results, elapsed, options['users'])
+
+    def _available_products(self):
+        try:
+            response = requests.get(f'{self.base_url}/api/products/', timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise CommandError(f'Could not list products: {e}')
+        products = [product['id'] for product in response.json()[:5]]
+        if not products:
+            raise CommandError('No available products to buy; load some with load_mock_products')
+        return products
+
+    def _call(self, results, step, func):
+        """Time one step; raise StepFailed on an error or unexpected status."""
+        started = time.perf_counter()
+        try:
+            response = func()
+        except requests.RequestException as e:
+            results.record(step, time.perf_counter() - started, type(e).__name__)
+            raise StepFailed(step, type(e).__name__)
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 300:
+            results.record(step, elapsed, f'HTTP {response.status_code}')
+            raise StepFailed(step, response.status_code)
+        results.record(step, elapsed)
+        return response
+
+    def _checkout(self, index, results):
+        api = self.base_url
+        session = requests.Session()
+        post = lambda path, data, **kwargs: session.post(
+            f'{api}{path}',
+            json=data,
+            headers={'X-CSRFToken': session.cookies.get('csrftoken', ''), **kwargs.pop('headers', {})},
+            timeout=self.timeout,
+            **kwargs,
+        )
+        try:
+            self._call(results, 'signup', lambda: post('/api/auth/signup/', {
+                'email': f'loadtest+{self.run_id}-{index}@example.com',
+                'password': 'loadtest-password',
+                'name': f'Load Test {index}',
+            }))
+
+            product_id = random.choice(self.products)
+            self._call(results, 'add_to_cart', lambda: post('/api/cart/', {'productId': product_id, 'quantity': 1}))
+
+            order = self._call(results, 'create_order', lambda: post('/api/orders/', {
+                'items': [{'productId': product_id, 'quantity': '1'}],
+                'customerDetails': CUSTOMER_DETAILS,
+                'shippingAddress': SHIPPING_ADDRESS,
+            }, headers={'Idempotency-Key': str(uuid.uuid4())})).json()
+
+            payment_order = self._call(results, 'create_payment', lambda: post(f'{self.payments_path}/create-order/', {
+                'amount': order['total'],
+                'orderId': order['id'],
+            }, headers={'Idempotency-Key': str(uuid.uuid4())})).json()
+
+            # The customer pays in Razorpay Checkout; webhooks are posted below so they are timed
+            paid = session.post(
+                f"{self.gateway_url}/_fake/orders/{payment_order['paymentOrderId']}/pay",
+                json={'webhook': False},
+                timeout=self.timeout,
+            )
+            paid.raise_for_status()
+            paid = paid.json()
+
+            self._call(results, 'verify_payment', lambda: post(f'{self.payments_path}/verify/', {
+                'paymentId': paid['checkout']['razorpay_payment_id'],
+                'orderId': order['id'],
+                'signature': paid['checkout']['razorpay_signature'],
+            }))
+
+            body = webhook_body('payment.captured', paid['payment'])
+            self._call(results, 'webhook', lambda: requests.post(
+                f'{api}/api/payments/webhook/',
+                data=body,
+                headers=webhook_headers(body, self.webhook_secret),
+                timeout=self.timeout,
+            ))
+        except StepFailed:
+            return
+        except (requests.RequestException, KeyError, ValueError) as e:
+            results.record('gateway_pay', 0, type(e).__name__)
+            return
+        finally:
+            session.close()
+        results.flow_completed()
+
+    def _report(self, results, elapsed, users):
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'step':<16}{'ok':>7}{'failed':>8}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}"
+            f"{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        )
+        for step in STEPS + ['gateway_pay']:
+            latencies = sorted(results.latencies.get(step, []))
+            failures = results.failures.get(step, Counter())
+            if not latencies and not failures:
+                continue
+            ms = [value * 1000 for value in latencies]
+            self.stdout.write(
+                f'{step:<16}{len(latencies):>7}{sum(failures.values()):>8}{len(latencies) / elapsed:>9.1f}'
+                f'{percentile(ms, 0.50):>9.1f}{percentile(ms, 0.90):>9.1f}{percentile(ms, 0.95):>9.1f}'
+                f'{percentile(ms, 0.99):>9.1f}{(ms[-1] if ms else 0):>9.1f}'
+            )
+
+        for step, failures in results.failures.items():
+            reasons = ', '.join(f'{reason} × {count}' for reason, count in failures.most_common())
+            self.stdout.write(self.style.WARNING(f'⚠️  {step}: {reasons}'))
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {results.completed}/{users} checkouts completed in {elapsed:.1f}s '
+            f'({results.completed / elapsed:.1f} checkouts/s)'
+        ))
+        self.stdout.write('  Webhooks are applied by process_webhook_events; run it to drain the queue.')
@@ -0,0 +1,108 @@
+"""
+Management command to apply stored Razorpay webhook events.
+
+The webhook endpoint only stores events; this worker applies them to payments
+and orders in batches, in the order Razorpay created them for each payment.
+Several workers can run side by side.
+
+Usage:
+    python manage.py process_webhook_events
+    python manage.py process_webhook_events --batch-size 200
+    python manage.py process_webhook_events --once
+"""
+import logging
+import signal
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Count
+from django.utils import timezone
+from apps.payments.models import WebhookEvent
+from apps.payments.webhooks import process_batch
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Apply stored Razorpay webhook events to payments and orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Events claimed per batch (default: 100)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when there is nothing to process (default: 1.0)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the currently pending events and exit'
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print event counts by status and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            counts = dict(WebhookEvent.objects.values_list('status').annotate(count=Count('pk')).order_by())
+            for value, label in WebhookEvent.Status.choices:
+                self.stdout.write(f'{label + ":":<11} {counts.get(value, 0)}')
+            return
+
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        batch_size = options['batch_size']
+        total_processed = total_failed = 0
+        next_purge_at = 0
+
+        self.stdout.write(f'🚀 Webhook worker started (batch size {batch_size})')
+
+        while not self._stopping:
+            if time.monotonic() >= next_purge_at:
+                self._purge_processed()
+                next_purge_at = time.monotonic() + 3600
+
+            close_old_connections()
+            claimed, processed, failed = process_batch(batch_size)
+            total_processed += processed
+            total_failed += failed
+            if claimed:
+                logger.info(f"Webhook batch: {claimed} claimed, {processed} processed, {failed} failed")
+
+            if not processed:
+                # Nothing ready, or only events waiting on an earlier event of the same payment
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Webhook worker stopped ({total_processed} processed, {total_failed} failed attempts)'
+            )
+        )
+
+    def _request_stop(self, signum, frame):
+        """Finish the current batch, then exit."""
+        self._stopping = True
+
+    def _purge_processed(self, batch_size=1000):
+        """Delete one batch of processed events older than PAYMENT_WEBHOOK_RETENTION_DAYS."""
+        cutoff = timezone.now() - timedelta(days=settings.PAYMENT_WEBHOOK_RETENTION_DAYS)
+        batch = list(
+            WebhookEvent.objects.filter(status=WebhookEvent.Status.PROCESSED, processed_at__lt=cutoff)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if batch:
+            WebhookEvent.objects.filter(pk__in=batch).delete()
@@ -0,0 +1,122 @@
+"""
+Management command to reconcile stale PENDING payments with the payment gateway.
+
+Each stale payment's gateway order is looked up (in parallel, rate limited,
+with retries). Captured payments are marked successful and their orders paid;
+payments with no attempt that can still succeed after --abandon-after are
+marked failed and their stock released. Point RAZORPAY_BASE_URL at a local
+gateway stand-in to try it without Razorpay.
+
+Usage:
+    python manage.py reconcile_payments
+    python manage.py reconcile_payments --older-than 30 --concurrency 16 --rate 50
+    python manage.py reconcile_payments --dry-run
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.payments.reconciliation import RateLimiter, reconcile_batch, stale_pending_batches
+from apps.payments.utils import get_razorpay_client
+
+
+class Command(BaseCommand):
+    help = 'Look up stale PENDING payments at the gateway and record their outcome'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=15,
+            help='Only reconcile payments pending for at least this many minutes (default: 15)'
+        )
+        parser.add_argument(
+            '--abandon-after',
+            type=int,
+            default=24,
+            help='Mark payments failed after this many hours without a capturable attempt (default: 24)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Payments loaded and written per batch (default: 200)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Parallel gateway requests, at most RAZORPAY_POOL_SIZE (default: 8)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=20,
+            help='Maximum gateway requests per second, 0 for unlimited (default: 20)'
+        )
+        parser.add_argument(
+            '--max-retries',
+            type=int,
+            default=4,
+            help='Retries per payment for timeouts and gateway errors (default: 4)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report outcomes without changing anything'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            client = get_razorpay_client()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        concurrency = options['concurrency']
+        if concurrency > settings.RAZORPAY_POOL_SIZE:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️  Limiting concurrency to RAZORPAY_POOL_SIZE ({settings.RAZORPAY_POOL_SIZE}) keep-alive connections'
+            ))
+            concurrency = settings.RAZORPAY_POOL_SIZE
+
+        now = timezone.now()
+        older_than = now - timedelta(minutes=options['older_than'])
+        abandon_before = now - timedelta(hours=options['abandon_after'])
+        limiter = RateLimiter(options['rate'])
+        totals = {'succeeded': 0, 'failed': 0, 'unchanged': 0, 'errors': 0}
+        started = time.monotonic()
+
+        self.stdout.write(
+            f"🔄 Reconciling payments pending since before {older_than:%Y-%m-%d %H:%M} "
+            f"({concurrency} threads, {options['rate'] or 'unlimited'} req/s)"
+            + (' [dry run]' if options['dry_run'] else '')
+        )
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='reconcile') as executor:
+            for batch in stale_pending_batches(older_than, options['batch_size']):
+                counts = reconcile_batch(
+                    client,
+                    batch,
+                    executor,
+                    limiter,
+                    abandon_before,
+                    max_retries=options['max_retries'],
+                    dry_run=options['dry_run'],
+                )
+                for key, value in counts.items():
+                    totals[key] += value
+                checked = sum(totals.values())
+                self.stdout.write(
+                    f"  {checked} checked: {totals['succeeded']} succeeded, {totals['failed']} failed, "
+                    f"{totals['unchanged']} still pending, {totals['errors']} errors"
+                )
+
+        elapsed = time.monotonic() - started
+        checked = sum(totals.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Reconciled {checked} payments in {elapsed:.1f}s ({checked / elapsed if elapsed else 0:.0f}/s)'
+            )
+        )
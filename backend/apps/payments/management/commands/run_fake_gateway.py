@@ -0,0 +1,117 @@
+"""
+Management command to run a local stand-in for the Razorpay API.
+
+Point the app at it with RAZORPAY_BASE_URL=http://127.0.0.1:9000. Orders are
+paid with POST /_fake/orders/<id>/pay, which returns the checkout signature
+and delivers a signed webhook to --webhook-url. Uses RAZORPAY_KEY_SECRET and
+RAZORPAY_WEBHOOK_SECRET from settings, so signatures verify in the app.
+
+Usage:
+    python manage.py run_fake_gateway
+    python manage.py run_fake_gateway --webhook-url http://127.0.0.1:8000/api/payments/webhook/
+    python manage.py run_fake_gateway --latency-ms 150 --jitter-ms 100 --error-rate 0.05
+"""
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.payments.fakegateway import FakeGateway, FaultConfig, make_server
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake Razorpay gateway with optional latency and error injection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=9000, help='Port to listen on (default: 9000)')
+        parser.add_argument(
+            '--webhook-url',
+            help='App webhook endpoint to deliver payment events to (default: no webhooks)'
+        )
+        parser.add_argument(
+            '--webhook-delay-ms',
+            type=float,
+            default=0,
+            help='Delay before a payment webhook is delivered (default: 0)'
+        )
+        parser.add_argument(
+            '--duplicate-rate',
+            type=float,
+            default=0.0,
+            help='Fraction of webhooks delivered twice, like Razorpay retries (default: 0)'
+        )
+        parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every API request (default: 0)')
+        parser.add_argument('--jitter-ms', type=float, default=0, help='Random extra delay up to this much (default: 0)')
+        parser.add_argument(
+            '--error-rate',
+            type=float,
+            default=0.0,
+            help='Fraction of API requests answered with a 502 gateway error (default: 0)'
+        )
+        parser.add_argument(
+            '--timeout-rate',
+            type=float,
+            default=0.0,
+            help='Fraction of API requests that hang for --hang-seconds (default: 0)'
+        )
+        parser.add_argument(
+            '--hang-seconds',
+            type=float,
+            default=30.0,
+            help='How long hanging requests take to answer (default: 30)'
+        )
+        parser.add_argument(
+            '--trickle-ms',
+            type=float,
+            default=0,
+            help='Delay between the bytes of each API response body (default: 0)'
+        )
+
+    def handle(self, *args, **options):
+        key_secret = (settings.RAZORPAY_KEY_SECRET or '').strip()
+        webhook_secret = (settings.RAZORPAY_WEBHOOK_SECRET or '').strip()
+        if not key_secret:
+            raise CommandError('Set RAZORPAY_KEY_SECRET; the fake gateway signs payments with it')
+        if options['webhook_url'] and not webhook_secret:
+            raise CommandError('Set RAZORPAY_WEBHOOK_SECRET to deliver signed webhooks')
+        for name in ('error_rate', 'timeout_rate', 'duplicate_rate'):
+            if not 0 <= options[name] <= 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be between 0 and 1")
+
+        gateway = FakeGateway(
+            key_secret=key_secret,
+            webhook_secret=webhook_secret,
+            webhook_url=options['webhook_url'],
+            webhook_delay=options['webhook_delay_ms'] / 1000,
+            duplicate_rate=options['duplicate_rate'],
+            faults=FaultConfig(
+                latency=options['latency_ms'] / 1000,
+                jitter=options['jitter_ms'] / 1000,
+                error_rate=options['error_rate'],
+                timeout_rate=options['timeout_rate'],
+                hang=options['hang_seconds'],
+                trickle=options['trickle_ms'] / 1000,
+            ),
+        )
+        server = make_server(gateway, options['host'], options['port'])
+
+        stop = threading.Event()
+        delivery = threading.Thread(target=gateway.deliver_webhooks, args=(stop,), daemon=True)
+        delivery.start()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🧪 Fake Razorpay gateway listening on http://{options['host']}:{options['port']}"
+        ))
+        if options['webhook_url']:
+            self.stdout.write(f"  Webhooks: {options['webhook_url']}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
+            server.server_close()
+            stats = gateway.stats
+            self.stdout.write(
+                f"\n🛑 Stopped: {stats['requests']} API requests, {len(gateway.orders)} orders, "
+                f"{stats['webhooks_sent']} webhooks sent, {stats['webhooks_failed']} failed"
+            )
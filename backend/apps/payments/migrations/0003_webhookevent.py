@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:54
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_payment_razorpay_payment_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('event_id', models.CharField(max_length=100, unique=True)),
+                ('event_type', models.CharField(max_length=100)),
+                ('payment_order_id', models.CharField(blank=True, help_text='Razorpay order ID the event belongs to', max_length=255)),
+                ('body', models.TextField(help_text='Raw, signature-verified request body')),
+                ('event_created_at', models.DateTimeField(help_text='When Razorpay created the event')),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSED', 'Processed'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the event may be (re)tried')),
+                ('last_error', models.TextField(blank=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'payment_webhook_events',
+                'ordering': ['event_created_at', 'received_at'],
+                'indexes': [models.Index(fields=['status', 'event_created_at'], name='payment_web_status_e4ab3a_idx'), models.Index(fields=['payment_order_id', 'event_created_at'], name='payment_web_payment_e468f2_idx')],
+            },
+        ),
+    ]
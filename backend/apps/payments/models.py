@@ -3,6 +3,7 @@ Payment models for Dolce Fiore.
 """
 import uuid
 from django.db import models
+from django.utils import timezone
 from apps.orders.models import Order
 
 
@@ -43,3 +44,41 @@ class Payment(models.Model):
     def __str__(self):
         return f"Payment {self.payment_order_id} - {self.status}"
 
+
+
+class WebhookEvent(models.Model):
+    """
+    Razorpay webhook event, stored as received and processed asynchronously.
+    
+    The raw body is never modified after insert; only the processing fields
+    change. event_id is unique, so gateway retries are stored once.
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        PROCESSED = 'PROCESSED', 'Processed'
+        FAILED = 'FAILED', 'Failed'
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event_id = models.CharField(max_length=100, unique=True)
+    event_type = models.CharField(max_length=100)
+    payment_order_id = models.CharField(max_length=255, blank=True, help_text='Razorpay order ID the event belongs to')
+    body = models.TextField(help_text='Raw, signature-verified request body')
+    event_created_at = models.DateTimeField(help_text='When Razorpay created the event')
+    received_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text='Earliest time the event may be (re)tried')
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'payment_webhook_events'
+        ordering = ['event_created_at', 'received_at']
+        indexes = [
+            models.Index(fields=['status', 'event_created_at']),
+            models.Index(fields=['payment_order_id', 'event_created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} - {self.status}"
@@ -0,0 +1,180 @@
+"""
+Reconciliation of payments left PENDING (tab closed, webhook lost) with the gateway.
+
+Gateway lookups run in a bounded thread pool behind a shared rate limiter and
+retry transient failures with exponential backoff. Results are written per
+batch with one bulk_update, re-checked under a row lock so a payment settled
+meanwhile by the verify endpoint or a webhook is left alone.
+"""
+import logging
+import random
+import threading
+import time
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+import razorpay
+import requests
+from apps.core.circuitbreaker import CircuitOpenError
+from apps.orders.inventory import release_order_stock
+from .models import Payment
+from .utils import call_gateway
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (
+    requests.exceptions.RequestException,
+    razorpay.errors.ServerError,
+    razorpay.errors.GatewayError,
+)
+
+# Gateway payment states that can still turn into a captured payment
+IN_FLIGHT_STATES = {'created', 'authorized'}
+
+
+class RateLimiter:
+    """Spaces calls so that all threads together make at most `rate` calls per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def fetch_gateway_payments(client, payment_order_id, limiter, max_retries=4, base_delay=0.5):
+    """
+    Fetch the gateway's payment attempts for a gateway order.
+
+    Returns:
+        list: Razorpay payment entities
+
+    Raises:
+        Exception: The last error once retries are exhausted
+    """
+    for attempt in range(max_retries + 1):
+        limiter.wait()
+        try:
+            return call_gateway(client.order.payments, payment_order_id).get('items', [])
+        except CircuitOpenError as e:
+            # The gateway is failing; wait for the breaker to probe again
+            if attempt == max_retries:
+                raise
+            time.sleep(e.retry_after)
+        except RETRYABLE_ERRORS:
+            if attempt == max_retries:
+                raise
+            time.sleep(min(base_delay * (2 ** attempt), 30) * random.uniform(0.5, 1.0))
+
+
+def resolve(payment, items, abandon_before):
+    """
+    Decide a pending payment's outcome from its gateway payment attempts.
+
+    Returns:
+        tuple: (Payment.Status, razorpay_payment_id) or None to leave it pending
+    """
+    captured = [item for item in items if item.get('status') == 'captured']
+    if captured:
+        return Payment.Status.SUCCESS, captured[0].get('id')
+
+    # Abandoned: old enough and nothing that could still be captured
+    if payment.created_at < abandon_before and not any(item.get('status') in IN_FLIGHT_STATES for item in items):
+        return Payment.Status.FAILED, items[-1].get('id') if items else None
+    return None
+
+
+def stale_pending_batches(older_than, batch_size):
+    """Yield lists of PENDING payments created before older_than, oldest first (keyset paginated)."""
+    queryset = Payment.objects.filter(status=Payment.Status.PENDING, created_at__lt=older_than).order_by('created_at', 'pk')
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            page = page.filter(Q(created_at__gt=last.created_at) | Q(created_at=last.created_at, pk__gt=last.pk))
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
+
+
+def apply_outcomes(outcomes):
+    """
+    Write reconciled outcomes and settle their orders.
+
+    Args:
+        outcomes: Mapping of payment pk to (status, razorpay_payment_id)
+
+    Returns:
+        list: Payments that were updated
+    """
+    if not outcomes:
+        return []
+
+    now = timezone.now()
+    with transaction.atomic():
+        payments = list(
+            Payment.objects.select_for_update()
+            .select_related('order')
+            .filter(pk__in=list(outcomes), status=Payment.Status.PENDING)
+        )
+        for payment in payments:
+            new_status, razorpay_payment_id = outcomes[payment.pk]
+            payment.status = new_status
+            payment.razorpay_payment_id = razorpay_payment_id or payment.razorpay_payment_id
+            payment.updated_at = now
+
+        Payment.objects.bulk_update(payments, ['status', 'razorpay_payment_id', 'updated_at'])
+
+        for payment in payments:
+            if payment.status == Payment.Status.SUCCESS:
+                payment.order.mark_paid()
+            else:
+                release_order_stock(payment.order)
+    return payments
+
+
+def reconcile_batch(client, batch, executor, limiter, abandon_before, max_retries=4, dry_run=False):
+    """
+    Look up a batch of pending payments at the gateway and apply the outcomes.
+
+    Returns:
+        dict: Counts of succeeded, failed, unchanged and errored payments
+    """
+    def lookup(payment):
+        try:
+            return payment, fetch_gateway_payments(client, payment.payment_order_id, limiter, max_retries), None
+        except Exception as e:
+            return payment, None, e
+
+    outcomes = {}
+    counts = {'succeeded': 0, 'failed': 0, 'unchanged': 0, 'errors': 0}
+    for payment, items, error in executor.map(lookup, batch):
+        if error is not None:
+            logger.warning(f"Could not reconcile payment {payment.payment_order_id}: {type(error).__name__}: {error}")
+            counts['errors'] += 1
+            continue
+        outcome = resolve(payment, items, abandon_before)
+        if outcome is None:
+            counts['unchanged'] += 1
+        else:
+            outcomes[payment.pk] = outcome
+
+    updated = outcomes if dry_run else {payment.pk: None for payment in apply_outcomes(outcomes)}
+    for pk in updated:
+        if outcomes[pk][0] == Payment.Status.SUCCESS:
+            counts['succeeded'] += 1
+        else:
+            counts['failed'] += 1
+    counts['unchanged'] += len(outcomes) - len(updated)
+    return counts
@@ -0,0 +1,138 @@
+"""
+Tests for the payments app.
+"""
+import threading
+import time
+from unittest import mock
+import requests
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from apps.core.circuitbreaker import CircuitBreaker
+from apps.orders.models import Order
+from apps.payments import utils
+from apps.payments.fakegateway import FakeGateway, FaultConfig, make_server
+from apps.users.models import User
+
+KEY_ID = 'rzp_test_fakegateway'
+KEY_SECRET = 'fake_key_secret'
+ORDER_DATA = {'amount': 50000, 'currency': 'INR', 'receipt': 'order_TEST'}
+
+
+class CallGatewayDeadlineTests(SimpleTestCase):
+    """call_gateway() returns within PAYMENT_GATEWAY_DEADLINE however slowly the gateway answers."""
+
+    deadline = 1.0
+
+    def setUp(self):
+        self.gateway = FakeGateway(key_secret=KEY_SECRET)
+        self.server = make_server(self.gateway, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        settings = override_settings(
+            RAZORPAY_KEY_ID=KEY_ID,
+            RAZORPAY_KEY_SECRET=KEY_SECRET,
+            RAZORPAY_BASE_URL=f'http://127.0.0.1:{self.server.server_port}',
+            RAZORPAY_CONNECT_TIMEOUT=0.5,
+            RAZORPAY_READ_TIMEOUT=0.5,
+            PAYMENT_GATEWAY_DEADLINE=self.deadline,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        breaker = mock.patch.object(utils, 'gateway_breaker', CircuitBreaker('test', utils.GATEWAY_FAILURES))
+        breaker.start()
+        self.addCleanup(breaker.stop)
+
+    def create_order(self):
+        started = time.monotonic()
+        try:
+            return utils.call_gateway(utils.get_razorpay_client().order.create, data=ORDER_DATA)
+        finally:
+            self.elapsed = time.monotonic() - started
+
+    def test_fast_gateway(self):
+        order = self.create_order()
+        self.assertTrue(order['id'].startswith('order_'))
+        self.assertEqual(order['amount'], 50000)
+
+    def test_trickled_response_stops_at_deadline(self):
+        # Each byte arrives well within the read timeout, but the body takes ~10 seconds
+        self.gateway.faults = FaultConfig(trickle=0.05)
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.create_order()
+        self.assertLess(self.elapsed, self.deadline + 0.25)
+
+    def test_slow_response_stops_at_deadline(self):
+        # 0.4 seconds before the headers, then 0.05 seconds per byte
+        self.gateway.faults = FaultConfig(latency=0.4, trickle=0.05)
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.create_order()
+        self.assertLess(self.elapsed, self.deadline + 0.25)
+
+    def test_hung_gateway_stops_at_deadline(self):
+        self.gateway.faults = FaultConfig(timeout_rate=1.0, hang=5.0)
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.create_order()
+        self.assertLess(self.elapsed, self.deadline + 0.25)
+
+    def test_timeouts_must_fit_deadline(self):
+        with override_settings(RAZORPAY_READ_TIMEOUT=self.deadline):
+            with self.assertRaises(ImproperlyConfigured):
+                utils.get_razorpay_config()
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class CreatePaymentOrderLockTests(TransactionTestCase):
+    """A payment order request waits a bounded time for one already in progress for the same order."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='buyer@example.com', password='password123', name='Buyer', username='buyer@example.com'
+        )
+        self.order = Order.objects.create(
+            user=self.user,
+            order_number='ORD-LOCK-1',
+            customer_name='Buyer',
+            customer_email='buyer@example.com',
+            customer_phone='9999999999',
+            shipping_street='1 Test Street',
+            shipping_city='Mumbai',
+            shipping_state='Maharashtra',
+            shipping_zip_code='400001',
+        )
+        self.client.force_login(self.user)
+
+    def hold_order_lock(self, locked, release):
+        """Lock the order row from another connection, as a request calling the gateway would."""
+        try:
+            with transaction.atomic():
+                Order.objects.select_for_update().get(pk=self.order.pk)
+                locked.set()
+                release.wait(10)
+        finally:
+            connection.close()
+
+    @override_settings(PAYMENT_ORDER_LOCK_TIMEOUT=0.5, PAYMENT_GATEWAY_DEADLINE=3)
+    def test_lock_wait_is_bounded(self):
+        locked, release = threading.Event(), threading.Event()
+        holder = threading.Thread(target=self.hold_order_lock, args=(locked, release))
+        holder.start()
+        self.addCleanup(holder.join)
+        self.addCleanup(release.set)
+        self.assertTrue(locked.wait(5))
+
+        started = time.monotonic()
+        response = self.client.post(
+            '/api/payments/create-order/',
+            {'amount': '500.00', 'orderId': str(self.order.pk)},
+            content_type='application/json',
+        )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertLess(elapsed, 2)
+        self.assertFalse(self.order.payments.exists())
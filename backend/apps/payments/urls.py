@@ -6,7 +6,9 @@ from .views import (
     create_payment_order_view,
     verify_payment_view,
     webhook_handler_view,
+    gateway_status_view,
 )
+from .async_views import create_payment_order_async_view, verify_payment_async_view
 
 app_name = 'payments'
 
@@ -14,5 +16,9 @@ urlpatterns = [
     path('create-order/', create_payment_order_view, name='create-order'),
     path('verify/', verify_payment_view, name='verify'),
     path('webhook/', webhook_handler_view, name='webhook'),
+    path('gateway-status/', gateway_status_view, name='gateway-status'),
+    # Async variants for ASGI deployments
+    path('async/create-order/', create_payment_order_async_view, name='async-create-order'),
+    path('async/verify/', verify_payment_async_view, name='async-verify'),
 ]
 
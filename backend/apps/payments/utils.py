@@ -1,91 +1,292 @@
 """
 Utilities for Razorpay payment integration.
+
+The Razorpay client is created once per process and reused, so API calls share
+a pooled keep-alive HTTP session instead of opening a new connection each time.
+Signature checks only need an HMAC of the payload and are done locally.
+
+call_gateway() gives each call a wall-clock deadline. requests' connect and
+read timeouts apply to each socket operation, so a gateway that trickles its
+response could otherwise hold a worker far longer; the call runs on a small
+per-process thread pool and the caller stops waiting when the deadline passes.
 """
-import razorpay
+import asyncio
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+import aiohttp
+import razorpay
+import requests
+from requests.adapters import HTTPAdapter
+from apps.core.circuitbreaker import CircuitBreaker
 
+RazorpayConfig = namedtuple('RazorpayConfig', [
+    'key_id',
+    'key_secret',
+    'webhook_secret',
+    'base_url',
+    'connect_timeout',
+    'read_timeout',
+    'pool_size',
+])
 
-def get_razorpay_client():
+# Errors that mean the gateway is unhealthy; 4xx responses (BadRequestError) do not count
+GATEWAY_FAILURES = (
+    requests.exceptions.RequestException,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    razorpay.errors.ServerError,
+    razorpay.errors.GatewayError,
+)
+
+gateway_breaker = CircuitBreaker(
+    'razorpay',
+    failure_exceptions=GATEWAY_FAILURES,
+    failure_rate=settings.PAYMENT_GATEWAY_BREAKER_FAILURE_RATE,
+    minimum_calls=settings.PAYMENT_GATEWAY_BREAKER_MINIMUM_CALLS,
+    window_size=settings.PAYMENT_GATEWAY_BREAKER_WINDOW_SIZE,
+    window_seconds=settings.PAYMENT_GATEWAY_BREAKER_WINDOW_SECONDS,
+    reset_timeout=settings.PAYMENT_GATEWAY_BREAKER_RESET_TIMEOUT,
+)
+
+_lock = threading.Lock()
+_config = None
+_client = None
+_client_pid = None
+_executor = None
+_executor_pid = None
+
+
+def get_razorpay_config():
     """
-    Get Razorpay client instance.
-    
+    Get validated Razorpay settings, read once per process.
+
     Returns:
-        razorpay.Client: Configured Razorpay client instance
-    
+        RazorpayConfig: Stripped credentials and HTTP client settings
+
     Raises:
         ValueError: If credentials are not configured
+        ImproperlyConfigured: If connecting and reading may take longer than PAYMENT_GATEWAY_DEADLINE
     """
-    key_id = settings.RAZORPAY_KEY_ID
-    key_secret = settings.RAZORPAY_KEY_SECRET
-    
+    global _config
+    if _config is not None:
+        return _config
+
+    # Strip whitespace from keys (common issue)
+    key_id = (settings.RAZORPAY_KEY_ID or '').strip()
+    key_secret = (settings.RAZORPAY_KEY_SECRET or '').strip()
+
     if not key_id or not key_secret:
         raise ValueError(
             "Razorpay credentials not configured. "
             "Please set RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET environment variables."
         )
-    
-    # Strip whitespace from keys (common issue)
-    key_id = key_id.strip()
-    key_secret = key_secret.strip()
-    
+
     # Basic validation - Razorpay keys have specific formats
     if not key_id.startswith('rzp_'):
         raise ValueError(
             f"Invalid RAZORPAY_KEY_ID format. Should start with 'rzp_' (test) or 'rzp_live_' (live). "
             f"Got: {key_id[:10]}..."
         )
-    
-    return razorpay.Client(auth=(key_id, key_secret))
+
+    connect_timeout = settings.RAZORPAY_CONNECT_TIMEOUT
+    read_timeout = settings.RAZORPAY_READ_TIMEOUT
+    if connect_timeout + read_timeout > settings.PAYMENT_GATEWAY_DEADLINE:
+        raise ImproperlyConfigured(
+            f"RAZORPAY_CONNECT_TIMEOUT + RAZORPAY_READ_TIMEOUT ({connect_timeout + read_timeout}s) must not "
+            f"exceed PAYMENT_GATEWAY_DEADLINE ({settings.PAYMENT_GATEWAY_DEADLINE}s)"
+        )
+
+    _config = RazorpayConfig(
+        key_id=key_id,
+        key_secret=key_secret,
+        webhook_secret=(settings.RAZORPAY_WEBHOOK_SECRET or '').strip(),
+        base_url=settings.RAZORPAY_BASE_URL or razorpay.Client.DEFAULTS['base_url'],
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        pool_size=settings.RAZORPAY_POOL_SIZE,
+    )
+    return _config
+
+
+class _TimeoutSession(requests.Session):
+    """
+    Session that applies default connect/read timeouts to every request.
+
+    With a deadline (a time.monotonic() value), the timeouts are cut to the
+    time left and the body is read in small chunks, stopping once the deadline
+    has passed.
+    """
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, deadline=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        if deadline is None:
+            return super().request(method, url, **kwargs)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout('Gateway deadline passed before the request was sent')
+        connect_timeout, read_timeout = kwargs['timeout']
+        kwargs['timeout'] = (min(connect_timeout, remaining), min(read_timeout, remaining))
+        kwargs['stream'] = True
+
+        response = super().request(method, url, **kwargs)
+        body = bytearray()
+        try:
+            for chunk in response.iter_content(128):
+                body += chunk
+                if time.monotonic() > deadline:
+                    raise requests.exceptions.ReadTimeout('Gateway deadline passed while reading the response')
+        finally:
+            response.close()
+        response._content = bytes(body)
+        return response
+
+
+def get_razorpay_client():
+    """
+    Get the process-wide Razorpay client instance.
+
+    The client is thread-safe for API calls: its session keeps up to
+    RAZORPAY_POOL_SIZE keep-alive connections. A new client is built after a
+    fork so worker processes never share sockets.
+
+    Returns:
+        razorpay.Client: Configured Razorpay client instance
+
+    Raises:
+        ValueError: If credentials are not configured
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _lock:
+        if _client is None or _client_pid != pid:
+            config = get_razorpay_config()
+            session = _TimeoutSession(timeout=(config.connect_timeout, config.read_timeout))
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _client = razorpay.Client(
+                session=session,
+                auth=(config.key_id, config.key_secret),
+                base_url=config.base_url,
+            )
+            _client_pid = pid
+    return _client
+
+
+def _get_executor():
+    """Thread pool that runs gateway calls, one per process (RAZORPAY_POOL_SIZE threads)."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+
+    pool_size = get_razorpay_config().pool_size
+    with _lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='razorpay')
+            _executor_pid = pid
+    return _executor
+
+
+def call_gateway(operation, *args, deadline=None, **kwargs):
+    """
+    Call a Razorpay client method through the circuit breaker with a deadline.
+
+    The caller waits at most `deadline` seconds in total, however slowly the
+    gateway connects or sends its response. A call still running at the
+    deadline is abandoned; it stops on its own shortly after.
+
+    Args:
+        operation: Bound client method, e.g. client.order.create
+        deadline: Seconds the whole call may take (default: PAYMENT_GATEWAY_DEADLINE)
+
+    Raises:
+        CircuitOpenError: If the gateway is failing and the call was not made
+        requests.exceptions.Timeout: If the deadline passed
+    """
+    get_razorpay_config()
+    deadline = deadline or settings.PAYMENT_GATEWAY_DEADLINE
+    with gateway_breaker.guard():
+        expires = time.monotonic() + deadline
+        future = _get_executor().submit(operation, *args, deadline=expires, **kwargs)
+        try:
+            return future.result(timeout=max(0, expires - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            raise requests.exceptions.Timeout(f'Gateway call exceeded its {deadline}s deadline')
+
+
+@receiver(setting_changed)
+def _reset_razorpay_client(setting, **kwargs):
+    """Drop the cached settings, client and thread pool when gateway settings change (e.g. in tests)."""
+    global _config, _client, _executor
+    if setting.startswith('RAZORPAY_') or setting == 'PAYMENT_GATEWAY_DEADLINE':
+        with _lock:
+            _config = None
+            _client = None
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+                _executor = None
+
+
+def _signature_matches(secret, message, signature):
+    if not secret or not isinstance(signature, str):
+        return False
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    expected = hmac.new(secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected.encode('ascii'), signature.encode('utf-8'))
 
 
 def verify_payment_signature(payment_id, order_id, signature):
     """
     Verify Razorpay payment signature.
-    
+
     Args:
         payment_id (str): Razorpay payment ID
         order_id (str): Razorpay order ID
         signature (str): Payment signature from Razorpay
-    
+
     Returns:
         bool: True if signature is valid, False otherwise
     """
     try:
-        client = get_razorpay_client()
-        params = {
-            'razorpay_order_id': order_id,
-            'razorpay_payment_id': payment_id,
-            'razorpay_signature': signature,
-        }
-        client.utility.verify_payment_signature(params)
-        return True
-    except razorpay.errors.SignatureVerificationError:
-        return False
-    except Exception:
+        secret = get_razorpay_config().key_secret
+    except ValueError:
         return False
+    return _signature_matches(secret, f'{order_id}|{payment_id}', signature)
 
 
 def verify_webhook_signature(payload, signature):
     """
     Verify Razorpay webhook signature.
-    
+
     Args:
         payload (bytes): Raw webhook payload
         signature (str): Webhook signature from Razorpay
-    
+
     Returns:
         bool: True if signature is valid, False otherwise
     """
     try:
-        webhook_secret = settings.RAZORPAY_WEBHOOK_SECRET
-        if not webhook_secret:
-            return False
-        
-        client = get_razorpay_client()
-        client.utility.verify_webhook_signature(payload, signature, webhook_secret)
-        return True
-    except razorpay.errors.SignatureVerificationError:
+        secret = get_razorpay_config().webhook_secret
+    except ValueError:
         return False
-    except Exception:
-        return False
-
+    return _signature_matches(secret, payload, signature)
@@ -1,25 +1,37 @@
 """
 Views for payments app.
 """
-import json
 import logging
+import math
 from decimal import Decimal
-from django.db import transaction
+from django.db import OperationalError, connection, transaction
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
+import requests
+from apps.core.circuitbreaker import CircuitOpenError
+from apps.core.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
+from apps.orders.inventory import reserve_order_stock, release_order_stock
 from apps.orders.models import Order
+from apps.products.inventory import InsufficientStock
 from .models import Payment
 from .serializers import (
     PaymentOrderRequestSerializer,
     PaymentOrderResponseSerializer,
     PaymentVerificationRequestSerializer,
 )
-from .utils import get_razorpay_client, verify_payment_signature, verify_webhook_signature
+from .utils import (
+    call_gateway,
+    gateway_breaker,
+    get_razorpay_client,
+    verify_payment_signature,
+    verify_webhook_signature,
+)
+from .webhooks import record_event
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +40,16 @@ logger = logging.getLogger(__name__)
     tags=['Payments'],
     summary='Create payment order',
     request=PaymentOrderRequestSerializer,
-    responses={201: PaymentOrderResponseSerializer, 400: {'description': 'Invalid request'}},
+    responses={
+        201: PaymentOrderResponseSerializer,
+        400: {'description': 'Invalid request'},
+        409: {'description': 'Another request is creating a payment for this order; retry after Retry-After seconds'},
+    },
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
 )
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def create_payment_order_view(request):
     """Create Razorpay payment order."""
     serializer = PaymentOrderRequestSerializer(data=request.data)
@@ -54,27 +72,82 @@ def create_payment_order_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Verify order exists and belongs to the user
-    # Use select_for_update to handle race conditions
+    # Payment order creation runs one request at a time per order: the row lock
+    # makes a concurrent "Pay" click wait here until the first request commits,
+    # then find and reuse its pending payment instead of creating a second
+    # gateway order. The wait is bounded by PAYMENT_ORDER_LOCK_TIMEOUT.
     try:
-        order = Order.objects.select_related('user').get(id=order_id, user=request.user)
-    except Order.DoesNotExist:
-        logger.warning(f"Order not found: {order_id} for user {request.user.id}")
+        with transaction.atomic():
+            try:
+                order = _lock_order(order_id, request.user)
+            except Order.DoesNotExist:
+                logger.warning(f"Order not found: {order_id} for user {request.user.id}")
+                return Response(
+                    {'error': 'Order not found', 'orderId': str(order_id)},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            # Check if order already has a pending payment
+            existing_payment = Payment.objects.filter(
+                order=order,
+                status=Payment.Status.PENDING
+            ).first()
+            
+            if existing_payment:
+                # Return existing payment order
+                response_serializer = PaymentOrderResponseSerializer(existing_payment)
+                return Response(response_serializer.data, status=status.HTTP_200_OK)
+            
+            return _create_gateway_payment(order, amount, currency)
+    except OperationalError as e:
+        if not _is_lock_timeout(e):
+            raise
+        logger.warning(f"Payment order for order {order_id} is still being created by another request")
         return Response(
-            {'error': 'Order not found', 'orderId': str(order_id)},
-            status=status.HTTP_404_NOT_FOUND
+            {'error': 'A payment for this order is already being created', 'details': 'Please try again shortly'},
+            status=status.HTTP_409_CONFLICT,
+            headers={'Retry-After': str(max(1, math.ceil(settings.PAYMENT_GATEWAY_DEADLINE)))},
+        )
+
+
+def _lock_order(order_id, user):
+    """
+    Lock the user's order row for the current transaction.
+
+    On PostgreSQL the wait for a lock held by another request is limited to
+    PAYMENT_ORDER_LOCK_TIMEOUT seconds; past that the query fails with a lock
+    timeout (see _is_lock_timeout). Later statements use the default again.
+    """
+    if connection.vendor != 'postgresql':
+        return Order.objects.select_for_update().get(id=order_id, user=user)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('lock_timeout', %s, true)",
+            [f'{math.ceil(settings.PAYMENT_ORDER_LOCK_TIMEOUT * 1000)}ms']
+        )
+        order = Order.objects.select_for_update().get(id=order_id, user=user)
+        cursor.execute('SET LOCAL lock_timeout TO DEFAULT')
+    return order
+
+
+def _is_lock_timeout(error):
+    """Whether a database error is PostgreSQL's lock_not_available (lock_timeout expired)."""
+    cause = error.__cause__
+    return (getattr(cause, 'pgcode', None) or getattr(cause, 'sqlstate', None)) == '55P03'
+
+
+def _create_gateway_payment(order, amount, currency):
+    """Reserve stock, create the Razorpay order and record the pending payment. Runs under the order lock."""
+    # Re-take stock released by an earlier failed or expired payment attempt
+    try:
+        with transaction.atomic():
+            reserve_order_stock(order)
+    except InsufficientStock:
+        return Response(
+            {'error': 'Some items in this order are no longer in stock'},
+            status=status.HTTP_409_CONFLICT
         )
-    
-    # Check if order already has a pending payment
-    existing_payment = Payment.objects.filter(
-        order=order,
-        status=Payment.Status.PENDING
-    ).first()
-    
-    if existing_payment:
-        # Return existing payment order
-        response_serializer = PaymentOrderResponseSerializer(existing_payment)
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
     
     try:
         # Create Razorpay order
@@ -105,9 +178,23 @@ def create_payment_order_view(request):
             logger.debug(f"Razorpay order data: {razorpay_order_data}")
             logger.debug(f"Using Razorpay Key ID: {settings.RAZORPAY_KEY_ID[:15]}..." if settings.RAZORPAY_KEY_ID else "Key ID NOT SET")
             
-            razorpay_order = client.order.create(data=razorpay_order_data)
+            razorpay_order = call_gateway(client.order.create, data=razorpay_order_data)
             razorpay_order_id = razorpay_order['id']
             logger.info(f"Razorpay order created successfully: {razorpay_order_id}")
+        except CircuitOpenError as e:
+            # Fail fast instead of holding a worker while the gateway is down
+            logger.warning(f"Razorpay order not created: {e}")
+            return Response(
+                {'error': 'Payment gateway temporarily unavailable', 'details': 'Please try again shortly'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(max(1, math.ceil(e.retry_after)))},
+            )
+        except requests.exceptions.Timeout:
+            logger.error(f"Razorpay order create exceeded {settings.PAYMENT_GATEWAY_DEADLINE}s deadline")
+            return Response(
+                {'error': 'Payment gateway timed out', 'details': 'Please try again shortly'},
+                status=status.HTTP_504_GATEWAY_TIMEOUT
+            )
         except Exception as e:
             error_type = type(e).__name__
             error_msg = str(e)
@@ -266,6 +353,7 @@ def verify_payment_view(request):
     if not is_valid:
         payment.status = Payment.Status.FAILED
         payment.save()
+        release_order_stock(order)
         return Response(
             {'error': 'Payment verification failed'},
             status=status.HTTP_400_BAD_REQUEST
@@ -278,9 +366,8 @@ def verify_payment_view(request):
         payment.status = Payment.Status.SUCCESS
         payment.save()
         
-        # Update order status to PAID
-        order.status = Order.Status.PAID
-        order.save()
+        # Update order status to PAID (queues the payment receipt email)
+        order.mark_paid()
     
     return Response(
         {'message': 'Payment verified successfully', 'paymentId': payment_id},
@@ -291,9 +378,13 @@ def verify_payment_view(request):
 @extend_schema(
     tags=['Payments'],
     summary='Razorpay webhook handler',
+    description=(
+        'Verifies the signature and stores the event for the process_webhook_events worker. '
+        'Responds as soon as the event is stored; repeated deliveries of an event are ignored.'
+    ),
     request={'application/json': {}},
     responses={
-        200: {'description': 'Webhook processed successfully'},
+        200: {'description': 'Webhook received'},
         400: {'description': 'Invalid webhook'},
     },
 )
@@ -301,7 +392,7 @@ def verify_payment_view(request):
 @api_view(['POST'])
 @permission_classes([])  # No authentication required for webhooks
 def webhook_handler_view(request):
-    """Handle Razorpay webhook events."""
+    """Verify and store a Razorpay webhook event for asynchronous processing."""
     # Get webhook signature from headers
     webhook_signature = request.headers.get('X-Razorpay-Signature', '')
     
@@ -326,63 +417,25 @@ def webhook_handler_view(request):
         )
     
     try:
-        # Parse webhook payload
-        event_data = json.loads(payload.decode('utf-8'))
-        event_type = event_data.get('event')
-        payload_data = event_data.get('payload', {}).get('payment', {}).get('entity', {})
-        
-        if not payload_data:
-            logger.warning(f"Webhook event {event_type} has no payment entity")
-            return Response({'message': 'No payment entity in webhook'}, status=status.HTTP_200_OK)
-        
-        payment_id = payload_data.get('id')
-        order_id = payload_data.get('order_id')
-        status_value = payload_data.get('status')
-        
-        if not payment_id or not order_id:
-            logger.warning(f"Webhook missing payment_id or order_id: {event_data}")
-            return Response({'message': 'Missing payment information'}, status=status.HTTP_200_OK)
-        
-        # Find payment record by Razorpay order ID
-        try:
-            payment = Payment.objects.get(payment_order_id=order_id)
-        except Payment.DoesNotExist:
-            logger.warning(f"Payment not found for order_id: {order_id}")
-            return Response({'message': 'Payment not found'}, status=status.HTTP_200_OK)
-        
-        # Handle idempotency - check if we've already processed this payment
-        if payment.razorpay_payment_id == payment_id and payment.webhook_received:
-            logger.info(f"Webhook already processed for payment {payment_id}")
-            return Response({'message': 'Webhook already processed'}, status=status.HTTP_200_OK)
-        
-        # Process webhook event
-        with transaction.atomic():
-            payment.razorpay_payment_id = payment_id
-            payment.webhook_received = True
-            
-            if event_type == 'payment.captured' and status_value == 'captured':
-                payment.status = Payment.Status.SUCCESS
-                payment.order.status = Order.Status.PAID
-                payment.order.save()
-            elif event_type == 'payment.failed':
-                payment.status = Payment.Status.FAILED
-                # Keep order status as PLACED to allow retry
-            
-            payment.save()
-        
-        logger.info(f"Webhook processed: {event_type} for payment {payment_id}")
-        return Response({'message': 'Webhook processed successfully'}, status=status.HTTP_200_OK)
-    
-    except json.JSONDecodeError:
+        record_event(payload, event_id=request.headers.get('X-Razorpay-Event-Id'))
+    except (ValueError, UnicodeDecodeError):
         logger.error("Invalid JSON in webhook payload")
         return Response(
             {'error': 'Invalid JSON payload'},
             status=status.HTTP_400_BAD_REQUEST
         )
-    except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
-        return Response(
-            {'error': 'Error processing webhook'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    
+    return Response({'message': 'Webhook received'}, status=status.HTTP_200_OK)
+
 
+@extend_schema(
+    tags=['Payments'],
+    summary='Payment gateway circuit breaker status',
+    description='State and counters of the gateway circuit breaker in the worker process that served the request.',
+    responses={200: {'description': 'Circuit breaker metrics'}},
+)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def gateway_status_view(request):
+    """Return payment gateway circuit breaker metrics (staff only)."""
+    return Response(gateway_breaker.metrics(), status=status.HTTP_200_OK)
@@ -0,0 +1,175 @@
+"""
+Asynchronous processing of Razorpay webhook events.
+
+The webhook endpoint only verifies the signature and stores the event with
+record_event(). The process_webhook_events management command applies stored
+events to payments and orders in batches, in the order Razorpay created them,
+never running a payment's events out of order or concurrently.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.core.outbox import retry_delay
+from apps.orders.inventory import release_order_stock
+from .models import Payment, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _payment_entity(data):
+    return data.get('payload', {}).get('payment', {}).get('entity', {}) or {}
+
+
+def record_event(body, event_id=None):
+    """
+    Store a verified webhook body. Duplicate deliveries of an event are ignored.
+    
+    Args:
+        body (bytes): Raw request body
+        event_id (str): X-Razorpay-Event-Id header; a hash of the body is used if missing
+    
+    Raises:
+        ValueError: If the body is not a JSON object
+    """
+    text = body.decode('utf-8')
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError('Webhook body must be a JSON object')
+    
+    created = data.get('created_at')
+    event_created_at = (
+        datetime.fromtimestamp(created, tz=dt_timezone.utc) if isinstance(created, (int, float)) else timezone.now()
+    )
+    payment_order_id = (
+        _payment_entity(data).get('order_id')
+        or data.get('payload', {}).get('order', {}).get('entity', {}).get('id')
+        or ''
+    )
+    
+    # One INSERT ... ON CONFLICT DO NOTHING, so retries from the gateway cost a single query
+    WebhookEvent.objects.bulk_create([
+        WebhookEvent(
+            event_id=event_id or hashlib.sha256(body).hexdigest(),
+            event_type=str(data.get('event', ''))[:100],
+            payment_order_id=str(payment_order_id)[:255],
+            body=text,
+            event_created_at=event_created_at,
+        )
+    ], ignore_conflicts=True)
+
+
+def apply_event(event):
+    """Apply one webhook event to its payment and order. Must run inside transaction.atomic()."""
+    data = json.loads(event.body)
+    entity = _payment_entity(data)
+    payment_id = entity.get('id')
+    
+    if not entity or not payment_id or not event.payment_order_id:
+        logger.info(f"Webhook event {event.event_id} ({event.event_type}) has no payment to update")
+        return
+    
+    try:
+        payment = (
+            Payment.objects.select_for_update()
+            .select_related('order')
+            .get(payment_order_id=event.payment_order_id)
+        )
+    except Payment.DoesNotExist:
+        logger.warning(f"Payment not found for order_id: {event.payment_order_id}")
+        return
+    
+    if payment.status == Payment.Status.SUCCESS:
+        # A later event cannot undo a captured payment (e.g. an earlier attempt's failure)
+        payment.webhook_received = True
+        payment.save(update_fields=['webhook_received', 'updated_at'])
+        return
+    
+    payment.razorpay_payment_id = payment_id
+    payment.webhook_received = True
+    
+    if event.event_type == 'payment.captured' and entity.get('status') == 'captured':
+        payment.status = Payment.Status.SUCCESS
+        payment.order.mark_paid()
+    elif event.event_type == 'payment.failed':
+        payment.status = Payment.Status.FAILED
+        # Keep order status as PLACED to allow retry, but return its stock
+        release_order_stock(payment.order)
+    
+    payment.save()
+    logger.info(f"Webhook processed: {event.event_type} for payment {payment_id}")
+
+
+def _has_earlier_pending(event, exclude):
+    """True if another pending event for the same payment must be applied first."""
+    return (
+        WebhookEvent.objects.filter(payment_order_id=event.payment_order_id, status=WebhookEvent.Status.PENDING)
+        .exclude(pk__in=exclude)
+        .filter(
+            Q(event_created_at__lt=event.event_created_at)
+            | Q(event_created_at=event.event_created_at, received_at__lt=event.received_at)
+        )
+        .exists()
+    )
+
+
+def process_batch(batch_size=100):
+    """
+    Claim and apply up to batch_size pending events.
+    
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED, so several workers
+    can run at once. An event is left pending while an earlier event for the
+    same payment is unprocessed, whether it failed in this batch or is held by
+    another worker.
+    
+    Returns:
+        tuple: (claimed, processed, failed) event counts
+    """
+    processed = failed = 0
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(status=WebhookEvent.Status.PENDING, available_at__lte=timezone.now())
+            .order_by('event_created_at', 'received_at')[:batch_size]
+        )
+        batch_ids = [event.pk for event in events]
+        blocked = set()
+        checked = set()
+        
+        for event in events:
+            key = event.payment_order_id
+            if key and key not in checked:
+                checked.add(key)
+                if _has_earlier_pending(event, batch_ids):
+                    blocked.add(key)
+            if key and key in blocked:
+                continue
+            
+            try:
+                with transaction.atomic():
+                    apply_event(event)
+            except Exception as e:
+                failed += 1
+                event.attempts += 1
+                event.last_error = f'{type(e).__name__}: {e}'[:2000]
+                if event.attempts >= settings.PAYMENT_WEBHOOK_MAX_ATTEMPTS:
+                    logger.error(f"Webhook event {event.event_id} failed permanently: {event.last_error}")
+                    event.status = WebhookEvent.Status.FAILED
+                else:
+                    logger.warning(f"Webhook event {event.event_id} failed on attempt {event.attempts}: {event.last_error}")
+                    event.available_at = timezone.now() + timedelta(seconds=retry_delay(event.attempts))
+                    if key:
+                        blocked.add(key)
+                event.save(update_fields=['attempts', 'last_error', 'status', 'available_at'])
+                continue
+            
+            processed += 1
+            event.status = WebhookEvent.Status.PROCESSED
+            event.processed_at = timezone.now()
+            event.save(update_fields=['status', 'processed_at'])
+    
+    return len(events), processed, failed
@@ -2,7 +2,9 @@
 Admin configuration for products app.
 """
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
+from apps.core.cache import bump_model_version
 from .models import Product, ProductImage, Category, Subcategory, Tag
 
 
@@ -123,7 +125,7 @@ class TagAdmin(admin.ModelAdmin):
 class ProductAdmin(admin.ModelAdmin):
     """User-friendly product admin."""
     inlines = [ProductImageInline]
-    list_display = ['name', 'category', 'subcategory', 'price', 'currency', 'is_available', 'created_at', 'image_preview']
+    list_display = ['name', 'category', 'subcategory', 'price', 'currency', 'is_available', 'stock', 'created_at', 'image_preview']
     list_filter = ['category', 'subcategory', 'is_available', 'tags', 'created_at']
     search_fields = ['name', 'description']
     readonly_fields = ['id', 'created_at', 'updated_at', 'tags_display']
@@ -138,7 +140,7 @@ class ProductAdmin(admin.ModelAdmin):
             'fields': ('price', 'currency', 'weight_grams')
         }),
         ('Tags & Availability', {
-            'fields': ('tags', 'tags_display', 'is_available')
+            'fields': ('tags', 'tags_display', 'is_available', 'stock')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -148,6 +150,17 @@ class ProductAdmin(admin.ModelAdmin):
     
     actions = ['make_available', 'make_unavailable']
     
+    def save_model(self, request, obj, form, change):
+        """Don't write back a stale stock level that checkouts may have changed meanwhile."""
+        if change and 'stock' not in form.changed_data:
+            update_fields = [
+                field.name for field in obj._meta.concrete_fields
+                if not field.primary_key and field.name != 'stock'
+            ]
+            obj.save(update_fields=update_fields)
+        else:
+            super().save_model(request, obj, form, change)
+    
     def tags_display(self, obj):
         """Display tags as comma-separated list."""
         tags = obj.tags.all()
@@ -167,13 +180,15 @@ class ProductAdmin(admin.ModelAdmin):
     
     def make_available(self, request, queryset):
         """Bulk action to mark products as available."""
-        queryset.update(is_available=True)
+        queryset.update(is_available=True, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} product(s) marked as available.')
     make_available.short_description = 'Mark selected products as available'
     
     def make_unavailable(self, request, queryset):
         """Bulk action to mark products as unavailable."""
-        queryset.update(is_available=False)
+        queryset.update(is_available=False, updated_at=timezone.now())
+        bump_model_version(queryset.model)  # update() sends no save signals
         self.message_user(request, f'{queryset.count()} product(s) marked as unavailable.')
     make_unavailable.short_description = 'Mark selected products as unavailable'
 
@@ -0,0 +1,26 @@
+"""
+URL configuration for the async products views, mounted at /api/async/products/.
+
+A separate prefix keeps these routes from shadowing products whose slug
+starts a sync route (e.g. a product with the slug "async").
+"""
+from django.urls import path
+from .async_views import (
+    product_list_async_view,
+    product_detail_async_view,
+    category_list_async_view,
+    subcategory_list_async_view,
+    tag_list_async_view,
+)
+
+app_name = 'products-async'
+
+urlpatterns = [
+    path('', product_list_async_view, name='list'),
+    # Put specific paths before slug pattern to avoid conflicts
+    path('categories/', category_list_async_view, name='categories'),
+    path('categories/<str:category_id>/subcategories/', subcategory_list_async_view, name='subcategories'),
+    path('tags/', tag_list_async_view, name='tags'),
+    # Product detail must be last to avoid catching categories/tags
+    path('<slug:slug>/', product_detail_async_view, name='detail'),
+]
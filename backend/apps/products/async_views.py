@@ -0,0 +1,118 @@
+"""
+Async views for products app.
+
+Async counterparts of the catalog read views for deployments on an ASGI
+server (see config/asgi.py and apps/core/async_api.py). They accept the same
+query parameters and return the same JSON as the DRF views, with queries
+awaited through Django's async ORM. They are not listed in the Swagger docs.
+"""
+import uuid
+from django.db.models import Q
+from apps.core.async_api import alist, async_read_view, json_response
+from apps.core.throttling import CatalogRateThrottle
+from .models import Product, Category, Subcategory, Tag
+from .serializers import (
+    ProductSerializer,
+    CategorySerializer,
+    CategoryWithSubcategoriesSerializer,
+    SubcategorySerializer,
+    TagSerializer,
+)
+
+
+def _products():
+    return Product.objects.select_related('category', 'subcategory__category').prefetch_related('tags', 'images')
+
+
+async def _aget_active(model, id_or_slug):
+    """Get the active row of model with id or slug id_or_slug, or None."""
+    rows = model.objects.filter(is_active=True)
+    try:
+        # Try as UUID first
+        row = await rows.filter(id=uuid.UUID(id_or_slug)).afirst()
+    except ValueError:
+        row = None
+    if row is None:
+        row = await rows.filter(slug=id_or_slug).afirst()
+    return row
+
+
+@async_read_view(CatalogRateThrottle)
+async def product_list_async_view(request):
+    """Get all products with optional filtering (async)."""
+    queryset = _products().filter(is_available=True)
+
+    category = request.GET.get('category')
+    if category:
+        category_obj = await _aget_active(Category, category)
+        if category_obj is not None:
+            queryset = queryset.filter(category=category_obj)
+
+    subcategory = request.GET.get('subcategory')
+    if subcategory:
+        subcategory_obj = await _aget_active(Subcategory, subcategory)
+        if subcategory_obj is not None:
+            queryset = queryset.filter(subcategory=subcategory_obj)
+
+    tag = request.GET.get('tag')
+    if tag:
+        tag_objects = []
+        for tag_value in (t.strip() for t in tag.split(',')):
+            tag_obj = await _aget_active(Tag, tag_value) if tag_value else None
+            if tag_obj is not None:
+                tag_objects.append(tag_obj)
+        if tag_objects:
+            queryset = queryset.filter(tags__in=tag_objects).distinct()
+
+    search = request.GET.get('search')
+    if search:
+        queryset = queryset.filter(Q(name__icontains=search) | Q(description__icontains=search))
+
+    sort = request.GET.get('sort', 'newest')
+    if sort == 'price_low':
+        queryset = queryset.order_by('price')
+    elif sort == 'price_high':
+        queryset = queryset.order_by('-price')
+    else:  # newest
+        queryset = queryset.order_by('-created_at')
+
+    products = await alist(queryset)
+    return json_response(ProductSerializer(products, many=True).data)
+
+
+@async_read_view(CatalogRateThrottle)
+async def product_detail_async_view(request, slug):
+    """Get product by slug (async)."""
+    product = await _products().filter(slug=slug).afirst()
+    if product is None:
+        return json_response({'detail': 'No Product matches the given query.'}, status=404)
+    return json_response(ProductSerializer(product).data)
+
+
+@async_read_view(CatalogRateThrottle)
+async def category_list_async_view(request):
+    """Get all active categories, optionally with nested subcategories (async)."""
+    categories = Category.objects.filter(is_active=True).order_by('order', 'name')
+    if request.GET.get('include') == 'subcategories':
+        categories = await alist(categories.prefetch_related('subcategories'))
+        return json_response(CategoryWithSubcategoriesSerializer(categories, many=True).data)
+    return json_response(CategorySerializer(await alist(categories), many=True).data)
+
+
+@async_read_view(CatalogRateThrottle)
+async def subcategory_list_async_view(request, category_id):
+    """Get all active subcategories for a category (async)."""
+    category = await _aget_active(Category, category_id)
+    if category is None:
+        return json_response({'error': 'Category not found'}, status=404)
+    subcategories = await alist(
+        Subcategory.objects.filter(category=category, is_active=True).select_related('category').order_by('order', 'name')
+    )
+    return json_response(SubcategorySerializer(subcategories, many=True).data)
+
+
+@async_read_view(CatalogRateThrottle)
+async def tag_list_async_view(request):
+    """Get all active tags (async)."""
+    tags = await alist(Tag.objects.filter(is_active=True).order_by('name'))
+    return json_response(TagSerializer(tags, many=True).data)
@@ -0,0 +1,40 @@
+"""
+Contention-safe stock level updates.
+
+Stock is only ever changed with a single conditional UPDATE, never by reading
+the row, changing the value in Python and saving it back. Concurrent checkouts
+for the same product therefore cannot oversell, and no row lock is held longer
+than the UPDATE itself.
+"""
+from django.db.models import F
+from .models import Product
+
+
+class InsufficientStock(Exception):
+    """Raised when a product does not have enough stock left for a reservation."""
+    
+    def __init__(self, product_id, quantity):
+        self.product_id = product_id
+        self.quantity = quantity
+        super().__init__(f'Insufficient stock for product {product_id} (requested {quantity})')
+
+
+def reserve_stock(product_id, quantity):
+    """
+    Take quantity units of a product out of stock.
+    
+    Runs ``UPDATE products SET stock = stock - n WHERE id = ... AND stock >= n``.
+    Products with unlimited stock (stock IS NULL) always succeed.
+    
+    Returns:
+        bool: True if the stock was reserved, False if not enough is left
+    """
+    updated = Product.objects.filter(pk=product_id, stock__gte=quantity).update(stock=F('stock') - quantity)
+    if updated:
+        return True
+    return Product.objects.filter(pk=product_id, stock__isnull=True).exists()
+
+
+def release_stock(product_id, quantity):
+    """Put quantity units of a product back into stock (no-op for unlimited stock)."""
+    Product.objects.filter(pk=product_id, stock__isnull=False).update(stock=F('stock') + quantity)
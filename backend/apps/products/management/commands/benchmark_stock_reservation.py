@@ -0,0 +1,137 @@
+"""
+Management command to benchmark stock reservation under contention.
+
+Creates a temporary product with limited stock and fires many parallel
+checkouts at it, each reserving stock in its own transaction and database
+connection. Verifies that the product is never oversold and reports
+throughput and latency. The temporary product is deleted afterwards.
+
+Run it against PostgreSQL; make sure --concurrency stays below the server's
+max_connections.
+
+Usage:
+    python manage.py benchmark_stock_reservation
+    python manage.py benchmark_stock_reservation --checkouts 1000 --concurrency 80 --stock 250
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.products.inventory import reserve_stock
+from apps.products.models import Category, Subcategory, Product
+
+
+class Command(BaseCommand):
+    help = 'Benchmark contention-safe stock reservation against a single product'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--checkouts',
+            type=int,
+            default=500,
+            help='Total number of checkout attempts (default: 500)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Number of parallel checkouts, one DB connection each (default: 50)'
+        )
+        parser.add_argument(
+            '--stock',
+            type=int,
+            default=100,
+            help='Initial stock of the test product (default: 100)'
+        )
+        parser.add_argument(
+            '--quantity',
+            type=int,
+            default=1,
+            help='Units reserved per checkout (default: 1)'
+        )
+
+    def handle(self, *args, **options):
+        checkouts = options['checkouts']
+        concurrency = options['concurrency']
+        initial_stock = options['stock']
+        quantity = options['quantity']
+
+        suffix = uuid.uuid4().hex[:8]
+        category = Category.objects.create(name=f'Benchmark {suffix}', slug=f'benchmark-{suffix}', is_active=False)
+        subcategory = Subcategory.objects.create(category=category, name='Benchmark', is_active=False)
+        product = Product.objects.create(
+            name=f'Benchmark hamper {suffix}',
+            slug=f'benchmark-hamper-{suffix}',
+            description='Temporary product created by benchmark_stock_reservation',
+            price=1,
+            category=category,
+            subcategory=subcategory,
+            is_available=False,
+            stock=initial_stock,
+        )
+
+        start_barrier = threading.Barrier(min(concurrency, checkouts))
+        latencies = []
+        latencies_lock = threading.Lock()
+
+        def checkout(index):
+            # Line the first wave of workers up so they all hit the row at once
+            if index < start_barrier.parties:
+                start_barrier.wait()
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    succeeded = reserve_stock(product.pk, quantity)
+            finally:
+                elapsed = time.perf_counter() - started
+                with latencies_lock:
+                    latencies.append(elapsed)
+            return succeeded
+
+        close_barrier = threading.Barrier(concurrency)
+
+        def close_connection(index):
+            # The barrier makes every pool thread take exactly one of these tasks
+            close_barrier.wait()
+            connection.close()
+
+        self.stdout.write(
+            f'🏁 {checkouts} checkouts x {quantity} unit(s), {concurrency} in parallel, '
+            f'against stock of {initial_stock}'
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                started = time.perf_counter()
+                results = list(executor.map(checkout, range(checkouts)))
+                elapsed = time.perf_counter() - started
+                # Each pool thread opened its own connection; close them all before the pool exits
+                list(executor.map(close_connection, range(concurrency)))
+
+            product.refresh_from_db()
+        finally:
+            Product.objects.filter(pk=product.pk).delete()
+            subcategory.delete()
+            category.delete()
+
+        succeeded = sum(results)
+        expected = min(checkouts, initial_stock // quantity)
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(f'  Successful reservations: {succeeded} (expected {expected})')
+        self.stdout.write(f'  Rejected (sold out):     {checkouts - succeeded}')
+        self.stdout.write(f'  Final stock:             {product.stock}')
+        self.stdout.write(f'  Throughput:              {checkouts / elapsed:.0f} checkouts/s')
+        self.stdout.write(
+            f'  Latency p50/p95/p99:     {percentile(0.50):.1f} / {percentile(0.95):.1f} / {percentile(0.99):.1f} ms'
+        )
+
+        oversold = product.stock < 0 or succeeded * quantity > initial_stock
+        if oversold or succeeded != expected or product.stock != initial_stock - succeeded * quantity:
+            raise CommandError('❌ Stock accounting is inconsistent - the product was oversold or undersold')
+
+        self.stdout.write(self.style.SUCCESS('✅ No oversell'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_rename_categories_slug_idx_categories_slug_b4303a_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='stock',
+            field=models.PositiveIntegerField(blank=True, help_text='Units available for sale. Leave empty for unlimited stock.', null=True),
+        ),
+    ]
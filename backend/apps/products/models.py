@@ -3,7 +3,12 @@ Product models for Dolce Fiore.
 """
 import uuid
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.text import slugify
+from apps.core.cache import watch_model
+from apps.core.tombstones import track_deletions
 
 
 class Category(models.Model):
@@ -105,6 +110,11 @@ class Product(models.Model):
     subcategory = models.ForeignKey(Subcategory, related_name='products', on_delete=models.PROTECT)
     tags = models.ManyToManyField(Tag, related_name='products', blank=True)
     is_available = models.BooleanField(default=True)
+    stock = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Units available for sale. Leave empty for unlimited stock.'
+    )
     weight_grams = models.IntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -135,6 +145,7 @@ class ProductImage(models.Model):
     image_url = models.URLField()
     order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'product_images'
@@ -144,3 +155,26 @@ class ProductImage(models.Model):
     def __str__(self):
         return f"{self.product.name} - Image {self.order}"
 
+
+
+# Cached catalog responses (e.g. the home page content bundle) are rebuilt when these change
+for model in (Category, Subcategory, Tag, Product, ProductImage):
+    watch_model(model)
+
+# Delta exports find changed rows by updated_at and deleted rows by their tombstones
+for model in (Category, Subcategory, Tag, Product, ProductImage):
+    track_deletions(model)
+
+
+@receiver(m2m_changed, sender=Product.tags.through)
+def touch_products_on_tag_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Changing a product's tags does not save it; bump updated_at so delta exports include it."""
+    now = timezone.now()
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Product.objects.filter(pk=instance.pk).update(updated_at=now)
+    elif action in ('post_add', 'post_remove'):
+        Product.objects.filter(pk__in=pk_set).update(updated_at=now)
+    elif action == 'pre_clear':
+        # The products are not known after the clear
+        instance.products.update(updated_at=now)
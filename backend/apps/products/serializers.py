@@ -43,7 +43,11 @@ class CategoryWithSubcategoriesSerializer(serializers.ModelSerializer):
     @extend_schema_field(serializers.ListField(child=SubcategoryNestedSerializer()))
     def get_subcategories(self, obj) -> List[dict]:
         """Return subcategories as nested array."""
-        subcategories = obj.subcategories.filter(is_active=True).order_by('order', 'name')
+        # Filtered in Python so prefetch_related('subcategories') is used
+        subcategories = sorted(
+            (subcategory for subcategory in obj.subcategories.all() if subcategory.is_active),
+            key=lambda subcategory: (subcategory.order, subcategory.name),
+        )
         return SubcategoryNestedSerializer(subcategories, many=True).data
 
 
@@ -90,7 +94,8 @@ class ProductSerializer(serializers.ModelSerializer):
     @extend_schema_field(serializers.ListField(child=serializers.URLField()))
     def get_images(self, obj) -> List[str]:
         """Return images as array of URLs."""
-        return [img.image_url for img in obj.images.all().order_by('order')]
+        # Ordered by ProductImage.Meta.ordering, so prefetch_related('images') is used
+        return [img.image_url for img in obj.images.all()]
     
     @extend_schema_field(serializers.ListField(child=TagSerializer()))
     def get_tags(self, obj) -> List[dict]:
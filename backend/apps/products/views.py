@@ -2,12 +2,14 @@
 Views for products app.
 """
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from drf_spectacular.utils import extend_schema
+from apps.core.throttling import CatalogRateThrottle
 from .models import Product, Category, Subcategory, Tag
 from .serializers import (
     ProductSerializer,
@@ -25,9 +27,10 @@ from .serializers import (
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
 def product_list_view(request):
     """Get all products with optional filtering."""
-    queryset = Product.objects.filter(is_available=True).select_related('category', 'subcategory').prefetch_related('tags')
+    queryset = Product.objects.filter(is_available=True).select_related('category', 'subcategory__category').prefetch_related('tags', 'images')
     
     # Filter by category (can be ID or slug)
     category = request.query_params.get('category')
@@ -36,7 +39,7 @@ def product_list_view(request):
             # Try as UUID first
             category_obj = Category.objects.get(id=category, is_active=True)
             queryset = queryset.filter(category=category_obj)
-        except (Category.DoesNotExist, ValueError):
+        except (Category.DoesNotExist, ValueError, ValidationError):
             # Try as slug
             try:
                 category_obj = Category.objects.get(slug=category, is_active=True)
@@ -51,7 +54,7 @@ def product_list_view(request):
             # Try as UUID first
             subcategory_obj = Subcategory.objects.get(id=subcategory, is_active=True)
             queryset = queryset.filter(subcategory=subcategory_obj)
-        except (Subcategory.DoesNotExist, ValueError):
+        except (Subcategory.DoesNotExist, ValueError, ValidationError):
             # Try as slug
             try:
                 subcategory_obj = Subcategory.objects.get(slug=subcategory, is_active=True)
@@ -69,7 +72,7 @@ def product_list_view(request):
                 # Try as UUID first
                 tag_obj = Tag.objects.get(id=tag_value, is_active=True)
                 tag_objects.append(tag_obj)
-            except (Tag.DoesNotExist, ValueError):
+            except (Tag.DoesNotExist, ValueError, ValidationError):
                 # Try as slug
                 try:
                     tag_obj = Tag.objects.get(slug=tag_value, is_active=True)
@@ -108,9 +111,10 @@ def product_list_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
 def product_detail_view(request, slug):
     """Get product by slug."""
-    product = get_object_or_404(Product.objects.select_related('category', 'subcategory').prefetch_related('tags'), slug=slug)
+    product = get_object_or_404(Product.objects.select_related('category', 'subcategory__category').prefetch_related('tags', 'images'), slug=slug)
     serializer = ProductSerializer(product)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -123,6 +127,7 @@ def product_detail_view(request, slug):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
 def category_list_view(request):
     """Get all active categories, optionally with nested subcategories."""
     include_subcategories = request.query_params.get('include') == 'subcategories'
@@ -146,12 +151,13 @@ def category_list_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
 def subcategory_list_view(request, category_id):
     """Get all active subcategories for a category."""
     try:
         # Try as UUID first
         category = Category.objects.get(id=category_id, is_active=True)
-    except (Category.DoesNotExist, ValueError):
+    except (Category.DoesNotExist, ValueError, ValidationError):
         # Try as slug
         try:
             category = Category.objects.get(slug=category_id, is_active=True)
@@ -173,6 +179,7 @@ def subcategory_list_view(request, category_id):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([CatalogRateThrottle])
 def tag_list_view(request):
     """Get all active tags."""
     tags = Tag.objects.filter(is_active=True).order_by('name')
@@ -0,0 +1,104 @@
+"""
+Admin configuration for reports app.
+"""
+from datetime import timedelta
+from django.contrib import admin
+from django.db.models import Sum
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .models import DailySalesRollup, ProductSalesRollup, CategorySalesRollup
+
+DEFAULT_DASHBOARD_DAYS = 30
+TOP_N = 10
+
+
+@admin.register(DailySalesRollup)
+class SalesDashboardAdmin(admin.ModelAdmin):
+    """
+    Sales dashboard rendered from the rollup tables only.
+    
+    Every figure is a sum over at most one rollup row per day (per product or
+    category), so the page stays cheap regardless of how many orders exist.
+    """
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+    
+    def changelist_view(self, request, extra_context=None):
+        today = timezone.localdate()
+        end = parse_date(request.GET.get('end') or '') or today
+        start = parse_date(request.GET.get('start') or '') or end - timedelta(days=DEFAULT_DASHBOARD_DAYS - 1)
+        if start > end:
+            start, end = end, start
+        period = {'date__gte': start, 'date__lte': end}
+        
+        days = DailySalesRollup.objects.filter(**period).order_by('-date')
+        totals = days.aggregate(
+            order_count=Sum('order_count'),
+            units_sold=Sum('units_sold'),
+            revenue=Sum('revenue'),
+        )
+        top_products = (
+            ProductSalesRollup.objects.filter(**period)
+            .values('product__name')
+            .annotate(units_sold=Sum('units_sold'), revenue=Sum('revenue'))
+            .order_by('-revenue')[:TOP_N]
+        )
+        top_categories = (
+            CategorySalesRollup.objects.filter(**period)
+            .values('category__name')
+            .annotate(units_sold=Sum('units_sold'), revenue=Sum('revenue'))
+            .order_by('-revenue')[:TOP_N]
+        )
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Sales dashboard',
+            'opts': self.model._meta,
+            'start': start,
+            'end': end,
+            'totals': totals,
+            'days': days,
+            'top_products': top_products,
+            'top_categories': top_categories,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, 'admin/reports/sales_dashboard.html', context)
+
+
+@admin.register(ProductSalesRollup)
+class ProductSalesRollupAdmin(admin.ModelAdmin):
+    """Read-only admin for per-product daily rollups."""
+    list_display = ['date', 'product', 'order_count', 'units_sold', 'revenue']
+    list_filter = ['date']
+    search_fields = ['product__name']
+    list_select_related = ['product']
+    date_hierarchy = 'date'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CategorySalesRollup)
+class CategorySalesRollupAdmin(admin.ModelAdmin):
+    """Read-only admin for per-category daily rollups."""
+    list_display = ['date', 'category', 'order_count', 'units_sold', 'revenue']
+    list_filter = ['date', 'category']
+    list_select_related = ['category']
+    date_hierarchy = 'date'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,102 @@
+"""
+Sales reporting models for Dolce Fiore.
+
+Rollup tables are maintained incrementally as orders are paid, so reports
+never have to aggregate the orders table.
+"""
+from django.db import models
+from apps.core.outbox import enqueue
+from apps.orders.models import Order
+from apps.orders.signals import order_paid
+from apps.products.models import Product, Category
+
+
+class DailySalesRollup(models.Model):
+    """Paid orders, units and revenue per day."""
+    date = models.DateField(unique=True)
+    order_count = models.PositiveIntegerField(default=0)
+    units_sold = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'sales_rollup_daily'
+        ordering = ['-date']
+        verbose_name = 'Sales dashboard'
+        verbose_name_plural = 'Sales dashboard'
+    
+    def __str__(self):
+        return f"{self.date}: {self.order_count} orders"
+
+
+class ProductSalesRollup(models.Model):
+    """Paid orders, units and revenue per product per day."""
+    date = models.DateField()
+    product = models.ForeignKey(Product, related_name='sales_rollups', on_delete=models.CASCADE)
+    order_count = models.PositiveIntegerField(default=0)
+    units_sold = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'sales_rollup_product'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'product'], name='unique_product_rollup_per_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.product_id}: {self.units_sold} units"
+
+
+class CategorySalesRollup(models.Model):
+    """Paid orders, units and revenue per category per day."""
+    date = models.DateField()
+    category = models.ForeignKey(Category, related_name='sales_rollups', on_delete=models.CASCADE)
+    order_count = models.PositiveIntegerField(default=0)
+    units_sold = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'sales_rollup_category'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'category'], name='unique_category_rollup_per_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.category_id}: {self.units_sold} units"
+
+
+class RolledUpOrder(models.Model):
+    """Marker that an order has been added to the rollups, so it is never counted twice."""
+    order = models.OneToOneField(Order, primary_key=True, related_name='sales_rollup', on_delete=models.CASCADE)
+    rolled_up_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'sales_rollup_orders'
+    
+    def __str__(self):
+        return str(self.order_id)
+
+
+class RollupWatermark(models.Model):
+    """Position of the catch-up job in the stream of paid orders."""
+    name = models.CharField(max_length=100, unique=True)
+    value = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'sales_rollup_watermarks'
+    
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+def queue_rollup_for_paid_order(sender, order, **kwargs):
+    """Add a paid order to the rollups from the outbox worker, after the payment commits."""
+    enqueue('reports.apply_paid_order', {'order_id': str(order.pk)})
+
+
+order_paid.connect(queue_rollup_for_paid_order, sender=Order, dispatch_uid='reports_queue_rollup_for_paid_order')
@@ -0,0 +1,13 @@
+"""
+Outbox handlers for reports app.
+"""
+from apps.core.outbox import handler
+from apps.orders.models import Order
+from .rollups import apply_order
+
+
+@handler('reports.apply_paid_order')
+def apply_paid_order(payload):
+    """Add a freshly paid order to the sales rollups."""
+    order = Order.objects.get(pk=payload['order_id'])
+    apply_order(order)
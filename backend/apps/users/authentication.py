@@ -0,0 +1,96 @@
+"""
+Cached API token authentication for users app.
+
+DRF's TokenAuthentication reads the token and its user from the database on
+every request. CachedTokenAuthentication keeps them in a small per-process
+LRU (AUTH_TOKEN_LOCAL_TIMEOUT seconds) in front of the shared cache
+(AUTH_TOKEN_CACHE_TIMEOUT seconds), so an authenticated request usually
+makes no authentication query at all.
+
+Only the token's creation time and the user's fields other than the password
+hash are cached, keyed by a hash of the token; the user's password is read
+from the database if something asks for it.
+
+Entries are dropped when the token is deleted and when its user is saved or
+updated with User.objects.filter(...).update() (deactivation, password or
+permission changes), see users/models.py. Other processes may keep using their
+local entry for up to AUTH_TOKEN_LOCAL_TIMEOUT seconds; without a shared cache
+(REDIS_URL), for up to AUTH_TOKEN_CACHE_TIMEOUT.
+"""
+import hashlib
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from apps.core.lru import LRUCache
+
+_local = LRUCache(maxsize=settings.AUTH_TOKEN_LOCAL_MAXSIZE, timeout=settings.AUTH_TOKEN_LOCAL_TIMEOUT)
+
+
+def _cache_key(key):
+    # Raw token keys are credentials; keep them out of the cache's key space
+    return 'auth:token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def _user_fields():
+    """Attribute names of the user fields that are cached: all but the password hash."""
+    return [field.attname for field in get_user_model()._meta.concrete_fields if field.name != 'password']
+
+
+def get_token(key):
+    """
+    Get the Token with key, with its user loaded, from the caches or the database.
+
+    Returns:
+        Token: New instances the caller may modify, or None if no token has key
+    """
+    cache_key = _cache_key(key)
+    entry = _local.get(cache_key)
+    if entry is None:
+        entry = cache.get(cache_key)
+        if entry is None:
+            token = Token.objects.select_related('user').defer('user__password').filter(key=key).first()
+            if token is None:
+                return None
+            entry = (token.created, tuple(getattr(token.user, name) for name in _user_fields()))
+            cache.set(cache_key, entry, timeout=settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        _local.set(cache_key, entry)
+
+    created, user_values = entry
+    # Built like queryset results, so the password is a deferred field loaded on access
+    user = get_user_model().from_db(Token.objects.db, _user_fields(), user_values)
+    token = Token.from_db(Token.objects.db, ['key', 'user_id', 'created'], [key, user.pk, created])
+    token.user = user
+    return token
+
+
+def invalidate_tokens(keys):
+    """Drop cached lookups of token keys, now and again once the current transaction commits."""
+    cache_keys = [_cache_key(key) for key in keys]
+    if not cache_keys:
+        return
+
+    def delete():
+        for cache_key in cache_keys:
+            _local.delete(cache_key)
+        cache.delete_many(cache_keys)
+
+    # The second delete drops entries re-read from the old rows before the commit
+    delete()
+    transaction.on_commit(delete)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication ("Authorization: Token <key>") with cached token lookups."""
+
+    def authenticate_credentials(self, key):
+        token = get_token(key)
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
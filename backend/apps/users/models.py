@@ -2,10 +2,25 @@
 User models for Dolce Fiore.
 """
 import uuid
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .authentication import invalidate_tokens
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """Update the users, dropping their cached token lookups (update() sends no post_save)."""
+        keys = list(Token.objects.filter(user__in=self).values_list('key', flat=True))
+        rows = super().update(**kwargs)
+        invalidate_tokens(keys)
+        return rows
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
 
 
 class User(AbstractUser):
@@ -14,6 +29,8 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     name = models.CharField(max_length=150)
     
+    objects = UserManager()
+    
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name', 'username']
     
@@ -48,3 +65,18 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
 
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    """Drop cached token lookups of a changed user (deactivation, password change)."""
+    if created or update_fields == frozenset({'last_login'}):
+        # Saved on every login; nothing authentication depends on changed
+        return
+    invalidate_tokens(Token.objects.filter(user=instance).values_list('key', flat=True))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Drop the cached lookup of a deleted (e.g. logged out) token."""
+    invalidate_tokens([instance.key])
@@ -117,3 +117,16 @@ class UpdateProfileSerializer(serializers.Serializer):
     """Serializer for updating profile (phone and shippingAddress only)."""
     phone = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     shippingAddress = ShippingAddressSerializer(required=False, allow_null=True)
+
+
+class CartSummarySerializer(serializers.Serializer):
+    """Serializer for the cart badge (no item rows)."""
+    itemCount = serializers.IntegerField(source='item_count')
+    total = serializers.FloatField()
+
+
+class BootstrapSerializer(serializers.Serializer):
+    """Serializer for everything the frontend needs on start."""
+    user = UserResponseSerializer()
+    profile = ProfileSerializer()
+    cart = CartSummarySerializer()
@@ -0,0 +1,63 @@
+"""
+Tests for the users app.
+"""
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from apps.cart.models import Cart
+from apps.users import authentication
+from apps.users.models import Profile, User
+
+BOOTSTRAP_URL = '/api/auth/bootstrap/'
+
+
+class BootstrapViewQueryTests(TestCase):
+    """The bootstrap endpoint loads the user, profile and cart summary in one query."""
+
+    def setUp(self):
+        cache.clear()
+        authentication._local.clear()
+        self.user = User.objects.create_user(
+            email='guest@example.com', password='password123', name='Guest', username='guest@example.com'
+        )
+        Profile.objects.filter(user=self.user).update(phone='9999999999')
+        Cart.objects.create(user=self.user, item_count=3, total=Decimal('450.00'))
+
+    def get_bootstrap(self, queries, **extra):
+        with self.assertNumQueries(queries):
+            response = self.client.get(BOOTSTRAP_URL, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_token_auth(self):
+        token = Token.objects.create(user=self.user)
+        auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        self.get_bootstrap(2, **auth)  # Token lookup, then cached
+
+        data = self.get_bootstrap(1, **auth)
+        self.assertEqual(data['user']['email'], 'guest@example.com')
+        self.assertEqual(data['profile']['phone'], '9999999999')
+        self.assertEqual(data['cart'], {'itemCount': 3, 'total': 450.0})
+
+    def test_session_auth(self):
+        self.client.force_login(self.user)
+
+        # The session's user lookup (sessions are cached), then the bootstrap query
+        data = self.get_bootstrap(2)
+        self.assertEqual(data['user']['email'], 'guest@example.com')
+        self.assertEqual(data['cart'], {'itemCount': 3, 'total': 450.0})
+
+    def test_without_profile_or_cart(self):
+        Profile.objects.filter(user=self.user).delete()
+        Cart.objects.filter(user=self.user).delete()
+        token = Token.objects.create(user=self.user)
+        auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        self.get_bootstrap(2, **auth)
+
+        data = self.get_bootstrap(1, **auth)
+        self.assertEqual(data['profile']['email'], 'guest@example.com')
+        self.assertIsNone(data['profile']['phone'])
+        self.assertEqual(data['cart'], {'itemCount': 0, 'total': 0.0})
+        self.assertFalse(Profile.objects.filter(user=self.user).exists())
+        self.assertFalse(Cart.objects.filter(user=self.user).exists())
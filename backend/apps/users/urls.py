@@ -2,7 +2,7 @@
 URL configuration for users app.
 """
 from django.urls import path
-from .views import login_view, signup_view, logout_view, profile_view, me_view
+from .views import login_view, signup_view, logout_view, profile_view, me_view, bootstrap_view
 
 app_name = 'users'
 
@@ -11,6 +11,7 @@ urlpatterns = [
     path('signup/', signup_view, name='signup'),
     path('logout/', logout_view, name='logout'),
     path('me/', me_view, name='me'),
+    path('bootstrap/', bootstrap_view, name='bootstrap'),
     path('profile/', profile_view, name='profile'),
 ]
 
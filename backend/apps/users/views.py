@@ -2,11 +2,12 @@
 Views for user authentication.
 """
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth import login, logout
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from apps.core.throttling import LoginRateThrottle, SignupRateThrottle
 from .serializers import (
     UserResponseSerializer,
     SignupSerializer,
@@ -14,6 +15,7 @@ from .serializers import (
     LogoutResponseSerializer,
     ProfileSerializer,
     UpdateProfileSerializer,
+    BootstrapSerializer,
 )
 
 
@@ -25,6 +27,7 @@ from .serializers import (
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle])
 def login_view(request):
     """User login endpoint."""
     serializer = LoginSerializer(data=request.data, context={'request': request})
@@ -44,6 +47,7 @@ def login_view(request):
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([SignupRateThrottle])
 def signup_view(request):
     """User registration endpoint."""
     serializer = SignupSerializer(data=request.data)
@@ -80,6 +84,27 @@ def me_view(request):
     return Response(UserResponseSerializer(request.user).data, status=status.HTTP_200_OK)
 
 
+@extend_schema(
+    tags=['Authentication'],
+    summary='Get Current User, Profile and Cart Summary',
+    description='Everything the frontend needs on start in one request: the user, their profile '
+                'and the item count and total of their cart, read with a single query.',
+    responses={200: BootstrapSerializer},
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bootstrap_view(request):
+    """Get current user with profile and cart summary."""
+    from apps.cart.models import Cart
+    from .models import Profile, User
+    user = User.objects.select_related('profile', 'cart').get(pk=request.user.pk)
+    # Users without a profile or cart yet get empty ones; nothing is created on this read
+    profile = getattr(user, 'profile', None) or Profile(user=user)
+    cart = getattr(user, 'cart', None) or Cart(user=user)
+    serializer = BootstrapSerializer({'user': user, 'profile': profile, 'cart': cart})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     tags=['Authentication'],
     summary='Get User Profile',
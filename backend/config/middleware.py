@@ -2,18 +2,36 @@
 Custom middleware for handling trailing slashes in URLs.
 This ensures that both /url and /url/ point to the same view.
 """
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 
 
 class TrailingSlashMiddleware:
     """
     Middleware that normalizes URLs to always include a trailing slash
     (except for root path) so that /url and /url/ both work the same way.
+
+    Works both sync and async, so under ASGI requests to async views stay on
+    the event loop instead of being switched to a thread here.
     """
+    sync_capable = True
+    async_capable = True
     
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
     
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.normalize(request)
+        return self.get_response(request)
+    
+    async def __acall__(self, request):
+        self.normalize(request)
+        return await self.get_response(request)
+    
+    def normalize(self, request):
         # Normalize the path to always have a trailing slash
         # (except for root path and static/media files)
         path = request.path_info
@@ -35,7 +53,4 @@ class TrailingSlashMiddleware:
                 # Also update PATH_INFO in META for consistency
                 if 'PATH_INFO' in request.META:
                     request.META['PATH_INFO'] = request.path_info
-        
-        response = self.get_response(request)
-        return response
 
@@ -38,6 +38,8 @@ INSTALLED_APPS = [
     'apps.orders',
     'apps.payments',
     'apps.content',
+    'apps.core',
+    'apps.reports',
 ]
 
 MIDDLEWARE = [
@@ -96,9 +98,33 @@ if os.getenv('DB_NAME'):
         }
     }
 
+# Cache - per-process memory by default; set REDIS_URL to share one cache between workers
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'dolce',
+    }
+}
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'dolce',
+        }
+    }
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
+# API token lookups (apps.users.authentication), cached per process and in the shared cache.
+# A token deleted or a user deactivated in another process is still accepted for up to the
+# local timeout (up to the cache timeout without REDIS_URL).
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', '300'))  # Seconds, shared cache
+AUTH_TOKEN_LOCAL_TIMEOUT = int(os.getenv('AUTH_TOKEN_LOCAL_TIMEOUT', '5'))  # Seconds, per process
+AUTH_TOKEN_LOCAL_MAXSIZE = int(os.getenv('AUTH_TOKEN_LOCAL_MAXSIZE', '1024'))  # Tokens per process
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -135,7 +161,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.users.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -143,6 +169,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Rate limits per throttle scope (apps.core.throttling), per user or client IP
+    'DEFAULT_THROTTLE_RATES': {
+        'catalog': os.getenv('THROTTLE_RATE_CATALOG', '300/min'),
+        'contact': os.getenv('THROTTLE_RATE_CONTACT', '5/hour'),
+        'signup': os.getenv('THROTTLE_RATE_SIGNUP', '10/hour'),
+        'login': os.getenv('THROTTLE_RATE_LOGIN', '10/min'),
+    },
+    # Reverse proxies in front of the app; the client IP is taken from X-Forwarded-For
+    # this many hops back. 0 uses the connecting address (no proxy).
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
 # drf-spectacular settings
@@ -186,6 +222,7 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
 ]
 
 # Session cookie settings
@@ -196,6 +233,15 @@ SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_AGE = 86400  # 24 hours
 SESSION_COOKIE_DOMAIN = None  # None allows cookies for current domain
 
+# Sessions are stored in the database and cached per process and in the shared cache
+# (apps.core.sessions). A session deleted (logout) in another process is still accepted for up
+# to the local timeout (up to the cache timeout without REDIS_URL).
+SESSION_ENGINE = 'apps.core.sessions'
+SESSION_CACHE_TIMEOUT = int(os.getenv('SESSION_CACHE_TIMEOUT', '300'))  # Seconds, shared cache
+SESSION_LOCAL_TIMEOUT = int(os.getenv('SESSION_LOCAL_TIMEOUT', '5'))  # Seconds, per process
+SESSION_LOCAL_MAXSIZE = int(os.getenv('SESSION_LOCAL_MAXSIZE', '4096'))  # Sessions per process
+SESSION_CLEAR_BATCH_SIZE = int(os.getenv('SESSION_CLEAR_BATCH_SIZE', '1000'))  # Rows per delete in clearsessions
+
 # CSRF cookie settings
 CSRF_COOKIE_SAMESITE = 'Lax'  # Works with Vite proxy (same-origin)
 CSRF_COOKIE_SECURE = False  # Set to True in production with HTTPS
@@ -211,4 +257,48 @@ APPEND_SLASH = False
 RAZORPAY_KEY_ID = os.getenv('RAZORPAY_KEY_ID', '')
 RAZORPAY_KEY_SECRET = os.getenv('RAZORPAY_KEY_SECRET', '')
 RAZORPAY_WEBHOOK_SECRET = os.getenv('RAZORPAY_WEBHOOK_SECRET', '')
+RAZORPAY_BASE_URL = os.getenv('RAZORPAY_BASE_URL', '')  # Empty uses https://api.razorpay.com
+RAZORPAY_CONNECT_TIMEOUT = float(os.getenv('RAZORPAY_CONNECT_TIMEOUT', '3.05'))
+RAZORPAY_READ_TIMEOUT = float(os.getenv('RAZORPAY_READ_TIMEOUT', '4.95'))  # Connect + read must fit PAYMENT_GATEWAY_DEADLINE
+RAZORPAY_POOL_SIZE = int(os.getenv('RAZORPAY_POOL_SIZE', '10'))  # Keep-alive connections per process
+RAZORPAY_ASYNC_MAX_CONNECTIONS = int(os.getenv('RAZORPAY_ASYNC_MAX_CONNECTIONS', '100'))  # Async client, per process
+
+# Gateway calls from request handlers: total seconds per call, and a circuit breaker (per worker
+# process) that fails fast once too many recent calls failed
+PAYMENT_GATEWAY_DEADLINE = float(os.getenv('PAYMENT_GATEWAY_DEADLINE', '8'))
+# Seconds a payment order request waits for another request creating a payment for the same order
+# (which holds the order's row lock for up to the gateway deadline) before answering 409
+PAYMENT_ORDER_LOCK_TIMEOUT = float(os.getenv('PAYMENT_ORDER_LOCK_TIMEOUT', '10'))
+PAYMENT_GATEWAY_BREAKER_FAILURE_RATE = float(os.getenv('PAYMENT_GATEWAY_BREAKER_FAILURE_RATE', '0.5'))
+PAYMENT_GATEWAY_BREAKER_MINIMUM_CALLS = int(os.getenv('PAYMENT_GATEWAY_BREAKER_MINIMUM_CALLS', '5'))
+PAYMENT_GATEWAY_BREAKER_WINDOW_SIZE = int(os.getenv('PAYMENT_GATEWAY_BREAKER_WINDOW_SIZE', '20'))
+PAYMENT_GATEWAY_BREAKER_WINDOW_SECONDS = int(os.getenv('PAYMENT_GATEWAY_BREAKER_WINDOW_SECONDS', '60'))
+PAYMENT_GATEWAY_BREAKER_RESET_TIMEOUT = int(os.getenv('PAYMENT_GATEWAY_BREAKER_RESET_TIMEOUT', '30'))
+
+# Webhook events are stored by the endpoint and applied by process_webhook_events
+PAYMENT_WEBHOOK_MAX_ATTEMPTS = int(os.getenv('PAYMENT_WEBHOOK_MAX_ATTEMPTS', '8'))
+PAYMENT_WEBHOOK_RETENTION_DAYS = int(os.getenv('PAYMENT_WEBHOOK_RETENTION_DAYS', '90'))  # Processed events are deleted after this
+
+
+# Idempotency-Key handling for order and payment creation (values in seconds)
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', '86400'))  # How long responses are replayable
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', '300'))  # Takeover of keys abandoned mid-request
+IDEMPOTENCY_WAIT_TIMEOUT = int(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT', '10'))  # How long duplicates wait for the in-flight request
+
+# Transactional outbox delivered by `manage.py run_workers`
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+OUTBOX_RETRY_BASE_DELAY = int(os.getenv('OUTBOX_RETRY_BASE_DELAY', '10'))  # Seconds, doubled on every retry
+OUTBOX_RETRY_MAX_DELAY = int(os.getenv('OUTBOX_RETRY_MAX_DELAY', '3600'))  # Seconds
+OUTBOX_RETENTION_DAYS = int(os.getenv('OUTBOX_RETENTION_DAYS', '7'))  # Delivered messages are deleted after this
+
+# Email - sent from outbox handlers, never from request handlers
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@dolcefiore.com')
+
+# Inventory - how long stock stays reserved for an unpaid order (seconds)
+STOCK_RESERVATION_TTL = int(os.getenv('STOCK_RESERVATION_TTL', '1800'))
 
+# Cached read-only API responses (apps.core.cache.cached_view), rebuilt when their models change.
+# The timeout also caps how long other processes serve an old response with a per-process cache.
+VIEW_CACHE_TIMEOUT = int(os.getenv('VIEW_CACHE_TIMEOUT', '300'))  # Seconds a response stays fresh
+VIEW_CACHE_STALE_TIMEOUT = int(os.getenv('VIEW_CACHE_STALE_TIMEOUT', '0'))  # Seconds an old response is served during a rebuild
+VIEW_CACHE_LOCK_TIMEOUT = int(os.getenv('VIEW_CACHE_LOCK_TIMEOUT', '10'))  # Longest wait for another request's rebuild
@@ -37,6 +37,10 @@ urlpatterns = [
     path('api/orders/', include('apps.orders.urls')),
     path('api/payments/', include('apps.payments.urls')),
     path('api/content/', include('apps.content.urls')),
+
+    # Async catalog and content views for ASGI deployments
+    path('api/async/products/', include('apps.products.async_urls')),
+    path('api/async/content/', include('apps.content.async_urls')),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,81 @@
+"""
+Process warmup for the app server (see gunicorn.conf.py).
+
+prepare_process() does the lazy work every process would otherwise repeat on
+its first requests: building the URL resolvers and the fields of every API
+serializer (which fills the models' _meta caches). Run in the gunicorn master
+before workers are forked, the result is shared copy-on-write by all of them.
+
+prime_caches() requests the catalog endpoints in a worker before it accepts
+traffic. That opens the worker's database connection and fills the response
+caches, so the first visitors after a deploy or worker restart are not served
+from a cold process.
+"""
+import logging
+import time
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import get_resolver, resolve
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+# Requested by prime_caches(): the pages every visitor loads first
+WARMUP_PATHS = [
+    '/api/content/bundle/home/',
+    '/api/content/bundle/about/',
+    '/api/products/',
+    '/api/products/categories/?include=subcategories',
+    '/api/products/tags/',
+]
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def prepare_process():
+    """Build the URL resolvers and the fields of every app serializer; returns the number of serializers."""
+    resolver = get_resolver()
+    resolver.reverse_dict  # Populates every included resolver too
+
+    count = 0
+    for serializer_class in set(_subclasses(BaseSerializer)):
+        if not serializer_class.__module__.startswith('apps.'):
+            continue
+        try:
+            serializer_class().fields
+        except Exception:
+            # Serializers that need arguments or context are built on first use instead
+            continue
+        count += 1
+
+    # Nothing opened here may be shared with forked workers
+    connections.close_all()
+    return count
+
+
+def prime_caches(paths=WARMUP_PATHS):
+    """
+    Request paths as an anonymous client; returns [(path, status, milliseconds)].
+
+    Failures are logged and skipped: a worker that cannot warm up (e.g. the
+    database is still starting) serves requests cold rather than not at all.
+    """
+    factory = RequestFactory()
+    results = []
+    for path in paths:
+        started = time.perf_counter()
+        try:
+            match = resolve(path.partition('?')[0])
+            response = match.func(factory.get(path), *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            status = response.status_code
+        except Exception:
+            logger.exception('Warmup request to %s failed', path)
+            status = None
+        results.append((path, status, (time.perf_counter() - started) * 1000))
+    return results
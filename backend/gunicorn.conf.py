@@ -0,0 +1,80 @@
+"""
+Gunicorn configuration for the Dolce Fiore backend.
+
+    gunicorn -c gunicorn.conf.py config.wsgi:application
+
+The app is imported once in the master (preload_app) and warmed up there
+(config/warmup.py), then gc.freeze() moves everything loaded so far out of
+the garbage collector's reach, so forked workers keep sharing those memory
+pages instead of copying them when the collector runs. Each worker then
+requests the catalog endpoints before accepting traffic, and is replaced
+after max_requests (+ jitter, so workers do not all restart together).
+
+Every setting can be overridden with environment variables (below) or
+GUNICORN_CMD_ARGS, e.g. GUNICORN_CMD_ARGS="--workers 2".
+"""
+import gc
+import os
+import time
+
+try:
+    _cpus = len(os.sched_getaffinity(0))  # CPUs this container may use
+except AttributeError:
+    _cpus = os.cpu_count() or 1
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', str(2 * _cpus + 1)))
+# Above 1, workers run requests in threads (gthread); each thread has its own database connection
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '180'))  # Seconds
+graceful_timeout = 30  # Seconds
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))  # Per worker, 0 to never restart
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+# Off with --reload, which cannot reload code imported by the master
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+# Warm up each worker before it accepts requests
+warmup = os.getenv('GUNICORN_WARMUP', 'True').lower() == 'true'
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Warm up the preloaded app in the master, before the first worker is forked."""
+    if not (server.cfg.preload_app and warmup):
+        return
+    from config.warmup import prepare_process
+
+    started = time.perf_counter()
+    count = prepare_process()
+    server.log.info(
+        'Warmed up URL resolvers and %d serializers in %.0f ms', count, (time.perf_counter() - started) * 1000
+    )
+
+
+def pre_fork(server, worker):
+    # Also covers objects created in the master since the last fork
+    if server.cfg.preload_app:
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    """Request the catalog endpoints before the worker accepts connections."""
+    if not warmup:
+        return
+    from django.db import connections
+    from config.warmup import prepare_process, prime_caches
+
+    started = time.perf_counter()
+    if not worker.cfg.preload_app:
+        prepare_process()
+    results = prime_caches()
+    if worker.cfg.threads > 1:
+        # Requests are served from other threads, which open their own connections
+        connections.close_all()
+    failed = [path for path, status, _ in results if status != 200]
+    worker.log.info(
+        'Worker warmed up in %.0f ms%s',
+        (time.perf_counter() - started) * 1000,
+        f" ({', '.join(failed)} failed)" if failed else '',
+    )
@@ -1,3 +1,4 @@
+import { Button } from '../../components/Button'
 import { Container } from '../../components/Container'
 import { SectionTitle } from '../../components/SectionTitle'
 import { SkeletonText, SkeletonPhotoGallery, SkeletonBlogPost } from '../../components/SkeletonLoader'
@@ -11,7 +12,15 @@ export function AboutUsPage() {
   const { data: ourStory, isLoading: isLoadingOurStory, isError: isErrorOurStory } = useOurStory()
   const { data: ourCommitment, isLoading: isLoadingOurCommitment, isError: isErrorOurCommitment } = useOurCommitment()
   const { data: photoGallery, isLoading: isLoadingPhotoGallery, isError: isErrorPhotoGallery } = usePhotoGallery()
-  const { data: blogs, isLoading: isLoadingBlogs, isError: isErrorBlogs } = useBlogs()
+  const {
+    data: blogPages,
+    isLoading: isLoadingBlogs,
+    isError: isErrorBlogs,
+    hasNextPage: hasMoreBlogs,
+    fetchNextPage: fetchMoreBlogs,
+    isFetchingNextPage: isFetchingMoreBlogs,
+  } = useBlogs()
+  const blogs = blogPages?.pages.flatMap((page) => page.results)
   const { data: textTestimonials, isLoading: isLoadingTextTestimonials } = useTextTestimonials()
   const { data: videoTestimonials, isLoading: isLoadingVideoTestimonials } = useVideoTestimonials()
 
@@ -212,6 +221,17 @@ export function AboutUsPage() {
                   </div>
                 </article>
               ))}
+              {hasMoreBlogs && (
+                <div className="text-center">
+                  <Button
+                    variant="secondary"
+                    onClick={() => fetchMoreBlogs()}
+                    isLoading={isFetchingMoreBlogs}
+                  >
+                    Load More Posts
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </div>
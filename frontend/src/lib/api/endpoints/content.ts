@@ -64,14 +64,31 @@ export interface PhotoGalleryItem {
 
 export interface BlogPost {
   id: string
+  slug: string
   title: string
   content: string
+  excerpt: string
+  reading_time_minutes: number
   image_url: string
   published_date: string
   order: number
   is_active: boolean
 }
 
+export interface BlogPostPage {
+  next: string | null
+  results: BlogPost[]
+}
+
+/** Blog posts per page on the About page */
+export const BLOG_PAGE_SIZE = 10
+
+/** Cursor for the page after this one, or undefined on the last page */
+export function nextBlogCursor(page: BlogPostPage): string | undefined {
+  if (!page.next) return undefined
+  return new URL(page.next, window.location.origin).searchParams.get('cursor') ?? undefined
+}
+
 export interface ContactFormData {
   name: string
   email: string
@@ -122,8 +139,8 @@ export const contentApi = {
     apiClient.get<OurCommitmentSection[]>('/content/our-commitment/'),
   fetchPhotoGallery: () =>
     apiClient.get<PhotoGalleryItem[]>('/content/photo-gallery/'),
-  fetchBlogs: () =>
-    apiClient.get<BlogPost[]>('/content/blogs/'),
+  fetchBlogs: (cursor?: string) =>
+    apiClient.get<BlogPostPage>('/content/blogs/', { cursor, page_size: BLOG_PAGE_SIZE }),
   submitContactForm: (data: ContactFormData) =>
     apiClient.post<ContactFormResponse>('/content/contact/', data),
   fetchContactInfo: () =>
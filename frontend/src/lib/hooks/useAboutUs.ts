@@ -1,5 +1,5 @@
-import { useQuery } from '@tanstack/react-query'
-import { contentApi } from '../api/endpoints/content'
+import { useInfiniteQuery, useQuery } from '@tanstack/react-query'
+import { contentApi, nextBlogCursor } from '../api/endpoints/content'
 
 export const aboutUsKeys = {
   all: ['about-us'] as const,
@@ -41,9 +41,11 @@ export function usePhotoGallery() {
 }
 
 export function useBlogs() {
-  return useQuery({
+  return useInfiniteQuery({
     queryKey: aboutUsKeys.blogs(),
-    queryFn: () => contentApi.fetchBlogs(),
+    queryFn: ({ pageParam }) => contentApi.fetchBlogs(pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => nextBlogCursor(lastPage),
   })
 }
 